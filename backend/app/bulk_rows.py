@@ -0,0 +1,106 @@
+"""
+대량 조회용 가벼운 읽기 경로 (/albums, /map/points)
+
+수만 행을 돌려주는 엔드포인트에서 AlbumGroup / MapNode ORM 객체를 만들면(identity map, 상태 객체,
+relationship 준비) 행당 비용의 대부분이 거기서 나가고, 다시 AlbumResponse / MapPoint로 검증하고
+직렬화하면서 한 번 더 나간다. 여기서는
+  - 필요한 컬럼만 select해서 세션의 커넥션으로(Core) 실행하고 튜플로 받는다 (ORM 로딩 단계를 거치지 않는다)
+  - DB에서 온 값은 믿고 응답 dict를 바로 만든다 (pydantic 검증 없음)
+엔드포인트는 이 dict 목록을 FastJSONResponse로 바로 돌려준다 (app/responses.py - 날짜는 orjson이 인코딩).
+그래서 response_model은 문서(OpenAPI)에만 쓰인다.
+출력은 AlbumResponse / MapPoint를 거친 것과 같아야 한다 (필드 순서, float 변환까지).
+단건 응답(main.to_album_response)도 album_row_from_orm으로 같은 기본값 규칙을 쓴다.
+"""
+
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .covers import known_good_cover
+from .models import AlbumGroup, MapNode
+from .taxonomy import UNKNOWN_REGION, country_to_region, genre_to_vibe
+
+ALBUM_COLUMNS = (
+    AlbumGroup.album_group_id,
+    AlbumGroup.title,
+    AlbumGroup.primary_artist_display,
+    AlbumGroup.original_year,
+    AlbumGroup.primary_genre,
+    AlbumGroup.genre_vibe,
+    AlbumGroup.region_bucket,
+    AlbumGroup.country_code,
+    AlbumGroup.cover_url,
+    AlbumGroup.popularity,
+    AlbumGroup.earliest_release_date,
+    AlbumGroup.created_at,
+)
+
+MAP_POINT_COLUMNS = (
+    AlbumGroup.album_group_id,
+    AlbumGroup.title,
+    AlbumGroup.original_year,
+    AlbumGroup.region_bucket,
+    AlbumGroup.country_code,
+    MapNode.y,
+    MapNode.size,
+)
+
+
+async def fetch_rows(db: AsyncSession, stmt) -> list[tuple]:
+    """ORM 세션과 같은 트랜잭션 / 커넥션에서 Core로 실행 (select(*컬럼)도 session.execute는 ORM 로딩을 탄다)"""
+    conn = await db.connection()
+    return (await conn.execute(stmt)).tuples().all()
+
+
+def album_row(row: tuple) -> dict:
+    """ALBUM_COLUMNS 튜플 -> AlbumResponse와 같은 dict (region / vibe / 커버 / 기본값 규칙은 여기 한 곳)"""
+    (album_id, title, artist, year, genre, genre_vibe, region_bucket, country,
+     cover_url, popularity, release_date, created_at) = row
+    return {
+        "id": album_id,
+        "title": title,
+        "artist_name": artist,
+        "year": year or 0,
+        "genre": genre or "Unknown",
+        "genre_vibe": float(genre_vibe if genre_vibe is not None else genre_to_vibe(genre)),
+        "region_bucket": region_bucket or country_to_region(country),
+        "country": country,
+        "cover_url": known_good_cover(cover_url),
+        "popularity": float(popularity or 0.0),
+        "release_date": release_date,
+        "created_at": created_at,
+    }
+
+
+def album_row_from_orm(ag: AlbumGroup) -> dict:
+    """이미 로딩한 AlbumGroup -> album_row와 같은 dict"""
+    return album_row(tuple(getattr(ag, column.key) for column in ALBUM_COLUMNS))
+
+
+def map_point_row(row: tuple) -> dict:
+    """MAP_POINT_COLUMNS 튜플 -> 개별 MapPoint와 같은 dict"""
+    album_id, title, year, region_bucket, country, y, size = row
+    return {
+        "id": album_id,
+        "x": float(year or 0),
+        "y": float(y),
+        "r": float(size),
+        "color": region_bucket or country_to_region(country),
+        "is_cluster": False,
+        "count": 1,
+        "label": title,
+    }
+
+
+def cluster_row(x, y, count: int, region_bucket: Optional[str]) -> dict:
+    """클러스터 집계 행 -> 클러스터 MapPoint와 같은 dict (avg(정수)는 Decimal로 온다)"""
+    return {
+        "id": None,
+        "x": float(x),
+        "y": float(y),
+        "r": float(min(count * 0.5 + 2, 20)),
+        "color": region_bucket or UNKNOWN_REGION,
+        "is_cluster": True,
+        "count": count,
+        "label": None,
+    }
@@ -0,0 +1,55 @@
+"""
+검증된 커버 URL만 응답에 싣기
+
+scripts/db/covers/validate-covers.py가 cover_checks에 깨진 것으로 기록한 URL(ok = false) 집합을
+프로세스 메모리에 올려두고 주기적으로 다시 읽는다. 응답을 만들 때 이 집합에 있는 cover_url은
+None으로 바꿔서 프론트엔드가 깨진 이미지를 요청하지 않게 한다.
+(아직 검증되지 않은 URL은 그대로 내보낸다 - 새로 임포트된 앨범의 커버가 사라지지 않도록)
+"""
+
+import asyncio
+from typing import Optional
+
+from sqlalchemy import select
+
+from .database import AsyncSessionLocal
+from .models import CoverCheck
+from . import health
+
+# 깨진 커버 목록 재로딩 주기 (초)
+COVER_REFRESH_SEC = 600
+# 첫 로딩이 끝날 때까지 /health/ready가 not ready (app/health.py)
+WARMING_NAME = "broken_covers"
+
+_broken_urls: frozenset = frozenset()
+
+
+def broken_count() -> int:
+    """응답 캐시의 카탈로그 버전에 들어간다 (app/http_cache.py) - 목록이 바뀌면 캐시된 응답도 바뀌어야 한다"""
+    return len(_broken_urls)
+
+
+def known_good_cover(url: Optional[str]) -> Optional[str]:
+    """깨진 것으로 확인된 URL이면 None"""
+    if url is None or url in _broken_urls:
+        return None
+    return url
+
+
+async def refresh_broken_covers() -> int:
+    global _broken_urls
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(CoverCheck.cover_url).where(CoverCheck.ok.is_(False)))
+        _broken_urls = frozenset(result.scalars().all())
+    return len(_broken_urls)
+
+
+async def refresh_loop() -> None:
+    """startup에서 백그라운드 태스크로 실행 (shutdown에서 cancel)"""
+    while True:
+        try:
+            await refresh_broken_covers()
+            health.finish_warming(WARMING_NAME)
+        except Exception as e:  # DB 연결 실패(OSError 등)에도 태스크가 죽지 않고 다음 주기에 다시 시도
+            print(f"⚠️  broken cover refresh failed: {e!r}")
+        await asyncio.sleep(COVER_REFRESH_SEC)
@@ -2,9 +2,12 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
+from .metrics import TimedQueuePool
+
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://sonic:0416@db:5432/sonic_db")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# checkout 대기 시간을 /metrics로 내보내기 위해 기본 풀(AsyncAdaptedQueuePool)을 감싼 풀을 쓴다
+engine = create_async_engine(DATABASE_URL, echo=True, poolclass=TimedQueuePool)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
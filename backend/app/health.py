@@ -0,0 +1,89 @@
+"""
+liveness / readiness 체크
+
+- /health/live  프로세스가 응답하는지만 본다 (의존성을 건드리지 않는다, 재시작 판단용)
+- /health/ready 트래픽을 받아도 되는지 본다 (로드밸런서 / 롤링 배포 판단용). 아래 중 하나라도 실패면 503
+    db       SELECT 1 왕복 (HEALTH_DB_TIMEOUT_SEC 안에, 풀 checkout 대기 포함 - 풀이 고갈되면 여기서 걸린다)
+    pool     사용 중인 커넥션 / (pool_size + max_overflow) 가 HEALTH_POOL_MAX_UTILIZATION 미만
+    warming  시작 시 채우는 캐시가 아직 준비 중이면 not ready (begin_warming / finish_warming)
+  redis는 research 캐시에만 쓰이므로 지연시간만 보고하고 실패해도 ready로 둔다
+  (모든 워커가 같은 Redis를 보므로 여기서 빼면 전체 장애가 된다).
+"""
+
+import asyncio
+import os
+import time
+
+from sqlalchemy import text
+
+from .database import engine
+from .metrics import TimedQueuePool
+from . import service_gemini
+
+HEALTH_DB_TIMEOUT_SEC = float(os.getenv("HEALTH_DB_TIMEOUT_SEC", "0.5"))
+HEALTH_REDIS_TIMEOUT_SEC = float(os.getenv("HEALTH_REDIS_TIMEOUT_SEC", "0.25"))
+HEALTH_POOL_MAX_UTILIZATION = float(os.getenv("HEALTH_POOL_MAX_UTILIZATION", "0.9"))
+
+_warming: set[str] = set()
+
+
+def begin_warming(name: str) -> None:
+    _warming.add(name)
+
+
+def finish_warming(name: str) -> None:
+    _warming.discard(name)
+
+
+def warming() -> list[str]:
+    return sorted(_warming)
+
+
+async def _timed_check(check, timeout: float) -> dict:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout)
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except asyncio.TimeoutError:
+        return {"ok": False, "latency_ms": None, "error": f"timeout after {timeout}s"}
+    except Exception as e:
+        return {"ok": False, "latency_ms": None, "error": f"{type(e).__name__}: {e}"}
+
+
+async def _ping_db() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _ping_redis() -> None:
+    await service_gemini.redis_client.ping()
+
+
+def pool_status() -> dict:
+    pool = engine.pool
+    status = {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
+    capacity = pool.capacity if isinstance(pool, TimedQueuePool) else None
+    if capacity:
+        utilization = pool.checkedout() / capacity
+        status.update(
+            capacity=capacity,
+            utilization=round(utilization, 3),
+            ok=utilization < HEALTH_POOL_MAX_UTILIZATION,
+        )
+    else:
+        status["ok"] = True
+    return status
+
+
+async def readiness() -> dict:
+    db, redis = await asyncio.gather(
+        _timed_check(_ping_db, HEALTH_DB_TIMEOUT_SEC),
+        _timed_check(_ping_redis, HEALTH_REDIS_TIMEOUT_SEC),
+    )
+    pool = pool_status()
+    warming_caches = warming()
+    ready = db["ok"] and pool["ok"] and not warming_caches
+    return {
+        "status": "ready" if ready else "not_ready",
+        "checks": {"db": db, "redis": redis, "pool": pool, "warming": warming_caches},
+    }
@@ -0,0 +1,388 @@
+"""
+HTTP 응답 압축 + 카탈로그 응답 캐시
+
+1. 압축: JSON / 텍스트 응답이 COMPRESS_MIN_BYTES 이상이고 클라이언트가 받으면 br > gzip 순으로 압축한다
+   (brotli 패키지가 없으면 gzip만). 이미지 / 파일 응답은 그대로 흘려보낸다.
+2. 응답 캐시: RESPONSE_CACHE_ROUTES의 GET 200 응답을 (카탈로그 버전, 경로, 정렬한 쿼리) 키로 메모리에 두고
+   압축본도 인코딩별로 같이 둔다 -> 같은 요청은 DB 조회 / 직렬화 / 압축 없이 바로 나간다.
+   RESPONSE_CACHE_MAX_MB를 넘으면 오래 안 쓴 것부터 버리고, 같은 키의 동시 요청은 하나만 앱으로 보낸다.
+3. 캐시 헤더: 캐시 대상 라우트 응답에는 Cache-Control: public, max-age=RESPONSE_CACHE_MAX_AGE와
+   ETag(카탈로그 버전 + 키 해시라 워커끼리 같다)를 붙이고 If-None-Match가 맞으면 304.
+   앞단 CDN도 그대로 캐시 / 재검증할 수 있다. X-Cache: HIT / MISS
+
+카탈로그 버전 = pg_stat_user_tables의 카탈로그 테이블 insert / update / delete 누적 수 + 깨진 커버 수(app/covers.py).
+쓰기 수는 CATALOG_VERSION_REFRESH_SEC마다 다시 읽는다. 임포트 / 보강 스크립트가 카탈로그 테이블을 쓰면 버전이 바뀌고
+다음에 캐시에 넣을 때 이전 버전 응답을 모두 버린다. (통계는 커밋 후 최대 1초 늦게 반영되고 롤백된 쓰기도 세므로
+가끔 필요 없이 바뀔 수 있다 - 캐시가 한 번 비는 것뿐이다.) 버전을 못 읽었으면 캐시하지 않고 압축만 한다.
+RESPONSE_CACHE_ROUTES=""이면 캐시 없이 압축만 한다.
+프로파일 대상 요청(app/profiling.should_profile)은 캐시를 읽지도 쓰지도 않고 압축만 한다 -
+캐시 HIT로 나가면 앱 코드가 돌지 않아 프로파일이 비기 때문이다. (ETag / 304도 없음)
+
+CORS 미들웨어 안쪽에 둔다 (Origin마다 다른 CORS 헤더는 캐시된 응답에 들어가지 않고 요청마다 붙는다).
+"""
+
+import asyncio
+import hashlib
+import os
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from sqlalchemy import text
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match, compile_path
+
+from .database import Base, engine
+from . import covers, metrics, profiling
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+# 7MB /albums 기준 quality 4: 154ms / 1.15MB, gzip 6: 201ms / 1.3MB, quality 5 이상은 크기는 비슷하고 두 배 느리다
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+RESPONSE_CACHE_ROUTES = [
+    r.strip()
+    for r in os.getenv(
+        "RESPONSE_CACHE_ROUTES",
+        "/albums,/map/points,/albums/{album_id},/albums/{album_id}/nearby,/album-groups/{album_id}/detail",
+    ).split(",")
+    if r.strip()
+]
+RESPONSE_CACHE_MAX_MB = float(os.getenv("RESPONSE_CACHE_MAX_MB", "256"))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))
+CATALOG_VERSION_REFRESH_SEC = float(os.getenv("CATALOG_VERSION_REFRESH_SEC", "30"))
+
+# 카탈로그가 아닌 테이블 (유저 상태 / 파생 캐시 / 파이프라인 기록). cover_checks는 covers.broken_count()로 반영한다
+NON_CATALOG_TABLES = {
+    "users", "dev_users", "user_likes", "user_events", "user_album_actions", "user_creator_actions",
+    "album_reviews", "ai_research", "album_details_cache", "import_ledger", "cover_checks",
+}
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# 이보다 크면 스레드에서 압축한다 (zlib / brotli 모두 GIL을 놓는다 - 큰 응답이 루프를 막지 않게)
+THREAD_COMPRESS_BYTES = 256 * 1024
+# 항목 하나가 캐시 전체의 이 비율을 넘으면 캐시하지 않는다
+MAX_ENTRY_FRACTION = 0.25
+
+_route_patterns = [compile_path(route)[0] for route in RESPONSE_CACHE_ROUTES]
+_catalog_writes: Optional[int] = None
+
+
+# ----------------------------------------
+# 카탈로그 버전
+# ----------------------------------------
+
+def catalog_version() -> Optional[str]:
+    if _catalog_writes is None:
+        return None
+    return f"{_catalog_writes:x}.{covers.broken_count():x}"
+
+
+async def refresh_catalog_version() -> Optional[str]:
+    global _catalog_writes
+    tables = sorted(name for name in Base.metadata.tables if name not in NON_CATALOG_TABLES)
+    try:
+        async with engine.connect() as conn:
+            writes = (await conn.execute(
+                text(
+                    "SELECT coalesce(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) FROM pg_stat_user_tables "
+                    "WHERE schemaname = current_schema() AND relname = ANY(:tables)"
+                ),
+                {"tables": tables},
+            )).scalar()
+        _catalog_writes = int(writes)
+    except Exception as e:  # DB 연결 실패(OSError 등)도 - refresh_loop 태스크가 죽으면 버전이 멈춘다
+        # 버전을 모르면 오래된 응답을 내보낼 수 있으므로 캐시를 끈다
+        _catalog_writes = None
+        print(f"⚠️  catalog version refresh failed: {e!r}")
+    return catalog_version()
+
+
+async def refresh_loop() -> None:
+    """startup에서 첫 refresh_catalog_version()을 기다린 뒤 백그라운드 태스크로 실행"""
+    while True:
+        await asyncio.sleep(CATALOG_VERSION_REFRESH_SEC)
+        await refresh_catalog_version()
+
+
+# ----------------------------------------
+# 압축
+# ----------------------------------------
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress_sync(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    # gzip.compress는 헤더에 현재 시각을 넣어서 같은 본문도 바이트가 달라진다 - zlib로 mtime 0 고정
+    return zlib.compress(body, COMPRESS_GZIP_LEVEL, wbits=31)
+
+
+async def compress(body: bytes, encoding: str) -> bytes:
+    if len(body) >= THREAD_COMPRESS_BYTES:
+        return await asyncio.to_thread(_compress_sync, body, encoding)
+    return _compress_sync(body, encoding)
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+        return False
+    length = headers.get("content-length")
+    return length is None or int(length) >= COMPRESS_MIN_BYTES
+
+
+async def _send_body(send, start: dict, body: bytes, encoding: Optional[str]) -> None:
+    """버퍼링한 응답을 (조건이 맞으면 압축해서) 보낸다"""
+    headers = MutableHeaders(scope=start)
+    headers.add_vary_header("Accept-Encoding")
+    if encoding is not None and len(body) >= COMPRESS_MIN_BYTES:
+        body = await compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(len(body))
+    await send(start)
+    await send({"type": "http.response.body", "body": body})
+
+
+# ----------------------------------------
+# 캐시
+# ----------------------------------------
+
+@dataclass
+class Entry:
+    headers: list  # content-length / content-encoding 제외한 원래 헤더 + 캐시 헤더
+    body: bytes
+    etag: str
+    variants: dict = field(default_factory=dict)  # 인코딩 -> 압축본
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+
+class ResponseCache:
+    """바이트 기준 LRU"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, Entry] = OrderedDict()
+        self.bytes = 0
+        self.version: Optional[str] = None
+        self.in_flight: dict[str, asyncio.Event] = {}
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, version: str, entry: Entry) -> None:
+        if version != self.version:
+            # 이전 버전 키는 다시 조회되지 않으므로 LRU로 밀려나길 기다리지 않고 비운다
+            self.entries.clear()
+            self.bytes = 0
+            self.version = version
+        if entry.size > self.max_bytes * MAX_ENTRY_FRACTION:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        self.entries[key] = entry
+        self.bytes += entry.size
+        self._evict()
+
+    def add_variant(self, key: str, entry: Entry, encoding: str, body: bytes) -> None:
+        if encoding in entry.variants:
+            return
+        entry.variants[encoding] = body
+        if self.entries.get(key) is entry:
+            self.bytes += len(body)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            self.bytes -= entry.size
+        metrics.set_response_cache_size(len(self.entries), self.bytes)
+
+
+response_cache = ResponseCache(int(RESPONSE_CACHE_MAX_MB * 1024 * 1024))
+
+CACHE_CONTROL = f"public, max-age={RESPONSE_CACHE_MAX_AGE}"
+SKIP_HEADERS = {b"content-length", b"content-encoding", b"cache-control", b"etag"}
+
+
+def cache_key(scope, version: str) -> str:
+    query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+    return f"{version}|{scope['path']}?{query}"
+
+
+def make_etag(key: str) -> str:
+    # 압축 여부와 관계없이 같은 내용이므로 약한 ETag
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+
+def _match_route(scope) -> None:
+    """캐시에서 바로 응답하면 라우터를 거치지 않으므로 라우트 템플릿을 직접 채운다 (app/request_metrics.py가 읽는다)"""
+    for route in scope["app"].routes:
+        if route.matches(scope)[0] == Match.FULL:
+            scope["route"] = route
+            return
+
+
+def _cache_headers(etag: str) -> list:
+    return [
+        (b"cache-control", CACHE_CONTROL.encode()),
+        (b"etag", etag.encode()),
+        (b"vary", b"Accept-Encoding"),
+    ]
+
+
+class HttpCacheMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        version = catalog_version()
+        if (
+            scope["method"] == "GET"
+            and version is not None
+            and any(p.match(scope["path"]) for p in _route_patterns)
+            and not profiling.should_profile(scope)
+        ):
+            await self._cached(scope, receive, send, request_headers, encoding, version)
+        else:
+            await self._compressed(scope, receive, send, encoding)
+
+    async def _compressed(self, scope, receive, send, encoding: Optional[str]) -> None:
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks = []
+        passthrough = False
+
+        async def buffering_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                if _compressible(Headers(raw=message["headers"])):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await _send_body(send, start, b"".join(chunks), encoding)
+
+        await self.app(scope, receive, buffering_send)
+
+    async def _cached(self, scope, receive, send, request_headers: Headers, encoding: Optional[str], version: str) -> None:
+        key = cache_key(scope, version)
+        etag = make_etag(key)
+        if _etag_matches(request_headers.get("if-none-match"), etag):
+            # 버전이 같으면 내용도 같다 - 캐시에 없어도(다른 워커가 만든 응답) 304로 끝낸다
+            metrics.count_response_cache("not_modified")
+            _match_route(scope)
+            await send({"type": "http.response.start", "status": 304, "headers": _cache_headers(etag)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        entry = response_cache.get(key)
+        # 같은 키를 만드는 중인 요청이 있으면 기다렸다가 그 결과를 쓴다. 그 요청이 200이 아니어서 캐시에 없으면
+        # 깨어난 대기자 중 처음 도는 하나만 새로 만들고(아래에서 in_flight에 등록 - 사이에 await 없음) 나머지는 다시 기다린다
+        while entry is None and (pending := response_cache.in_flight.get(key)) is not None:
+            await pending.wait()
+            entry = response_cache.get(key)
+        if entry is not None:
+            metrics.count_response_cache("hit")
+            _match_route(scope)
+            await self._send_entry(send, key, entry, encoding, b"HIT")
+            return
+
+        metrics.count_response_cache("miss")
+        event = response_cache.in_flight[key] = asyncio.Event()
+        try:
+            await self._fill(scope, receive, send, key, version, etag, encoding)
+        finally:
+            if response_cache.in_flight.get(key) is event:
+                del response_cache.in_flight[key]
+            event.set()
+
+    async def _fill(self, scope, receive, send, key: str, version: str, etag: str, encoding: Optional[str]) -> None:
+        start = None
+        chunks = []
+
+        async def capturing_send(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capturing_send)
+        if start is None:
+            return
+        body = b"".join(chunks)
+        raw_headers = [(k, v) for k, v in start["headers"] if k.lower() not in SKIP_HEADERS]
+        if start["status"] != 200 or any(k.lower() == b"set-cookie" for k, _ in raw_headers):
+            if _compressible(Headers(raw=start["headers"])):
+                await _send_body(send, start, body, encoding)
+            else:
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+            return
+
+        entry = Entry(headers=raw_headers + _cache_headers(etag), body=body, etag=etag)
+        response_cache.put(key, version, entry)
+        await self._send_entry(send, key, entry, encoding, b"MISS")
+
+    async def _send_entry(self, send, key: str, entry: Entry, encoding: Optional[str], label: bytes) -> None:
+        body = entry.body
+        headers = list(entry.headers)
+        if encoding is not None and len(body) >= COMPRESS_MIN_BYTES and _compressible(Headers(raw=entry.headers)):
+            variant = entry.variants.get(encoding)
+            if variant is None:
+                variant = await compress(body, encoding)
+                response_cache.add_variant(key, entry, encoding, variant)
+            body = variant
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        headers.append((b"x-cache", label))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Depends, HTTPException, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text, delete
+from sqlalchemy import select, func, delete
 from typing import List, Optional
+import asyncio
 from uuid import UUID
 import uuid
 
@@ -28,16 +30,28 @@ from .models import (
     UserEvent,
 )
 from .schemas import (
-    AlbumResponse, MapPoint, ResearchRequest, APIResponse, RatingCreate,
+    AlbumResponse, ResearchRequest, APIResponse, RatingCreate,
     DevUserCreateResponse, LikeRequest, LikeResponse, LikeItem, LikesListResponse,
     EventRequest, EventResponse, AlbumGroupDetailResponse, ReleaseResponse, TrackResponse,
     AlbumCreditResponse, TrackCreditResponse, CreatorResponse, RoleResponse,
-    AssetResponse, AlbumLinkResponse, AlbumAwardResponse, ArtistProfileResponse, ArtistLinkResponse, ArtistAlbumResponse, ArtistRelationResponse
+    AssetResponse, AlbumLinkResponse, AlbumAwardResponse, ArtistProfileResponse, ArtistLinkResponse, ArtistAlbumResponse, ArtistRelationResponse,
+    NearbyAlbumResponse
 )
 from .service_gemini import get_ai_research
-
-app = FastAPI(title="Sonic Topography API")
-
+from .nearby import get_map_index
+from .covers import known_good_cover, refresh_loop as refresh_broken_covers_loop, WARMING_NAME as BROKEN_COVERS_WARMING
+from . import thumbnails, request_metrics, metrics, health, warmup, profiling, http_cache
+from .responses import FastJSONResponse
+from .bulk_rows import ALBUM_COLUMNS, MAP_POINT_COLUMNS, fetch_rows, album_row, album_row_from_orm, map_point_row, cluster_row
+from .map_atlas import TILE_YEARS, TILES_PER_VIBE, ATLAS_CELL_SIZE, INDEX_MAX_AGE as ATLAS_INDEX_MAX_AGE, load_index as load_atlas_index
+
+app = FastAPI(title="Sonic Topography API", default_response_class=FastJSONResponse)  # orjson (app/responses.py)
+# 라우트별 핸들러 시간 / 쿼리 수 계측 (app/request_metrics.py) - 라우트 선언 전에 지정
+app.router.route_class = request_metrics.TimedRoute
+request_metrics.install(engine)
+
+# 압축 + 카탈로그 응답 캐시 (app/http_cache.py) - CORS 안쪽이라 CORS 헤더는 캐시되지 않는다
+app.add_middleware(http_cache.HttpCacheMiddleware)
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -52,76 +66,65 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 나중에 추가한 미들웨어가 바깥쪽: 계측(request_metrics)이 프로파일링(opt-in)을 감싼다
+app.add_middleware(profiling.ProfilingMiddleware)
+app.add_middleware(request_metrics.RequestMetricsMiddleware)
 
 @app.on_event("startup")
 async def startup():
     # Simple table creation for MVP
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # 응답 캐시 키에 들어가는 카탈로그 버전 (app/http_cache.py) - 워밍 요청부터 캐시되도록 먼저 읽는다
+    await http_cache.refresh_catalog_version()
+    app.state.catalog_version_task = asyncio.create_task(http_cache.refresh_loop())
+    # 깨진 커버 URL 목록을 주기적으로 다시 읽는다 (app/covers.py) - 처음 읽기 전까지는 not ready
+    health.begin_warming(BROKEN_COVERS_WARMING)
+    app.state.cover_refresh_task = asyncio.create_task(refresh_broken_covers_loop())
+    # 카탈로그 / 인기 상세를 미리 한 번씩 요청해 둔다 (app/warmup.py) - 끝날 때까지 not ready
+    warmup.start(app)
+
+@app.on_event("shutdown")
+async def shutdown():
+    if getattr(app.state, "warmup_task", None):
+        app.state.warmup_task.cancel()
+    if getattr(app.state, "catalog_version_task", None):
+        app.state.catalog_version_task.cancel()
+    if getattr(app.state, "cover_refresh_task", None):
+        app.state.cover_refresh_task.cancel()
+    await thumbnails.close()
 
 # ========================================
 # Helpers
 # ========================================
 
-COUNTRY_TO_REGION = {
-    'United States': 'North America', 'USA': 'North America', 'US': 'North America',
-    'Canada': 'North America', 'Mexico': 'North America',
-    'UK': 'Europe', 'United Kingdom': 'Europe', 'England': 'Europe', 'Scotland': 'Europe', 'Wales': 'Europe',
-    'Germany': 'Europe', 'France': 'Europe', 'Italy': 'Europe', 'Spain': 'Europe',
-    'Netherlands': 'Europe', 'Belgium': 'Europe', 'Switzerland': 'Europe', 'Austria': 'Europe',
-    'Sweden': 'Europe', 'Norway': 'Europe', 'Denmark': 'Europe', 'Finland': 'Europe',
-    'Poland': 'Europe', 'Portugal': 'Europe', 'Ireland': 'Europe', 'Greece': 'Europe',
-    'Iceland': 'Europe', 'Russia': 'Europe', 'Soviet Union': 'Europe', 'Turkey': 'Europe',
-    'Czech Republic': 'Europe', 'Hungary': 'Europe', 'Romania': 'Europe', 'Bulgaria': 'Europe',
-    'South Korea': 'Asia', 'Korea': 'Asia', 'Japan': 'Asia', 'China': 'Asia', 'Taiwan': 'Asia',
-    'Hong Kong': 'Asia', 'Singapore': 'Asia', 'Thailand': 'Asia', 'Malaysia': 'Asia',
-    'Indonesia': 'Asia', 'Philippines': 'Asia', 'India': 'Asia', 'Vietnam': 'Asia',
-    'Pakistan': 'Asia',
-    'Brazil': 'South America', 'Argentina': 'South America', 'Chile': 'South America',
-    'Colombia': 'South America', 'Peru': 'South America', 'Venezuela': 'South America',
-    'Ecuador': 'South America', 'Uruguay': 'South America', 'Paraguay': 'South America',
-    'Cuba': 'Caribbean', 'Jamaica': 'Caribbean', 'Dominican Republic': 'Caribbean',
-    'Puerto Rico': 'Caribbean', 'Trinidad and Tobago': 'Caribbean',
-    'Australia': 'Oceania', 'New Zealand': 'Oceania',
-    'South Africa': 'Africa', 'Nigeria': 'Africa', 'Kenya': 'Africa', 'Egypt': 'Africa',
-    'Morocco': 'Africa', 'Ghana': 'Africa', 'Senegal': 'Africa',
-}
-
-GENRE_VIBE_MAP = {
-    'Rock': 0.85,
-    'Metal': 0.95,
-    'Punk': 0.90,
-    'EDM': 0.90,
-    'Electronic': 0.75,
-    'Hip Hop': 0.80,
-    'Rap': 0.85,
-    'Dance': 0.85,
-    'Pop': 0.60,
-    'K-pop/Asia Pop': 0.65,
-    'Alternative/Indie': 0.55,
-    'R&B': 0.45,
-    'Soul': 0.50,
-    'Folk': 0.40,
-    'Country': 0.45,
-    'Jazz': 0.35,
-    'Blues': 0.40,
-    'Classical': 0.25,
-    'Ambient': 0.20,
-    'Latin': 0.70,
-    'World': 0.55,
-    'Reggae': 0.60,
-    'Unknown': 0.50,
-}
-
-def country_to_region(country: Optional[str]) -> str:
-    if not country:
-        return 'Unknown'
-    return COUNTRY_TO_REGION.get(country, 'Unknown')
-
-def genre_to_vibe(genre: Optional[str]) -> float:
-    if not genre:
-        return 0.5
-    return GENRE_VIBE_MAP.get(genre, 0.5)
+def to_album_response(ag: AlbumGroup) -> AlbumResponse:
+    # 기본값 규칙은 대량 조회(/albums)와 같은 app/bulk_rows.album_row 하나만 쓴다
+    return AlbumResponse(**album_row_from_orm(ag))
+
+def album_filters(
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    genres: Optional[List[str]] = None,
+    regions: Optional[List[str]] = None,
+    countries: Optional[List[str]] = None,
+    min_popularity: Optional[float] = None,
+) -> list:
+    # (original_year, primary_genre), (region_bucket, original_year) 복합 인덱스를 타도록 구성
+    conditions = []
+    if year_from is not None:
+        conditions.append(AlbumGroup.original_year >= year_from)
+    if year_to is not None:
+        conditions.append(AlbumGroup.original_year <= year_to)
+    if genres:
+        conditions.append(AlbumGroup.primary_genre.in_(genres))
+    if regions:
+        conditions.append(AlbumGroup.region_bucket.in_(regions))
+    if countries:
+        conditions.append(AlbumGroup.country_code.in_(countries))
+    if min_popularity is not None:
+        conditions.append(AlbumGroup.popularity >= min_popularity)
+    return conditions
 
 # ========================================
 # Step 1: 개발용 인증 Dependency
@@ -147,14 +150,36 @@ async def get_current_user(
     return user
 
 @app.get("/health")
+@app.get("/health/live")
 def health_check():
+    """liveness: 프로세스가 살아 있는지만 (DB / Redis를 건드리지 않는다)"""
     return {"status": "ok"}
 
+@app.get("/health/ready")
+async def readiness_check():
+    """readiness: DB 왕복, 풀 사용률, 캐시 워밍 상태 (app/health.py). 준비 안 됐으면 503"""
+    result = await health.readiness()
+    return JSONResponse(result, status_code=200 if result["status"] == "ready" else 503)
+
+@app.get("/metrics/requests")
+async def get_request_metrics():
+    """라우트별 지연시간 / DB 시간 / 쿼리 수 / 응답 크기 히스토그램 (프로세스 시작 이후 누적)"""
+    return request_metrics.snapshot()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint (app/metrics.py)"""
+    return Response(metrics.render(engine.pool), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/map/points", response_model=APIResponse)
 async def get_map_points(
     yearFrom: int = 1960,
     yearTo: int = 2024,
     zoom: float = 1.0,
+    genre: Optional[List[str]] = Query(None),
+    region: Optional[List[str]] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    minPopularity: Optional[float] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -162,87 +187,58 @@ async def get_map_points(
     - Low Zoom (< 2): Return Grid Aggregates
     - High Zoom (>= 2): Return Individual Points
     """
-    
+    filters = album_filters(yearFrom, yearTo, genre, region, country, minPopularity)
+
     if zoom < 2.0:
-        stmt = text("""
-            SELECT 
-                avg(ag.original_year) as x, 
-                avg(mn.y) as y, 
-                count(*) as count,
-                mode() WITHIN GROUP (ORDER BY ag.country_code) as country_code
-            FROM album_groups ag
-            JOIN map_nodes mn ON ag.album_group_id = mn.album_group_id
-            WHERE ag.original_year BETWEEN :y1 AND :y2
-            GROUP BY floor(ag.original_year / 5), floor(mn.y * 10)
-        """)
-        result = await db.execute(stmt, {"y1": yearFrom, "y2": yearTo})
-        points = []
-        for row in result:
-            region = country_to_region(row.country_code)
-            points.append(MapPoint(
-                x=row.x,
-                y=row.y,
-                r=min(row.count * 0.5 + 2, 20),
-                count=row.count,
-                color=region,
-                is_cluster=True
-            ))
-        return APIResponse(data=points)
+        stmt = (
+            select(
+                func.avg(AlbumGroup.original_year).label("x"),
+                func.avg(MapNode.y).label("y"),
+                func.count().label("count"),
+                func.mode().within_group(AlbumGroup.region_bucket).label("region_bucket"),
+            )
+            .join(MapNode, AlbumGroup.album_group_id == MapNode.album_group_id)
+            .where(*filters)
+            .group_by(func.floor(AlbumGroup.original_year / TILE_YEARS), func.floor(MapNode.y * TILES_PER_VIBE))
+        )
+        result = await db.execute(stmt)
+        return FastJSONResponse({"data": [cluster_row(*row) for row in result.tuples()], "meta": None})
 
+    # 수만 행: ORM 객체 / MapPoint 없이 컬럼 튜플 -> dict (app/bulk_rows.py)
     stmt = (
-        select(AlbumGroup, MapNode)
+        select(*MAP_POINT_COLUMNS)
         .join(MapNode, AlbumGroup.album_group_id == MapNode.album_group_id)
-        .where(AlbumGroup.original_year >= yearFrom, AlbumGroup.original_year <= yearTo)
-        .order_by(AlbumGroup.created_at.desc())
+        .where(*filters)
+        .order_by(AlbumGroup.created_at.desc(), AlbumGroup.album_group_id)
         .limit(50000)
     )
-    result = await db.execute(stmt)
-    points = []
-    for ag, mn in result.all():
-        region = country_to_region(ag.country_code)
-        points.append(MapPoint(
-            id=ag.album_group_id,
-            x=ag.original_year or 0,
-            y=mn.y,
-            r=mn.size,
-            color=region,
-            is_cluster=False,
-            label=ag.title
-        ))
-    return APIResponse(data=points)
+    rows = await fetch_rows(db, stmt)
+    return FastJSONResponse({"data": [map_point_row(row) for row in rows], "meta": None})
 
 @app.get("/albums", response_model=APIResponse)
 async def get_all_albums(
     limit: int = 50000,
     offset: int = 0,
+    yearFrom: Optional[int] = None,
+    yearTo: Optional[int] = None,
+    genre: Optional[List[str]] = Query(None),
+    region: Optional[List[str]] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    minPopularity: Optional[float] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """모든 앨범 조회 (페이지네이션 지원)"""
+    """모든 앨범 조회 (페이지네이션 + 연도/장르/지역/국가/인기도 필터)"""
+    # 수만 행: ORM 객체 / AlbumResponse 없이 컬럼 튜플 -> dict (app/bulk_rows.py)
     stmt = (
-        select(AlbumGroup, MapNode)
+        select(*ALBUM_COLUMNS)
         .join(MapNode, AlbumGroup.album_group_id == MapNode.album_group_id)
-        .order_by(AlbumGroup.created_at.desc())
+        .where(*album_filters(yearFrom, yearTo, genre, region, country, minPopularity))
+        .order_by(AlbumGroup.created_at.desc(), AlbumGroup.album_group_id)  # 같은 created_at끼리도 순서 고정 (offset 페이지네이션)
         .offset(offset)
         .limit(limit)
     )
-    result = await db.execute(stmt)
-    albums = []
-    for ag, mn in result.all():
-        albums.append(AlbumResponse(
-            id=ag.album_group_id,
-            title=ag.title,
-            artist_name=ag.primary_artist_display,
-            year=ag.original_year or 0,
-            genre=ag.primary_genre or "Unknown",
-            genre_vibe=genre_to_vibe(ag.primary_genre),
-            region_bucket=country_to_region(ag.country_code),
-            country=ag.country_code,
-            cover_url=ag.cover_url,
-            popularity=ag.popularity or 0.0,
-            release_date=ag.earliest_release_date,
-            created_at=ag.created_at
-        ))
-    return APIResponse(data=albums)
+    rows = await fetch_rows(db, stmt)
+    return FastJSONResponse({"data": [album_row(row) for row in rows], "meta": None})
 
 @app.get("/search", response_model=APIResponse)
 async def search_albums(q: str, db: AsyncSession = Depends(get_db)):
@@ -258,20 +254,7 @@ async def search_albums(q: str, db: AsyncSession = Depends(get_db)):
     result = await db.execute(stmt)
     albums = []
     for ag, mn in result.all():
-        albums.append(AlbumResponse(
-            id=ag.album_group_id,
-            title=ag.title,
-            artist_name=ag.primary_artist_display,
-            year=ag.original_year or 0,
-            genre=ag.primary_genre or "Unknown",
-            genre_vibe=genre_to_vibe(ag.primary_genre),
-            region_bucket=country_to_region(ag.country_code),
-            country=ag.country_code,
-            cover_url=ag.cover_url,
-            popularity=ag.popularity or 0.0,
-            release_date=ag.earliest_release_date,
-            created_at=ag.created_at
-        ))
+        albums.append(to_album_response(ag))
     return APIResponse(data=albums)
 
 @app.get("/albums/{album_id}", response_model=APIResponse)
@@ -286,20 +269,135 @@ async def get_album_detail(album_id: str, db: AsyncSession = Depends(get_db)):
     if not row:
         raise HTTPException(status_code=404, detail="Album not found")
     ag, mn = row
-    return APIResponse(data=AlbumResponse(
-        id=ag.album_group_id,
-        title=ag.title,
-        artist_name=ag.primary_artist_display,
-        year=ag.original_year or 0,
-        genre=ag.primary_genre or "Unknown",
-        genre_vibe=genre_to_vibe(ag.primary_genre),
-        region_bucket=country_to_region(ag.country_code),
-        country=ag.country_code,
-        cover_url=ag.cover_url,
-        popularity=ag.popularity or 0.0,
-        release_date=ag.earliest_release_date,
-        created_at=ag.created_at
-    ))
+    return APIResponse(data=to_album_response(ag))
+
+@app.get("/albums/{album_id}/nearby", response_model=APIResponse)
+async def get_nearby_albums(
+    album_id: str,
+    limit: int = Query(12, ge=1, le=100),
+    region: Optional[str] = None,
+    genre: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """맵 평면(MapNode.x, MapNode.y)에서 가까운 앨범 (region/genre 필터 선택)"""
+    index = await get_map_index(db)
+    origin = index.coords(album_id)
+    if origin is None:
+        # 연도를 모르는 앨범은 맵 인덱스에 없다 (app/nearby.py)
+        if await db.get(AlbumGroup, album_id) is None:
+            raise HTTPException(status_code=404, detail="Album not found")
+        return APIResponse(data=[])
+
+    neighbours = index.query(origin[0], origin[1], k=limit, region=region, genre=genre, exclude=album_id)
+    if not neighbours:
+        return APIResponse(data=[])
+
+    result = await db.execute(
+        select(AlbumGroup).where(AlbumGroup.album_group_id.in_([n_id for n_id, _ in neighbours]))
+    )
+    groups = {ag.album_group_id: ag for ag in result.scalars().all()}
+    albums = []
+    for n_id, distance in neighbours:
+        ag = groups.get(n_id)
+        if not ag:
+            continue
+        albums.append(NearbyAlbumResponse(**to_album_response(ag).model_dump(), distance=distance))
+    return APIResponse(data=albums)
+
+# 썸네일: 앨범 URL은 커버가 바뀔 수 있어 하루, 내용 hash URL은 바뀌지 않으므로 1년 캐시
+THUMB_CACHE_CONTROL = "public, max-age=86400"
+THUMB_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def check_thumb_size(size: int) -> int:
+    if size not in thumbnails.THUMB_SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of {list(thumbnails.THUMB_SIZES)}")
+    return size
+
+@app.get("/covers/sprite")
+async def get_cover_sprite(
+    ids: str,
+    size: int = 64,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    쉼표로 구분한 album id 순서대로 size 정사각형 셀을 행 우선으로 채운 스프라이트 시트 (JPEG).
+    열 수는 X-Sprite-Columns 헤더로 알려준다. 커버가 없는 셀은 비워 둔다.
+    """
+    check_thumb_size(size)
+    album_ids = [a for a in ids.split(",") if a]
+    if not album_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    max_cells = thumbnails.atlas_max_cells(size)
+    if len(album_ids) > max_cells:
+        raise HTTPException(status_code=400, detail=f"at most {max_cells} ids for size {size}")
+
+    result = await db.execute(
+        select(AlbumGroup.album_group_id, AlbumGroup.cover_url).where(AlbumGroup.album_group_id.in_(album_ids))
+    )
+    covers = {album_id: known_good_cover(url) for album_id, url in result.all()}
+    atlas = await thumbnails.build_atlas([covers.get(a) for a in album_ids], size)
+    return FileResponse(atlas.path, media_type="image/jpeg", headers={
+        "Cache-Control": THUMB_CACHE_CONTROL,
+        "X-Sprite-Columns": str(atlas.columns),
+        "X-Sprite-Size": str(size),
+        "Access-Control-Expose-Headers": "X-Sprite-Columns, X-Sprite-Size",
+    })
+
+@app.get("/covers/{album_id}/thumb")
+async def get_cover_thumbnail(album_id: str, size: int = 128, db: AsyncSession = Depends(get_db)):
+    """앨범 커버 썸네일 (처음 요청 때 원본을 받아 모든 크기를 만들어 둔다)"""
+    check_thumb_size(size)
+    cover_url = known_good_cover(
+        (await db.execute(select(AlbumGroup.cover_url).where(AlbumGroup.album_group_id == album_id))).scalar()
+    )
+    if not cover_url:
+        raise HTTPException(status_code=404, detail="Cover not found")
+    try:
+        content_hash = await thumbnails.ensure_thumbnails(cover_url)
+    except thumbnails.ThumbnailError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return FileResponse(
+        thumbnails.thumb_path(content_hash, size),
+        media_type="image/jpeg",
+        headers={
+            "Cache-Control": THUMB_CACHE_CONTROL,
+            "Content-Location": f"/thumbs/{size}/{content_hash}.jpg",
+        },
+    )
+
+@app.get("/thumbs/{size}/{content_hash}.jpg")
+async def get_thumbnail_by_hash(size: int, content_hash: str):
+    """내용 hash로 주소가 정해진 썸네일 (내용이 바뀌면 주소도 바뀌므로 immutable)"""
+    check_thumb_size(size)
+    if not thumbnails.is_content_hash(content_hash):
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    path = thumbnails.thumb_path(content_hash, size)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    return FileResponse(path, media_type="image/jpeg", headers={"Cache-Control": THUMB_IMMUTABLE_CACHE_CONTROL})
+
+@app.get("/map/atlas")
+async def get_map_atlas_index(size: int = ATLAS_CELL_SIZE, tiles: Optional[str] = None):
+    """
+    맵 타일별 커버 아틀라스 인덱스 (scripts/db/covers/build-map-atlases.py가 생성).
+    tiles=393_4,394_4 처럼 주면 해당 타일만 돌려준다.
+    """
+    index = load_atlas_index(size)
+    if index is None:
+        raise HTTPException(status_code=404, detail="Atlas index not built")
+    if tiles:
+        wanted = set(tiles.split(","))
+        index = {**index, "tiles": {k: v for k, v in index["tiles"].items() if k in wanted}}
+    return JSONResponse(index, headers={"Cache-Control": f"public, max-age={ATLAS_INDEX_MAX_AGE}"})
+
+@app.get("/map/atlas/files/{key}.jpg")
+async def get_map_atlas_file(key: str):
+    if not thumbnails.is_content_hash(key):
+        raise HTTPException(status_code=404, detail="Atlas not found")
+    path = thumbnails.atlas_path(key)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Atlas not found")
+    return FileResponse(path, media_type="image/jpeg", headers={"Cache-Control": THUMB_IMMUTABLE_CACHE_CONTROL})
 
 @app.get("/album-groups/{album_id}/detail", response_model=APIResponse)
 async def get_album_group_detail(album_id: str, db: AsyncSession = Depends(get_db)):
@@ -314,20 +412,7 @@ async def get_album_group_detail(album_id: str, db: AsyncSession = Depends(get_d
         raise HTTPException(status_code=404, detail="Album not found")
     ag, mn = row
 
-    album = AlbumResponse(
-        id=ag.album_group_id,
-        title=ag.title,
-        artist_name=ag.primary_artist_display,
-        year=ag.original_year or 0,
-        genre=ag.primary_genre or "Unknown",
-        genre_vibe=genre_to_vibe(ag.primary_genre),
-        region_bucket=country_to_region(ag.country_code),
-        country=ag.country_code,
-        cover_url=ag.cover_url,
-        popularity=ag.popularity or 0.0,
-        release_date=ag.earliest_release_date,
-        created_at=ag.created_at
-    )
+    album = to_album_response(ag)
 
     releases_res = await db.execute(select(Release).where(Release.album_group_id == album_id))
     releases = [
@@ -337,7 +422,7 @@ async def get_album_group_detail(album_id: str, db: AsyncSession = Depends(get_d
             release_date=r.release_date,
             country_code=r.country_code,
             edition=r.edition,
-            cover_url=r.cover_url
+            cover_url=known_good_cover(r.cover_url)
         )
         for r in releases_res.scalars().all()
     ]
@@ -465,7 +550,8 @@ async def get_album_group_detail(album_id: str, db: AsyncSession = Depends(get_d
         album_links=album_links,
         album_awards=album_awards
     )
-    return APIResponse(data=detail)
+    # 방금 만든 모델이라 response_model 재검증 없이 바로 인코딩 (app/responses.py)
+    return FastJSONResponse(APIResponse(data=detail))
 
 @app.get("/artists/lookup", response_model=APIResponse)
 async def get_artist_profile(name: str, db: AsyncSession = Depends(get_db)):
@@ -534,7 +620,7 @@ async def get_artist_profile(name: str, db: AsyncSession = Depends(get_db)):
             id=a.album_group_id,
             title=a.title,
             year=a.original_year,
-            cover_url=a.cover_url
+            cover_url=known_good_cover(a.cover_url)
         )
         for a in discography_res.scalars().all()
     ]
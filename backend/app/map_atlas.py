@@ -0,0 +1,60 @@
+"""
+맵 타일별 커버 텍스처 아틀라스
+
+맵 평면을 /map/points 클러스터와 같은 격자(연도 5년 × vibe 0.1)로 나눈 것을 타일로 쓴다.
+scripts/db/covers/build-map-atlases.py가 타일마다 썸네일을 아틀라스 이미지 한 장(많으면 여러 장)으로
+묶고, 타일 -> 아틀라스 / 앨범별 UV 인덱스를 JSON으로 저장한다. 프론트엔드는 타일마다
+이미지 수백 개 대신 아틀라스 한 장을 받아 텍스처 하나로 올린다.
+
+  {THUMB_DIR}/tiles/index-{size}.json
+  {
+    "size": 64, "tile_years": 5, "tiles_per_vibe": 10, "generated_at": "...",
+    "tiles": {
+      "393_4": [{"atlas": "<key>", "columns": 16, "rows": 15,
+                 "albums": {"<album_group_id>": [u0, v0, u1, v1], ...}}, ...]
+    }
+  }
+아틀라스 이미지는 /map/atlas/files/{key}.jpg (이름이 내용에 따라 바뀌므로 immutable).
+인덱스는 INDEX_MAX_AGE 동안 캐시되므로, 다시 생성할 때 이전 인덱스가 가리키던 아틀라스는
+그 시간이 지난 뒤에 지운다 (build-map-atlases.py).
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Optional
+
+from .thumbnails import THUMB_DIR
+
+# /map/points 클러스터 격자와 같은 타일 크기
+TILE_YEARS = 5
+TILES_PER_VIBE = 10  # vibe(0~1) 축을 10칸으로
+
+ATLAS_CELL_SIZE = 64
+# /map/atlas 응답의 Cache-Control max-age (초)
+INDEX_MAX_AGE = 300
+
+_index_cache: dict[int, tuple[float, dict]] = {}
+
+
+def tile_key(year: int, vibe: float) -> str:
+    return f"{math.floor(year / TILE_YEARS)}_{math.floor(vibe * TILES_PER_VIBE)}"
+
+
+def index_path(size: int) -> Path:
+    return THUMB_DIR / "tiles" / f"index-{size}.json"
+
+
+def load_index(size: int) -> Optional[dict]:
+    """아틀라스 인덱스 (파일이 바뀌었을 때만 다시 읽는다). 아직 생성되지 않았으면 None."""
+    path = index_path(size)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _index_cache.get(size)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    index = json.loads(path.read_text(encoding="utf-8"))
+    _index_cache[size] = (mtime, index)
+    return index
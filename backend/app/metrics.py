@@ -0,0 +1,177 @@
+"""
+Prometheus 메트릭 (/metrics)
+
+prometheus_client 없이 텍스트 포맷(0.0.4)으로 직접 내보낸다. 값은 이 프로세스 메모리에만 있으므로
+워커가 여러 개면 Prometheus가 워커별로 긁어서 합친다.
+
+  sonic_http_request_duration_seconds{method,route}     요청 시작 ~ 응답 헤더 (app/request_metrics.py)
+  sonic_http_request_db_seconds / _queries / _response_bytes, sonic_http_requests_total{status}
+  sonic_http_handlers_in_flight{method,route}           실행 중인 엔드포인트 수
+  sonic_db_pool_*                                       커넥션 풀 크기 / 사용 중 / 사용률 / checkout 대기 / 타임아웃
+  sonic_research_cache_requests_total{layer,result}     research 캐시 (redis -> db -> gemini)
+  sonic_response_cache_requests_total{result}, sonic_response_cache_entries / _bytes   응답 캐시 (app/http_cache.py)
+  sonic_gemini_request_duration_seconds, sonic_gemini_errors_total{error}
+  sonic_event_ingest_in_flight                          처리 중인 POST /events (이벤트는 요청 안에서 바로 저장한다)
+"""
+
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from . import request_metrics
+from .request_metrics import Histogram, LATENCY_BUCKETS_MS
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response가 charset=utf-8을 붙인다
+
+research_cache: dict[tuple[str, str], int] = {}
+gemini_latency_ms = Histogram((100, 250, 500, 1000, 2500, 5000, 10000, 20000, 40000, 60000))
+gemini_errors: dict[str, int] = {}
+response_cache: dict[str, int] = {}
+response_cache_size = {"entries": 0, "bytes": 0}
+
+
+def count_research_cache(layer: str, hit: bool) -> None:
+    key = (layer, "hit" if hit else "miss")
+    research_cache[key] = research_cache.get(key, 0) + 1
+
+
+def count_gemini_error(error: Exception) -> None:
+    name = type(error).__name__
+    gemini_errors[name] = gemini_errors.get(name, 0) + 1
+
+
+def count_response_cache(result: str) -> None:
+    response_cache[result] = response_cache.get(result, 0) + 1
+
+
+def set_response_cache_size(entries: int, size: int) -> None:
+    response_cache_size.update(entries=entries, bytes=size)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간 / 타임아웃을 재는 풀 (create_async_engine(poolclass=...))"""
+
+    def __init__(self, *args, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(*args, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        self.capacity = pool_size + max_overflow if max_overflow >= 0 and pool_size > 0 else None
+        self.checkout_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.checkout_timeouts = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait_ms.observe((time.perf_counter() - started) * 1000)
+
+
+# ----------------------------------------
+# 텍스트 포맷
+# ----------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+        self._declared = set()
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        self.lines.append(f"{name}{_labels(labels or {})} {_number(value)}")
+
+    def histogram(self, name: str, hist: Histogram, labels: Optional[dict] = None, scale: float = 1.0) -> None:
+        labels = labels or {}
+        for le, count in hist.cumulative():
+            bound = le if le == "+Inf" else _number(float(le) * scale)
+            self.sample(f"{name}_bucket", count, {**labels, "le": bound})
+        self.sample(f"{name}_sum", hist.sum * scale, labels)
+        self.sample(f"{name}_count", hist.count, labels)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render(pool) -> str:
+    w = _Writer()
+    routes = sorted(request_metrics.routes().items())
+
+    w.family("sonic_http_requests_total", "counter", "HTTP requests by route and status")
+    for (method, path), m in routes:
+        for status, count in sorted(m.status.items()):
+            w.sample("sonic_http_requests_total", count, {"method": method, "route": path, "status": status})
+
+    for name, attr, scale, help_text in (
+        ("sonic_http_request_duration_seconds", "latency_ms", 0.001, "Time until response headers"),
+        ("sonic_http_request_db_seconds", "db_ms", 0.001, "Time spent in SQL per request"),
+        ("sonic_http_request_serialize_seconds", "serialize_ms", 0.001, "Response validation and encoding time"),
+        ("sonic_http_request_queries", "queries", 1.0, "SQL statements per request"),
+        ("sonic_http_response_bytes", "response_bytes", 1.0, "Response body size"),
+    ):
+        w.family(name, "histogram", help_text)
+        for (method, path), m in routes:
+            w.histogram(name, getattr(m, attr), {"method": method, "route": path}, scale)
+
+    in_flight = request_metrics.in_flight()
+    w.family("sonic_http_handlers_in_flight", "gauge", "Endpoint functions currently running")
+    for (method, path), count in sorted(in_flight.items()):
+        w.sample("sonic_http_handlers_in_flight", count, {"method": method, "route": path})
+    w.family("sonic_event_ingest_in_flight", "gauge", "POST /events requests currently being written")
+    w.sample("sonic_event_ingest_in_flight", in_flight.get(("POST", "/events"), 0))
+
+    w.family("sonic_db_pool_size", "gauge", "Persistent connections kept by the pool")
+    w.sample("sonic_db_pool_size", pool.size())
+    w.family("sonic_db_pool_checked_out", "gauge", "Connections currently checked out")
+    w.sample("sonic_db_pool_checked_out", pool.checkedout())
+    w.family("sonic_db_pool_overflow", "gauge", "Overflow connections beyond pool_size (negative: not yet opened)")
+    w.sample("sonic_db_pool_overflow", pool.overflow())
+    if isinstance(pool, TimedQueuePool):
+        if pool.capacity:
+            w.family("sonic_db_pool_utilization", "gauge", "Checked out / (pool_size + max_overflow)")
+            w.sample("sonic_db_pool_utilization", pool.checkedout() / pool.capacity)
+        w.family("sonic_db_pool_checkout_wait_seconds", "histogram", "Time to obtain a pooled connection")
+        w.histogram("sonic_db_pool_checkout_wait_seconds", pool.checkout_wait_ms, scale=0.001)
+        w.family("sonic_db_pool_checkout_timeouts_total", "counter", "Checkouts that hit the pool timeout")
+        w.sample("sonic_db_pool_checkout_timeouts_total", pool.checkout_timeouts)
+
+    w.family("sonic_research_cache_requests_total", "counter", "Research cache lookups by layer")
+    for (layer, result), count in sorted(research_cache.items()):
+        w.sample("sonic_research_cache_requests_total", count, {"layer": layer, "result": result})
+
+    w.family("sonic_response_cache_requests_total", "counter", "Response cache lookups (hit, miss, not_modified)")
+    for result, count in sorted(response_cache.items()):
+        w.sample("sonic_response_cache_requests_total", count, {"result": result})
+    w.family("sonic_response_cache_entries", "gauge", "Responses held in the response cache")
+    w.sample("sonic_response_cache_entries", response_cache_size["entries"])
+    w.family("sonic_response_cache_bytes", "gauge", "Bytes held in the response cache including compressed variants")
+    w.sample("sonic_response_cache_bytes", response_cache_size["bytes"])
+
+    w.family("sonic_gemini_request_duration_seconds", "histogram", "Gemini generate_content latency")
+    w.histogram("sonic_gemini_request_duration_seconds", gemini_latency_ms, scale=0.001)
+    w.family("sonic_gemini_errors_total", "counter", "Failed Gemini calls by exception type")
+    for error, count in sorted(gemini_errors.items()):
+        w.sample("sonic_gemini_errors_total", count, {"error": error})
+
+    return w.text()
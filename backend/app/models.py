@@ -15,6 +15,7 @@ from sqlalchemy import (
     Boolean,
     Enum as SAEnum,
     SmallInteger,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -98,6 +99,8 @@ class AlbumGroup(Base):
     earliest_release_date = Column(Date, nullable=True)  # 캐시된 최초 릴리스 날짜 (성능 최적화)
     country_code = Column(String, nullable=True)
     primary_genre = Column(String, nullable=True)
+    region_bucket = Column(String, nullable=True)  # taxonomy.country_to_region 결과 (임포트 시 저장)
+    genre_vibe = Column(Float, nullable=True)  # taxonomy.genre_to_vibe 결과 = map_nodes.y
     popularity = Column(Float, default=0.0)
     cover_url = Column(String, nullable=True)
     is_anchor = Column(Boolean, nullable=False, server_default="false")
@@ -110,6 +113,12 @@ class AlbumGroup(Base):
     album_awards = relationship("AlbumAward", back_populates="album_group")
     map_node = relationship("MapNode", back_populates="album_group", uselist=False)
 
+    __table_args__ = (
+        Index("ix_album_groups_year_genre", "original_year", "primary_genre"),
+        Index("ix_album_groups_region_year", "region_bucket", "original_year"),
+        Index("ix_album_groups_country_code", "country_code"),
+    )
+
 class Label(Base):
     __tablename__ = "labels"
 
@@ -298,6 +307,31 @@ class AlbumDetailsCache(Base):
     cached_json = Column(JSON, nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+class CoverCheck(Base):
+    """커버 이미지 URL 검증 결과 (scripts/db/covers/validate-covers.py)"""
+    __tablename__ = "cover_checks"
+
+    cover_url = Column(String, primary_key=True)
+    ok = Column(Boolean, nullable=True)  # True: 이미지 확인, False: 깨진 URL, NULL: 일시 오류 (다시 확인)
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    checked_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_cover_checks_broken", "cover_url", postgresql_where=text("ok = false")),
+    )
+
+class ImportLedger(Base):
+    """임포트 스크립트가 마지막으로 반영한 레코드별 content hash (변경분만 다시 쓰기 위함)"""
+    __tablename__ = "import_ledger"
+
+    source = Column(String, primary_key=True)  # 예: "import:albums_v3", "import-metadata:artists"
+    record_key = Column(String, primary_key=True)
+    content_hash = Column(String(40), nullable=False)
+    imported_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 # ========================================
 # User Actions (replacing user_ratings)
 # ========================================
@@ -0,0 +1,189 @@
+"""
+맵 평면(year × vibe) 위의 최근접 앨범 인덱스
+
+MapNode.x / MapNode.y 전체를 numpy 배열로 메모리에 올려두고 균일 그리드로 버킷팅한다.
+질의는 질의점이 속한 셀에서 시작해 링 단위로 넓혀 가며 벡터 연산으로 거리를 계산하므로
+요청마다 DB 테이블을 스캔하지 않는다.
+연도를 모르는 앨범(임포트 스크립트가 x = 0으로 저장)은 맵 위치가 없으므로 인덱스에 넣지 않는다 -
+넣으면 x 범위가 0~2024로 늘어나 연도 차이가 vibe에 비해 수십 배 작아지고 그리드 열도 한두 개로 뭉친다.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import AlbumGroup, MapNode
+from .taxonomy import UNKNOWN_REGION
+
+# 인덱스 재빌드 주기 (초). 임포트 직후에도 이 시간 안에 반영된다.
+INDEX_TTL_SEC = 600
+
+# 셀 하나에 평균적으로 들어갈 포인트 수
+TARGET_POINTS_PER_CELL = 16
+
+
+class MapNodeIndex:
+    """x/y를 [0, 1]로 정규화한 좌표 위의 그리드 인덱스."""
+
+    def __init__(self, ids, xs, ys, regions, genres):
+        self.ids = np.asarray(ids, dtype=object)
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+
+        # 연도 축(수십 단위)과 vibe 축(0-1)의 스케일이 달라서 각 축을 전체 범위로 정규화한다.
+        self.x_min, self.y_min = (float(xs.min()), float(ys.min())) if len(xs) else (0.0, 0.0)
+        self.x_span = max(float(xs.max()) - self.x_min, 1e-9) if len(xs) else 1.0
+        self.y_span = max(float(ys.max()) - self.y_min, 1e-9) if len(ys) else 1.0
+        self.xs = (xs - self.x_min) / self.x_span
+        self.ys = (ys - self.y_min) / self.y_span
+
+        # region / genre는 문자열 비교 대신 정수 코드 배열로 필터링한다.
+        self.region_codes, self.region_lookup = _encode(regions)
+        self.genre_codes, self.genre_lookup = _encode(genres)
+        self.position = {album_id: i for i, album_id in enumerate(ids)}
+
+        self.cells = max(1, int(np.sqrt(max(len(xs), 1) / TARGET_POINTS_PER_CELL)))
+        cx = np.minimum((self.xs * self.cells).astype(np.int64), self.cells - 1)
+        cy = np.minimum((self.ys * self.cells).astype(np.int64), self.cells - 1)
+        cell_ids = cx * self.cells + cy
+
+        # CSR 형태: 셀 번호로 정렬한 포인트 순서 + 셀별 시작 offset
+        self.order = np.argsort(cell_ids, kind="stable")
+        counts = np.bincount(cell_ids, minlength=self.cells * self.cells)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _ring(self, cx: int, cy: int, r: int) -> np.ndarray:
+        """(cx, cy)에서 체비셰프 거리 r인 셀들에 속한 포인트 인덱스."""
+        if r == 0:
+            cells = [(cx, cy)]
+        else:
+            cells = []
+            for dx in range(-r, r + 1):
+                cells.append((cx + dx, cy - r))
+                cells.append((cx + dx, cy + r))
+            for dy in range(-r + 1, r):
+                cells.append((cx - r, cy + dy))
+                cells.append((cx + r, cy + dy))
+        chunks = []
+        for x, y in cells:
+            if 0 <= x < self.cells and 0 <= y < self.cells:
+                cell = x * self.cells + y
+                start, end = self.offsets[cell], self.offsets[cell + 1]
+                if end > start:
+                    chunks.append(self.order[start:end])
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def query(
+        self,
+        x: float,
+        y: float,
+        k: int = 10,
+        region: Optional[str] = None,
+        genre: Optional[str] = None,
+        exclude: Optional[str] = None,
+    ) -> list[tuple[str, float]]:
+        """(x, y)에서 가까운 순으로 최대 k개의 (album_group_id, 정규화 거리)를 반환."""
+        if not len(self):
+            return []
+
+        region_code = self.region_lookup.get(region) if region else None
+        genre_code = self.genre_lookup.get(genre) if genre else None
+        if (region and region_code is None) or (genre and genre_code is None):
+            return []
+        exclude_idx = self.position.get(exclude) if exclude else None
+
+        qx = (x - self.x_min) / self.x_span
+        qy = (y - self.y_min) / self.y_span
+        cx = min(max(int(qx * self.cells), 0), self.cells - 1)
+        cy = min(max(int(qy * self.cells), 0), self.cells - 1)
+        cell_size = 1.0 / self.cells
+
+        found_idx = []
+        found_dist = []
+        for r in range(self.cells):
+            idx = self._ring(cx, cy, r)
+            if len(idx):
+                mask = np.ones(len(idx), dtype=bool)
+                if region_code is not None:
+                    mask &= self.region_codes[idx] == region_code
+                if genre_code is not None:
+                    mask &= self.genre_codes[idx] == genre_code
+                if exclude_idx is not None:
+                    mask &= idx != exclude_idx
+                idx = idx[mask]
+                if len(idx):
+                    found_idx.append(idx)
+                    found_dist.append(np.hypot(self.xs[idx] - qx, self.ys[idx] - qy))
+
+            # 아직 안 본 셀의 포인트는 최소 r * cell_size 만큼 떨어져 있으므로
+            # k번째 거리가 그보다 가까우면 더 넓힐 필요가 없다.
+            if found_dist:
+                dists = np.concatenate(found_dist)
+                if len(dists) >= k and np.partition(dists, k - 1)[k - 1] <= r * cell_size:
+                    break
+
+        if not found_idx:
+            return []
+        idx = np.concatenate(found_idx)
+        dists = np.concatenate(found_dist)
+        top = np.argsort(dists, kind="stable")[:k]
+        return [(self.ids[i], d) for i, d in zip(idx[top].tolist(), dists[top].tolist())]
+
+    def coords(self, album_id: str) -> Optional[tuple[float, float]]:
+        """album_group_id의 원래 좌표 (x, y)."""
+        i = self.position.get(album_id)
+        if i is None:
+            return None
+        return (
+            float(self.xs[i] * self.x_span + self.x_min),
+            float(self.ys[i] * self.y_span + self.y_min),
+        )
+
+
+def _encode(values) -> tuple[np.ndarray, dict]:
+    lookup: dict = {}
+    codes = np.fromiter(
+        (lookup.setdefault(v, len(lookup)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, lookup
+
+
+_index: Optional[MapNodeIndex] = None
+_index_lock = asyncio.Lock()
+
+
+async def get_map_index(db: AsyncSession) -> MapNodeIndex:
+    """프로세스 단위로 캐시된 인덱스. TTL이 지나면 필요한 컬럼만 다시 읽어 재빌드한다."""
+    global _index
+    if _index is not None and time.monotonic() - _index.built_at < INDEX_TTL_SEC:
+        return _index
+
+    async with _index_lock:
+        if _index is not None and time.monotonic() - _index.built_at < INDEX_TTL_SEC:
+            return _index
+        result = await db.execute(
+            select(MapNode.album_group_id, MapNode.x, MapNode.y, AlbumGroup.region_bucket, AlbumGroup.primary_genre)
+            .join(AlbumGroup, AlbumGroup.album_group_id == MapNode.album_group_id)
+            .where(MapNode.x > 0)
+        )
+        rows = result.all()
+        _index = MapNodeIndex(
+            ids=[r[0] for r in rows],
+            xs=[r[1] for r in rows],
+            ys=[r[2] for r in rows],
+            regions=[r[3] or UNKNOWN_REGION for r in rows],
+            genres=[r[4] or "Unknown" for r in rows],
+        )
+        return _index
@@ -0,0 +1,152 @@
+"""
+요청 단위 샘플링 프로파일러 (opt-in)
+
+켜진 요청에 대해서만 별도 스레드가 PROFILE_INTERVAL_MS마다 이벤트 루프 스레드의 스택을 찍어
+flamegraph 호환 folded 포맷("a;b;c 1234", 값은 마이크로초)으로 PROFILE_DIR에 저장한다.
+flamegraph.pl, speedscope(https://www.speedscope.app), inferno 등에 그대로 넣으면 된다.
+
+켜는 방법 (둘 다 기본은 꺼짐):
+  PROFILE_ROUTES="/albums,/album-groups/{album_id}/detail"   해당 라우트 템플릿의 모든 요청
+  PROFILE_TOKEN=<secret> + 요청 헤더 X-Profile: <secret>       그 요청 하나
+응답에는 X-Profile: <파일 이름> 헤더가 붙는다.
+
+- 한 요청의 스택만 센다: 샘플에 그 요청의 미들웨어 프레임이 들어 있을 때만 기록하므로
+  같은 루프에서 동시에 도는 다른 요청의 시간은 섞이지 않는다.
+  그 요청이 await 중(DB / 네트워크 대기)이면 [waiting]으로 센다 -> CPU 대 대기 비율이 보인다.
+- SQLAlchemy async는 ORM 로딩(행 -> 객체)을 greenlet 안에서 실행하는데 greenlet 스택은 요청 코루틴 프레임과
+  이어져 있지 않다. 그래서 루프에서 지금 도는 태스크가 그 요청의 태스크면 [greenlet] 아래에 센다.
+- 스레드풀에서 도는 코드(sync 엔드포인트 / to_thread)는 잡히지 않는다.
+- 꺼져 있을 때 비용은 요청마다 헤더 / 경로 확인 한 번이다.
+- 샘플 스레드도 GIL을 얻어야 해서 루프가 바쁠 때는 간격이 sys.getswitchinterval()(기본 5ms)까지 늘어난다.
+  샘플 개수 대신 직전 샘플부터 흐른 시간을 더해서 바쁜 구간이 적게 잡히지 않게 한다.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import compile_path
+
+PROFILE_ROUTES = [r.strip() for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip()]
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "/out/profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+
+WAITING = "[waiting]"
+GREENLET = "[greenlet]"
+
+# 다른 스레드에서 루프의 현재 태스크를 보기 위한 내부 dict (asyncio.current_task()가 읽는 것과 같다)
+_current_tasks = getattr(asyncio.tasks, "_current_tasks", {})
+
+_route_patterns = [compile_path(route)[0] for route in PROFILE_ROUTES]
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # site-packages 이후 / 앱 경로 이후만 남겨 folded 라인을 짧게
+    for marker in ("site-packages/", "/app/"):
+        idx = filename.rfind(marker)
+        if idx >= 0:
+            filename = filename[idx + len(marker):]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class Sampler(threading.Thread):
+    """thread_id 스레드의 스택 중 root_frame 아래 부분(또는 task가 실행 중인 greenlet)만 모은다"""
+
+    def __init__(self, thread_id: int, root_frame, loop, task, interval_sec: float):
+        super().__init__(daemon=True, name="request-profiler")
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.loop = loop
+        self.task = task
+        self.interval_sec = interval_sec
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval_sec):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            weight = int((now - last) * 1_000_000)
+            last = now
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                stack.append(frame)
+                frame = frame.f_back
+            labels = ";".join(_frame_label(f) for f in reversed(stack))
+            if frame is not None:
+                self.stacks[labels or WAITING] += weight
+            elif self.task is not None and _current_tasks.get(self.loop) is self.task:
+                self.stacks[f"{GREENLET};{labels}"] += weight
+            else:
+                self.stacks[WAITING] += weight
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+def should_profile(scope) -> bool:
+    if PROFILE_TOKEN:
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and value.decode("latin-1") == PROFILE_TOKEN:
+                return True
+    return any(pattern.match(scope["path"]) for pattern in _route_patterns)
+
+
+def profile_path(scope) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:80] or "root"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return PROFILE_DIR / f"{stamp}-{scope['method']}-{slug}.folded"
+
+
+def write_folded(path: Path, stacks: Counter, root: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f"{root};{stack} {count}" for stack, count in stacks.most_common()]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (PROFILE_TOKEN or _route_patterns) or not should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = profile_path(scope)
+        # 이 코루틴 프레임이 스택에 있으면 지금 루프가 이 요청을 실행 중이다
+        sampler = Sampler(
+            threading.get_ident(), sys._getframe(), asyncio.get_running_loop(), asyncio.current_task(),
+            PROFILE_INTERVAL_MS / 1000,
+        )
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile", path.name)
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            stacks = sampler.stop()
+            write_folded(path, stacks, f"{scope['method']} {scope['path']}")
+            print(
+                f"🔬 profile {path} ({sum(stacks.values()) / 1000:.0f}ms sampled / "
+                f"{(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
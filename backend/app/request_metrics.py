@@ -0,0 +1,244 @@
+"""
+요청 단위 DB 쿼리 수 / 시간 계측
+
+요청마다 SQL 문 수, DB 시간, 핸들러 시간, 직렬화 시간(response_model 검증 + JSON 인코딩), 응답 크기를 재서
+- 응답 헤더 Server-Timing으로 내보내고 (브라우저 개발자 도구 Network > Timing에서 보인다)
+- 라우트(경로 템플릿)별 히스토그램으로 모은다 (GET /metrics/requests).
+요청당 쿼리 수가 REQUEST_QUERY_WARN 이상이면 로그를 남긴다 (N+1 회귀 확인용).
+
+  Server-Timing: db;dur=12.4;desc="7 queries", handler;dur=20.1, serialize;dur=3.2, total;dur=24.0
+
+구성:
+- install(engine): SQLAlchemy before/after_cursor_execute 훅으로 현재 요청의 RequestStats에 누적
+- TimedRoute: 엔드포인트 함수 실행 시간 (app.router.route_class로 지정)
+- RequestMetricsMiddleware: 요청 시작 ~ 응답 헤더 전송까지, 헤더 추가, 히스토그램 기록
+현재 요청은 contextvar로 찾는다 (SQLAlchemy async 세션의 greenlet 안에서도 같은 요청으로 보인다).
+"""
+
+import functools
+import inspect
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+QUERY_WARN_THRESHOLD = int(os.getenv("REQUEST_QUERY_WARN", "20"))
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+@dataclass
+class RequestStats:
+    started: float
+    queries: int = 0
+    db_sec: float = 0.0
+    handler_sec: float = 0.0
+    handler_end: Optional[float] = None
+
+
+class Histogram:
+    """누적이 아닌 구간별 카운트로 저장하고 snapshot에서 le(이하) 누적으로 바꾼다"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        out = []
+        for le, n in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += n
+            out.append((le, total))
+        return out
+
+    def snapshot(self) -> dict:
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": dict(self.cumulative())}
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.db_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.serialize_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.status = {}
+
+    def snapshot(self) -> dict:
+        return {
+            "status": dict(sorted(self.status.items())),
+            "latency_ms": self.latency_ms.snapshot(),
+            "db_ms": self.db_ms.snapshot(),
+            "serialize_ms": self.serialize_ms.snapshot(),
+            "queries": self.queries.snapshot(),
+            "response_bytes": self.response_bytes.snapshot(),
+        }
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_routes: dict[tuple[str, str], RouteMetrics] = {}
+_in_flight: dict[tuple[str, str], int] = {}
+
+
+def routes() -> dict[tuple[str, str], RouteMetrics]:
+    """(method, 경로 템플릿) -> RouteMetrics"""
+    return _routes
+
+
+def in_flight() -> dict[tuple[str, str], int]:
+    """(method, 경로 템플릿) -> 지금 실행 중인 엔드포인트 함수 수"""
+    return _in_flight
+
+
+def snapshot() -> dict:
+    return {f"{method} {path}": m.snapshot() for (method, path), m in sorted(_routes.items())}
+
+
+# ----------------------------------------
+# SQLAlchemy 훅
+# ----------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._request_metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_sec += time.perf_counter() - context._request_metrics_started
+
+
+def install(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ----------------------------------------
+# 엔드포인트 시간
+# ----------------------------------------
+
+def _timed(call, key: tuple[str, str]):
+    """엔드포인트 함수 실행 시간을 현재 요청에 기록하고 실행 중인 수를 센다 (async / sync 여부는 그대로 유지)"""
+    def start() -> tuple[Optional[RequestStats], float]:
+        _in_flight[key] = _in_flight.get(key, 0) + 1
+        return _current.get(), time.perf_counter()
+
+    def finish(stats: Optional[RequestStats], started: float) -> None:
+        _in_flight[key] -= 1
+        if stats is not None:
+            stats.handler_end = time.perf_counter()
+            stats.handler_sec += stats.handler_end - started
+
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            stats, started = start()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                finish(stats, started)
+        return async_wrapper
+
+    @functools.wraps(call)
+    def sync_wrapper(*args, **kwargs):
+        stats, started = start()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            finish(stats, started)
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    def get_route_handler(self):
+        # 핸들러는 요청마다 dependant.call을 호출하므로 여기서 감싸 두면 된다
+        self.dependant.call = _timed(self.dependant.call, (",".join(sorted(self.methods)), self.path))
+        return super().get_route_handler()
+
+
+# ----------------------------------------
+# 미들웨어
+# ----------------------------------------
+
+def server_timing(stats: RequestStats, response_started: float) -> str:
+    parts = [f'db;dur={stats.db_sec * 1000:.1f};desc="{stats.queries} queries"']
+    if stats.handler_end is not None:
+        parts.append(f"handler;dur={stats.handler_sec * 1000:.1f}")
+        parts.append(f"serialize;dur={(response_started - stats.handler_end) * 1000:.1f}")
+    parts.append(f"total;dur={(response_started - stats.started) * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class RequestMetricsMiddleware:
+    """순수 ASGI 미들웨어 (BaseHTTPMiddleware와 달리 응답 본문을 버퍼링하지 않는다)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(started=time.perf_counter())
+        token = _current.set(stats)
+        status = 500
+        size = 0
+        response_started = None
+
+        async def send_with_timing(message):
+            nonlocal status, size, response_started
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats, response_started))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _record(scope, stats, status, size, response_started or time.perf_counter())
+
+
+def _record(scope, stats: RequestStats, status: int, size: int, response_started: float) -> None:
+    # 원본 경로 대신 라우트 템플릿으로 묶는다 (/albums/{album_id}); 매칭 안 된 요청은 한 묶음
+    route = scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    key = (scope["method"], path)
+    metrics = _routes.get(key)
+    if metrics is None:
+        metrics = _routes[key] = RouteMetrics()
+
+    total_ms = (response_started - stats.started) * 1000
+    db_ms = stats.db_sec * 1000
+    metrics.status[status] = metrics.status.get(status, 0) + 1
+    metrics.latency_ms.observe(total_ms)
+    metrics.db_ms.observe(db_ms)
+    metrics.queries.observe(stats.queries)
+    metrics.response_bytes.observe(size)
+    if stats.handler_end is not None:
+        metrics.serialize_ms.observe((response_started - stats.handler_end) * 1000)
+
+    if stats.queries >= QUERY_WARN_THRESHOLD:
+        print(f"⚠️  {key[0]} {path}: {stats.queries} queries, db {db_ms:.1f}ms / total {total_ms:.1f}ms")
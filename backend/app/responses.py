@@ -0,0 +1,39 @@
+"""
+orjson 기반 JSON 응답 클래스
+
+FastAPI 기본(JSONResponse)은 stdlib json.dumps로 인코딩하는데 수만 행 응답(/albums, /map/points)에서는
+이게 핸들러 CPU의 큰 몫이다. FastJSONResponse는 orjson으로 인코딩한다.
+  - app 전체 기본값: FastAPI(default_response_class=FastJSONResponse)
+  - 라우트별로 바꾸려면 @app.get(..., response_class=JSONResponse)
+  - 엔드포인트가 직접 돌려줄 때는 FastJSONResponse(content) - pydantic 모델도 그대로 넣을 수 있다
+    (response_model 검증 / jsonable 변환을 건너뛴다)
+datetime / date / UUID는 orjson이 바로 인코딩한다 (UTC는 pydantic과 같이 Z).
+출력 바이트는 JSONResponse와 같다 (공백 없는 구분자, ensure_ascii=False) - scripts/ops/bench-json.py로 확인.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """orjson이 모르는 타입 (pydantic 모델, Postgres numeric)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
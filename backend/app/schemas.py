@@ -22,6 +22,9 @@ class AlbumResponse(AlbumBase):
     class Config:
         from_attributes = True
 
+class NearbyAlbumResponse(AlbumResponse):
+    distance: float  # 정규화된 맵 평면 거리 (0-√2)
+
 class MapPoint(BaseModel):
     # Minimized for map view
     id: Optional[str] = None
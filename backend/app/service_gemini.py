@@ -1,10 +1,12 @@
 import os
 import json
+import time
 from google import genai
 from google.genai import types
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from .models import AiResearch, AlbumGroup
+from . import metrics
 import redis.asyncio as redis
 
 API_KEY = os.getenv("API_KEY")
@@ -17,12 +19,14 @@ async def get_ai_research(db: AsyncSession, album_id: str, lang: str = 'en'):
     # 1. Check Redis
     cache_key = f"research:{album_id}:{lang}"
     cached = await redis_client.get(cache_key)
+    metrics.count_research_cache("redis", hit=bool(cached))
     if cached:
         return json.loads(cached)
 
     # 2. Check DB
     result = await db.execute(select(AiResearch).where(AiResearch.cache_key == cache_key))
     db_record = result.scalars().first()
+    metrics.count_research_cache("db", hit=db_record is not None)
     if db_record:
         data = {
             "summary_md": db_record.summary_md,
@@ -66,6 +70,7 @@ async def get_ai_research(db: AsyncSession, album_id: str, lang: str = 'en'):
     # Using gemini-3-flash-preview for speed/efficiency with tools
     # Note: Python SDK tool config might differ slightly, using simplified generic structure
     try:
+        started = time.perf_counter()
         response = client.models.generate_content(
             model="gemini-3-flash-preview",
             contents=prompt,
@@ -93,7 +98,8 @@ async def get_ai_research(db: AsyncSession, album_id: str, lang: str = 'en'):
                 }
             )
         )
-        
+        metrics.gemini_latency_ms.observe((time.perf_counter() - started) * 1000)
+
         raw_text = response.text
         parsed = json.loads(raw_text)
         
@@ -122,6 +128,8 @@ async def get_ai_research(db: AsyncSession, album_id: str, lang: str = 'en'):
         return result_data
 
     except Exception as e:
+        # 호출 실패뿐 아니라 응답 JSON 파싱 / 저장 실패도 여기서 센다 (error 라벨 = 예외 타입)
+        metrics.count_gemini_error(e)
         print(f"Gemini Error: {e}")
         return {
             "summary_md": "AI analysis unavailable.",
@@ -0,0 +1,172 @@
+"""
+지역(region)과 장르 vibe 분류 체계
+
+API, 임포트 스크립트, fetch 스크립트가 모두 이 모듈 하나를 참조한다.
+album_groups.region_bucket / album_groups.genre_vibe 컬럼은 임포트 시점에 여기서 계산해 저장한다.
+"""
+
+from typing import Iterable, Optional
+
+UNKNOWN_REGION = "Unknown"  # 국가가 없거나 매핑에 없는 앨범의 region_bucket (임포트 / 마이그레이션 / API 공통)
+DEFAULT_VIBE = 0.5
+
+COUNTRY_TO_REGION = {
+    # North America
+    'United States': 'North America', 'USA': 'North America', 'US': 'North America',
+    'Canada': 'North America', 'Mexico': 'North America',
+
+    # Europe
+    'United Kingdom': 'Europe', 'UK': 'Europe', 'England': 'Europe', 'Scotland': 'Europe', 'Wales': 'Europe',
+    'Germany': 'Europe', 'France': 'Europe', 'Italy': 'Europe', 'Spain': 'Europe',
+    'Netherlands': 'Europe', 'Belgium': 'Europe', 'Switzerland': 'Europe', 'Austria': 'Europe',
+    'Sweden': 'Europe', 'Norway': 'Europe', 'Denmark': 'Europe', 'Finland': 'Europe',
+    'Poland': 'Europe', 'Portugal': 'Europe', 'Ireland': 'Europe', 'Greece': 'Europe',
+    'Iceland': 'Europe', 'Russia': 'Europe', 'Soviet Union': 'Europe', 'Turkey': 'Europe',
+    'Czech Republic': 'Europe', 'Hungary': 'Europe', 'Romania': 'Europe', 'Bulgaria': 'Europe',
+
+    # Asia
+    'South Korea': 'Asia', 'Korea': 'Asia', 'Japan': 'Asia', 'China': 'Asia', 'Taiwan': 'Asia',
+    'Hong Kong': 'Asia', 'Singapore': 'Asia', 'Thailand': 'Asia', 'Malaysia': 'Asia',
+    'Indonesia': 'Asia', 'Philippines': 'Asia', 'India': 'Asia', 'Vietnam': 'Asia',
+    'Pakistan': 'Asia',
+
+    # South America
+    'Brazil': 'South America', 'Argentina': 'South America', 'Chile': 'South America',
+    'Colombia': 'South America', 'Peru': 'South America', 'Venezuela': 'South America',
+    'Ecuador': 'South America', 'Uruguay': 'South America', 'Paraguay': 'South America',
+
+    # Caribbean
+    'Cuba': 'Caribbean', 'Jamaica': 'Caribbean', 'Dominican Republic': 'Caribbean',
+    'Puerto Rico': 'Caribbean', 'Trinidad and Tobago': 'Caribbean', 'Trinidad': 'Caribbean',
+    'Haiti': 'Caribbean',
+
+    # Oceania
+    'Australia': 'Oceania', 'New Zealand': 'Oceania',
+
+    # Africa
+    'South Africa': 'Africa', 'Nigeria': 'Africa', 'Kenya': 'Africa', 'Egypt': 'Africa',
+    'Morocco': 'Africa', 'Ghana': 'Africa', 'Senegal': 'Africa', 'Ethiopia': 'Africa',
+}
+
+# Genre family to vibe mapping (0.0 = calm, 1.0 = energetic)
+GENRE_VIBE_MAP = {
+    # Energetic genres (0.7-1.0)
+    'Rock': 0.85,
+    'Metal': 0.95,
+    'Punk': 0.90,
+    'EDM': 0.90,
+    'Electronic': 0.75,
+    'Hip Hop': 0.80,
+    'Rap': 0.85,
+    'Dance': 0.85,
+
+    # Mid-energy genres (0.4-0.7)
+    'Pop': 0.60,
+    'K-pop/Asia Pop': 0.65,
+    'Alternative/Indie': 0.55,
+    'R&B': 0.45,
+    'Soul': 0.50,
+    'Folk': 0.40,
+    'Country': 0.45,
+
+    # Calm genres (0.2-0.4)
+    'Jazz': 0.35,
+    'Blues': 0.40,
+    'Classical': 0.25,
+    'Ambient': 0.20,
+
+    # World/Latin (0.5-0.7)
+    'Latin': 0.70,
+    'World': 0.55,
+    'Reggae': 0.60,
+
+    # Default
+    'Unknown': 0.50,
+    'Other': 0.50,
+}
+
+# 세부 장르별 vibe 조정 (genreFamily 기본값에서 미세 조정)
+DETAILED_GENRE_VIBE_ADJUSTMENTS = {
+    # Rock 계열
+    'indie rock': -0.10,
+    'garage rock': +0.05,
+    'post-punk': +0.10,
+    'alternative rock': +0.05,
+
+    # Pop 계열
+    'dance pop': +0.15,
+    'synth-pop': +0.10,
+    'electropop': +0.15,
+    'indie pop': -0.10,
+
+    # Hip Hop 계열
+    'trap': +0.10,
+    'boom bap': -0.05,
+    'conscious hip hop': -0.10,
+
+    # Electronic 계열
+    'house': +0.05,
+    'techno': +0.10,
+    'ambient': -0.30,
+    'downtempo': -0.20,
+    'idm': -0.10,
+
+    # Jazz 계열
+    'fusion': +0.15,
+    'bebop': +0.10,
+    'smooth jazz': -0.05,
+
+    # Metal 계열
+    'black metal': +0.05,
+    'death metal': +0.05,
+    'doom metal': -0.10,
+}
+
+# 태그 키워드 -> genreFamily (위에서부터 먼저 매칭되는 항목 사용)
+GENRE_FAMILY_KEYWORDS = [
+    ("Electronic", ["electronic", "techno", "house", "edm", "trance", "ambient", "electro", "idm"]),
+    ("Hip Hop", ["hip hop", "rap", "hip-hop"]),
+    ("Rock", ["rock", "metal", "punk", "grunge", "alternative"]),
+    ("Pop", ["pop", "dance-pop", "synth-pop", "britpop"]),
+    ("Jazz", ["jazz", "bebop", "swing", "fusion"]),
+    ("Soul", ["soul", "r&b", "r & b", "funk", "motown"]),
+    ("Reggae", ["reggae", "ska"]),
+    ("Folk", ["country", "folk", "bluegrass", "americana", "singer-songwriter"]),
+    ("Classical", ["classical", "opera", "symphony", "baroque"]),
+    ("Blues", ["blues"]),
+    ("Latin", ["latin", "salsa", "bossa", "samba", "tango", "afrobeat"]),
+    ("World", ["world", "afro", "ethnic"]),
+]
+
+
+def country_to_region(country: Optional[str]) -> str:
+    """Country를 region으로 변환 (모르면 UNKNOWN_REGION)"""
+    if not country:
+        return UNKNOWN_REGION
+    return COUNTRY_TO_REGION.get(country, UNKNOWN_REGION)
+
+
+def genre_to_vibe(genre_family: Optional[str], primary_genre: Optional[str] = None) -> float:
+    """genreFamily 기본 vibe에 세부 장르 조정을 더한 값 (0.0-1.0)"""
+    base_vibe = GENRE_VIBE_MAP.get(genre_family, DEFAULT_VIBE) if genre_family else DEFAULT_VIBE
+    if not primary_genre:
+        return base_vibe
+
+    primary_lower = primary_genre.lower()
+    adjustment = 0.0
+    for detail_genre, adj in DETAILED_GENRE_VIBE_ADJUSTMENTS.items():
+        if detail_genre in primary_lower or primary_lower in detail_genre:
+            adjustment = adj
+            break
+    return max(0.0, min(1.0, base_vibe + adjustment))
+
+
+def genre_family_from_tags(tags: Optional[Iterable[str]]) -> str:
+    """장르 태그 목록을 genreFamily로 매핑"""
+    if not tags:
+        return "Unknown"
+    tags_str = " ".join(tags).lower()
+    for family, keywords in GENRE_FAMILY_KEYWORDS:
+        if any(k in tags_str for k in keywords):
+            return family
+    return "Other"
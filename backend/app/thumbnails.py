@@ -0,0 +1,216 @@
+"""
+커버 썸네일 캐시 / 리사이즈
+
+원본 cover_url을 한 번만 받아서 THUMB_SIZES 크기의 정사각형 JPEG로 줄여 로컬 디스크에 저장한다.
+파일은 원본 이미지 내용의 SHA-1로 저장(content-addressed)하므로 같은 이미지를 가리키는
+여러 URL(album_groups / releases)은 파일 하나를 공유하고, 경로가 바뀌지 않아 오래 캐시해도 된다.
+
+  {THUMB_DIR}/{size}/{hash[:2]}/{hash}.jpg   썸네일
+  {THUMB_DIR}/urls/{sha1(url)[:2]}/{sha1(url)}   URL -> 이미지 hash
+  {THUMB_DIR}/atlas/{hash}.jpg               스프라이트 시트
+
+같은 URL을 동시에 요청하면 다운로드/리사이즈는 한 번만 한다.
+"""
+
+import asyncio
+import hashlib
+import io
+import math
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import httpx
+from PIL import Image, ImageOps
+
+THUMB_DIR = Path(os.getenv("THUMB_DIR", "/out/thumbs"))
+THUMB_SIZES = (64, 128, 300)
+JPEG_QUALITY = 82
+FETCH_CONCURRENCY = int(os.getenv("THUMB_FETCH_CONCURRENCY", "8"))
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+ATLAS_MAX_SIDE = 2048  # 스프라이트 시트 한 변 최대 픽셀 (GPU 텍스처 제한 고려)
+ATLAS_BACKGROUND = (24, 24, 24)
+
+
+class ThumbnailError(Exception):
+    """원본 이미지를 받을 수 없거나 이미지가 아닐 때"""
+
+
+@dataclass
+class Atlas:
+    path: Path
+    size: int  # 셀 한 변 픽셀
+    columns: int
+    rows: int
+    filled: list[bool]  # 셀별로 썸네일이 들어갔는지 (입력 순서)
+
+    @property
+    def key(self) -> str:
+        return self.path.stem
+
+    def cell_uv(self, i: int) -> tuple[float, float, float, float]:
+        """i번째 셀의 텍스처 좌표 (u0, v0, u1, v1), 왼쪽 위 원점 0~1"""
+        col, row = i % self.columns, i // self.columns
+        return (col / self.columns, row / self.rows, (col + 1) / self.columns, (row + 1) / self.rows)
+
+
+_client: Optional[httpx.AsyncClient] = None
+_fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def _sha1(value: bytes) -> str:
+    return hashlib.sha1(value).hexdigest()
+
+
+def is_content_hash(value: str) -> bool:
+    """경로에 넣기 전에 확인 (SHA-1 hex 40자)"""
+    return len(value) == 40 and all(c in "0123456789abcdef" for c in value)
+
+
+def thumb_path(content_hash: str, size: int) -> Path:
+    return THUMB_DIR / str(size) / content_hash[:2] / f"{content_hash}.jpg"
+
+
+def _url_index_path(url: str) -> Path:
+    url_hash = _sha1(url.encode("utf-8"))
+    return THUMB_DIR / "urls" / url_hash[:2] / url_hash
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _render_thumbnails(data: bytes, content_hash: str) -> None:
+    """원본 바이트 -> THUMB_SIZES 전부 (스레드에서 실행)"""
+    try:
+        image = Image.open(io.BytesIO(data))
+        # JPEG는 디코딩 단계에서 미리 축소 (가장 큰 썸네일보다 작아지지 않는 범위에서)
+        image.draft("RGB", (max(THUMB_SIZES), max(THUMB_SIZES)))
+        image = image.convert("RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f"not an image: {e}") from e
+    for size in sorted(THUMB_SIZES, reverse=True):
+        image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=size >= 300)
+        write_atomic(thumb_path(content_hash, size), out.getvalue())
+
+
+def _client_instance() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=15,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=FETCH_CONCURRENCY * 2, max_keepalive_connections=FETCH_CONCURRENCY),
+        )
+    return _client
+
+
+async def _fetch_source(url: str) -> bytes:
+    """원본 이미지 바이트. 스트리밍으로 받으면서 MAX_SOURCE_BYTES를 넘으면 바로 끊는다."""
+    async with _fetch_semaphore:
+        try:
+            async with _client_instance().stream("GET", url) as res:
+                if res.status_code != 200:
+                    raise ThumbnailError(f"fetch failed: HTTP {res.status_code}")
+                length = res.headers.get("content-length")
+                if length is not None and length.isdigit() and int(length) > MAX_SOURCE_BYTES:
+                    raise ThumbnailError("source image too large")
+                body = bytearray()
+                async for chunk in res.aiter_bytes():
+                    body += chunk
+                    if len(body) > MAX_SOURCE_BYTES:
+                        raise ThumbnailError("source image too large")
+                return bytes(body)
+        except httpx.HTTPError as e:
+            raise ThumbnailError(f"fetch failed: {e}") from e
+
+
+async def _fetch_and_render(url: str) -> str:
+    content = await _fetch_source(url)
+    content_hash = _sha1(content)
+    if not all(thumb_path(content_hash, size).exists() for size in THUMB_SIZES):
+        await asyncio.to_thread(_render_thumbnails, content, content_hash)
+    write_atomic(_url_index_path(url), content_hash.encode("ascii"))
+    return content_hash
+
+
+async def ensure_thumbnails(url: str) -> str:
+    """cover_url의 썸네일을 준비하고 이미지 content hash를 반환 (이미 있으면 디스크만 확인)"""
+    index = _url_index_path(url)
+    if index.exists():
+        content_hash = index.read_text().strip()
+        if all(thumb_path(content_hash, size).exists() for size in THUMB_SIZES):
+            return content_hash
+
+    future = _inflight.get(url)
+    if future is None:
+        future = asyncio.ensure_future(_fetch_and_render(url))
+        _inflight[url] = future
+        future.add_done_callback(lambda _: _inflight.pop(url, None))
+    return await asyncio.shield(future)
+
+
+async def _try_thumbnail(url: Optional[str], size: int) -> Optional[Path]:
+    if not url:
+        return None
+    try:
+        return thumb_path(await ensure_thumbnails(url), size)
+    except ThumbnailError:
+        return None
+
+
+def _render_atlas(paths: Sequence[Optional[Path]], size: int, columns: int) -> bytes:
+    rows = math.ceil(len(paths) / columns)
+    atlas = Image.new("RGB", (columns * size, rows * size), ATLAS_BACKGROUND)
+    for i, path in enumerate(paths):
+        if path is None:
+            continue
+        with Image.open(path) as tile:
+            atlas.paste(tile, ((i % columns) * size, (i // columns) * size))
+    out = io.BytesIO()
+    atlas.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def atlas_max_cells(size: int) -> int:
+    return (ATLAS_MAX_SIDE // size) ** 2
+
+
+def atlas_columns(count: int) -> int:
+    return max(1, math.ceil(math.sqrt(count)))
+
+
+def atlas_path(key: str) -> Path:
+    return THUMB_DIR / "atlas" / f"{key}.jpg"
+
+
+async def build_atlas(urls: Sequence[Optional[str]], size: int) -> Atlas:
+    """
+    urls 순서대로 size 정사각형 셀을 행 우선으로 채운 스프라이트 시트.
+    커버가 없거나 받을 수 없는 셀은 배경색으로 남긴다.
+    파일 이름은 셀 구성(크기, 열 수, 썸네일 hash 목록)의 hash라서 구성이 같으면 파일을 재사용하고,
+    구성이 바뀌면 이름도 바뀐다 (immutable 캐시 가능).
+    """
+    paths = await asyncio.gather(*(_try_thumbnail(url, size) for url in urls))
+    columns = atlas_columns(len(paths))
+    key = _sha1(f"{size}:{columns}:{','.join(p.stem if p else '-' for p in paths)}".encode("ascii"))
+    path = atlas_path(key)
+    if not path.exists():
+        data = await asyncio.to_thread(_render_atlas, paths, size, columns)
+        write_atomic(path, data)
+    return Atlas(path, size, columns, math.ceil(len(paths) / columns), [p is not None for p in paths])
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,127 @@
+"""
+워커 시작 시 캐시 워밍
+
+배포 직후 첫 요청들이 차가운 Postgres 버퍼 / Redis / 빈 프로세스 내 구조(맵 최근접 인덱스 등)를
+떠안지 않도록, startup에서 백그라운드로 자주 쓰이는 요청을 앱에 직접(ASGI, 네트워크 없음) 보내 둔다.
+끝날 때까지 /health/ready는 not ready라서 롤링 배포 중에도 트래픽이 차가운 워커로 가지 않는다.
+
+  1. /albums?limit=50000        프론트엔드가 처음 받는 카탈로그 스냅샷
+  2. /map/points?zoom=1          기본 / 최근 연도 구간 클러스터 집계
+  3. 인기 앨범 WARMUP_TOP_ALBUMS개의 상세(/album-groups/{id}/detail), 상위 일부의 /nearby (맵 인덱스 빌드)
+  4. 인기 앨범 아티스트 WARMUP_TOP_ARTISTS명의 /artists/lookup
+  5. 인기 앨범 중 DB에 저장된 research를 Redis에 다시 올린다 (Gemini는 호출하지 않는다)
+
+실패한 요청은 로그만 남기고, 전체가 WARMUP_TIMEOUT_SEC를 넘으면 중단하고 ready로 넘어간다
+(워밍이 안 된다고 워커가 영영 트래픽을 못 받으면 안 되므로).
+"""
+
+import asyncio
+import os
+import time
+from urllib.parse import quote
+
+import httpx
+from sqlalchemy import select
+
+from .database import AsyncSessionLocal
+from .models import AiResearch, AlbumGroup
+from . import health, service_gemini
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+WARMUP_TOP_ALBUMS = int(os.getenv("WARMUP_TOP_ALBUMS", "200"))
+WARMUP_TOP_ARTISTS = int(os.getenv("WARMUP_TOP_ARTISTS", "100"))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+WARMUP_TIMEOUT_SEC = float(os.getenv("WARMUP_TIMEOUT_SEC", "120"))
+
+WARMING_NAME = "catalog"
+NEARBY_ALBUMS = 20
+CATALOG_PATHS = [
+    "/albums?limit=50000",
+    "/map/points?zoom=1",
+    "/map/points?zoom=1&yearFrom=2000&yearTo=2024",
+]
+
+
+async def _popular() -> tuple[list[str], list[str], list[tuple[str, str]]]:
+    """인기순 앨범 id, 아티스트 이름, (album_id, lang) research 목록"""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(AlbumGroup.album_group_id, AlbumGroup.primary_artist_display)
+            .order_by(AlbumGroup.popularity.desc().nulls_last())
+            .limit(WARMUP_TOP_ALBUMS)
+        )).all()
+        album_ids = [album_id for album_id, _ in rows]
+        research = (await db.execute(
+            select(AiResearch.album_id, AiResearch.lang).where(AiResearch.album_id.in_(album_ids))
+        )).all() if album_ids else []
+
+    artists = list(dict.fromkeys(artist for _, artist in rows if artist))[:WARMUP_TOP_ARTISTS]
+    return album_ids, artists, [tuple(r) for r in research]
+
+
+async def _warm_research(entries: list[tuple[str, str]]) -> int:
+    """DB -> Redis (get_ai_research는 Redis에 없고 DB에 있으면 Redis에 다시 넣는다)"""
+    warmed = 0
+    async with AsyncSessionLocal() as db:
+        for album_id, lang in entries:
+            try:
+                await service_gemini.get_ai_research(db, album_id, lang)
+                warmed += 1
+            except Exception as e:  # Redis가 없어도 워밍은 계속한다
+                print(f"⚠️  warmup research {album_id}: {type(e).__name__}: {e}")
+                break
+    return warmed
+
+
+async def _warm(app) -> None:
+    started = time.monotonic()
+    album_ids, artists, research = await _popular()
+    paths = list(CATALOG_PATHS)
+    paths += [f"/album-groups/{quote(a, safe=':')}/detail" for a in album_ids]
+    paths += [f"/albums/{quote(a, safe=':')}/nearby" for a in album_ids[:NEARBY_ALBUMS]]
+    paths += [f"/artists/lookup?name={quote(name)}" for name in artists]
+
+    semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    failed = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://warmup") as client:
+        async def fetch(path: str) -> None:
+            nonlocal failed
+            async with semaphore:
+                try:
+                    res = await client.get(path, timeout=None)
+                    if res.status_code >= 500:
+                        failed += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️  warmup {path}: {type(e).__name__}: {e}")
+
+        # 카탈로그 스냅샷 / 클러스터를 먼저 (가장 무겁고 배포 직후 바로 요청된다)
+        for path in paths[:len(CATALOG_PATHS)]:
+            await fetch(path)
+        await asyncio.gather(*(fetch(p) for p in paths[len(CATALOG_PATHS):]))
+
+    research_warmed = await _warm_research(research)
+    print(
+        f"🔥 Warmup done: {len(paths)} requests ({failed} failed), "
+        f"{research_warmed} research entries, {time.monotonic() - started:.1f}s"
+    )
+
+
+async def run(app) -> None:
+    """startup에서 백그라운드 태스크로 실행. 성공 / 실패 / 타임아웃과 관계없이 끝나면 ready."""
+    try:
+        await asyncio.wait_for(_warm(app), WARMUP_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        print(f"⚠️  Warmup timed out after {WARMUP_TIMEOUT_SEC}s")
+    except Exception as e:
+        print(f"⚠️  Warmup failed: {type(e).__name__}: {e}")
+    finally:
+        health.finish_warming(WARMING_NAME)
+
+
+def start(app) -> None:
+    if not WARMUP_ENABLED:
+        return
+    health.begin_warming(WARMING_NAME)
+    app.state.warmup_task = asyncio.create_task(run(app))
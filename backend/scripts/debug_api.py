@@ -8,27 +8,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import select
 from app.database import AsyncSessionLocal
-from app.models import Album
+from app.models import AlbumGroup
 
 async def debug_albums():
     """백엔드 API 응답 형식 확인"""
     async with AsyncSessionLocal() as session:
         # 첫 5개 앨범 조회
-        stmt = select(Album).limit(5)
+        stmt = select(AlbumGroup).limit(5)
         result = await session.execute(stmt)
         albums = result.scalars().all()
         
         print("=== 백엔드 데이터 샘플 ===\n")
         for album in albums:
             data = {
-                "id": album.id,
+                "id": album.album_group_id,
                 "title": album.title,
-                "artist_name": album.artist_name,
-                "year": album.year,
-                "genre": album.genre,
+                "artist_name": album.primary_artist_display,
+                "year": album.original_year,
+                "genre": album.primary_genre,
                 "genre_vibe": album.genre_vibe,
                 "region_bucket": album.region_bucket,
-                "country": album.country,
+                "country": album.country_code,
                 "popularity": album.popularity,
                 "cover_url": album.cover_url
             }
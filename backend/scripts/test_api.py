@@ -8,27 +8,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import select, func
 from app.database import AsyncSessionLocal
-from app.models import Album
+from app.models import AlbumGroup
 
 async def test_api():
     """API 엔드포인트 데이터 테스트"""
     async with AsyncSessionLocal() as session:
         # 총 앨범 수 확인
-        result = await session.execute(select(func.count(Album.id)))
+        result = await session.execute(select(func.count(AlbumGroup.album_group_id)))
         total = result.scalar()
         print(f"✅ 총 앨범 수: {total}개")
         
         # 최근 10개 앨범 조회
-        stmt = select(Album).order_by(Album.year.desc()).limit(10)
+        stmt = select(AlbumGroup).order_by(AlbumGroup.original_year.desc()).limit(10)
         result = await session.execute(stmt)
         albums = result.scalars().all()
         
         print(f"\n📀 최근 앨범 10개:")
         for album in albums:
-            print(f"  - {album.year}: {album.artist_name} - {album.title} ({album.genre})")
+            print(f"  - {album.original_year}: {album.primary_artist_display} - {album.title} ({album.primary_genre})")
         
         # 연도별 분포
-        stmt = select(Album.year, func.count(Album.id)).group_by(Album.year).order_by(Album.year)
+        stmt = select(AlbumGroup.original_year, func.count(AlbumGroup.album_group_id)).group_by(AlbumGroup.original_year).order_by(AlbumGroup.original_year)
         result = await session.execute(stmt)
         year_dist = result.all()
         
@@ -37,7 +37,7 @@ async def test_api():
             print(f"  {year}: {count}개")
         
         # 장르별 분포
-        stmt = select(Album.genre, func.count(Album.id)).group_by(Album.genre).order_by(func.count(Album.id).desc()).limit(10)
+        stmt = select(AlbumGroup.primary_genre, func.count(AlbumGroup.album_group_id)).group_by(AlbumGroup.primary_genre).order_by(func.count(AlbumGroup.album_group_id).desc()).limit(10)
         result = await session.execute(stmt)
         genre_dist = result.all()
         
@@ -46,7 +46,7 @@ async def test_api():
             print(f"  {genre}: {count}개")
         
         # 지역별 분포
-        stmt = select(Album.region_bucket, func.count(Album.id)).group_by(Album.region_bucket).order_by(func.count(Album.id).desc())
+        stmt = select(AlbumGroup.region_bucket, func.count(AlbumGroup.album_group_id)).group_by(AlbumGroup.region_bucket).order_by(func.count(AlbumGroup.album_group_id).desc())
         result = await session.execute(stmt)
         region_dist = result.all()
         
@@ -55,14 +55,14 @@ async def test_api():
             print(f"  {region}: {count}개")
         
         # 맵 포인트 시뮬레이션 (zoom=3.0)
-        stmt = select(Album).where(Album.year >= 1960, Album.year <= 2024).limit(5)
+        stmt = select(AlbumGroup).where(AlbumGroup.original_year >= 1960, AlbumGroup.original_year <= 2024).limit(5)
         result = await session.execute(stmt)
         sample_albums = result.scalars().all()
         
         print(f"\n🗺️  맵 포인트 샘플 (5개):")
         for album in sample_albums:
-            print(f"  - x:{album.year}, y:{album.genre_vibe:.2f}, r:{album.popularity*10+2:.1f}, color:{album.region_bucket}")
-            print(f"    {album.artist_name} - {album.title}")
+            print(f"  - x:{album.original_year}, y:{(album.genre_vibe or 0):.2f}, r:{(album.popularity or 0)*10+2:.1f}, color:{album.region_bucket}")
+            print(f"    {album.primary_artist_display} - {album.title}")
 
 if __name__ == "__main__":
     asyncio.run(test_api())
@@ -0,0 +1,180 @@
+"""
+맵 타일별 커버 텍스처 아틀라스 생성
+
+map_nodes를 /map/points 클러스터와 같은 격자(app/map_atlas.py의 TILE_YEARS × TILES_PER_VIBE)로 나누고,
+타일마다 앨범 썸네일(기본 64px)을 인기도 순으로 아틀라스 이미지에 채운다.
+한 장에 다 들어가지 않으면(2048px 기준 64px 셀 1024개) 여러 장으로 나눈다.
+결과는 타일 -> [아틀라스 key, 열/행 수, 앨범별 UV] 인덱스 JSON으로 저장한다.
+
+썸네일과 아틀라스는 내용 기준으로 이름이 정해지므로, 다시 실행하면 바뀐 타일만 새로 그린다.
+새 인덱스에서 더 이상 쓰지 않는 아틀라스 파일은 바로 지우지 않는다: 클라이언트 / CDN이 이전 인덱스를
+max-age(app/map_atlas.INDEX_MAX_AGE) 동안 들고 있으므로, 인덱스가 교체된 지 ATLAS_RETAIN_SEC가 지난
+세대의 아틀라스만 (더 새로운 세대가 쓰지 않으면) 지운다. 세대 목록은 index-{size}.generations.json.
+
+Env:
+  ATLAS_SIZE (optional, default: 64 - app/thumbnails.py THUMB_SIZES 중 하나)
+  ATLAS_CONCURRENCY (optional, default: 4 tiles in flight)
+  ATLAS_RETAIN_SEC (optional, default: 2 × INDEX_MAX_AGE - 교체된 인덱스의 아틀라스를 남겨두는 시간)
+
+Usage:
+  docker exec sonic_backend python scripts/db/covers/build-map-atlases.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+sys.path.insert(0, "/app")
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import select
+
+from app.database import DATABASE_URL
+from app.models import AlbumGroup, MapNode, CoverCheck
+from app import thumbnails
+from app.map_atlas import ATLAS_CELL_SIZE, INDEX_MAX_AGE, TILE_YEARS, TILES_PER_VIBE, index_path, tile_key
+
+ATLAS_SIZE = int(os.getenv("ATLAS_SIZE", str(ATLAS_CELL_SIZE)))
+ATLAS_CONCURRENCY = int(os.getenv("ATLAS_CONCURRENCY", "4"))
+ATLAS_RETAIN_SEC = int(os.getenv("ATLAS_RETAIN_SEC", str(INDEX_MAX_AGE * 2)))
+
+
+def prune_generations(manifest, new_keys: set[str]) -> int:
+    """
+    세대 목록에 새 인덱스의 아틀라스를 현재 세대로 넣고, 교체된 지 ATLAS_RETAIN_SEC가 지난 세대의
+    아틀라스 중 남은 세대가 쓰지 않는 것을 지운다. 지운 파일 수를 반환.
+    세대: {"replaced_at": 교체된 시각(epoch 초, 현재 세대는 null), "atlases": [key, ...]}
+    """
+    now = time.time()
+    generations = json.loads(manifest.read_text()) if manifest.exists() else []
+    legacy = manifest.with_name(manifest.name.replace(".generations.json", ".atlases"))
+    if legacy.exists():  # 세대 목록 이전 형식: 직전 인덱스의 아틀라스 목록
+        generations.append({"replaced_at": None, "atlases": legacy.read_text().split()})
+    for generation in generations:
+        if generation["replaced_at"] is None:
+            generation["replaced_at"] = now
+
+    kept = [g for g in generations if now - g["replaced_at"] < ATLAS_RETAIN_SEC]
+    kept.append({"replaced_at": None, "atlases": sorted(new_keys)})
+    in_use = {key for g in kept for key in g["atlases"]}
+    removed = 0
+    for generation in generations:
+        if generation in kept:
+            continue
+        for key in set(generation["atlases"]) - in_use:
+            path = thumbnails.atlas_path(key)
+            if path.exists():
+                path.unlink()
+                removed += 1
+
+    thumbnails.write_atomic(manifest, json.dumps(kept, separators=(",", ":")).encode("utf-8"))
+    legacy.unlink(missing_ok=True)
+    return removed
+
+
+async def load_albums() -> dict[str, list[tuple[str, str]]]:
+    """타일 -> [(album_group_id, cover_url)] (인기도 내림차순). 깨진 것으로 확인된 커버는 제외."""
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    async with AsyncSession(engine) as session:
+        result = await session.execute(
+            select(AlbumGroup.album_group_id, AlbumGroup.cover_url, AlbumGroup.original_year, MapNode.y)
+            .join(MapNode, AlbumGroup.album_group_id == MapNode.album_group_id)
+            .outerjoin(CoverCheck, CoverCheck.cover_url == AlbumGroup.cover_url)
+            .where(
+                AlbumGroup.cover_url.isnot(None),
+                AlbumGroup.original_year.isnot(None),
+                CoverCheck.ok.isnot(False),
+            )
+            .order_by(AlbumGroup.popularity.desc().nulls_last(), AlbumGroup.album_group_id)
+        )
+        rows = result.all()
+    await engine.dispose()
+
+    tiles = defaultdict(list)
+    for album_group_id, cover_url, year, y in rows:
+        tiles[tile_key(year, y)].append((album_group_id, cover_url))
+    return tiles
+
+
+async def build_tile(albums: list[tuple[str, str]], max_cells: int) -> list[dict]:
+    pages = []
+    for start in range(0, len(albums), max_cells):
+        page = albums[start:start + max_cells]
+        atlas = await thumbnails.build_atlas([url for _, url in page], ATLAS_SIZE)
+        pages.append({
+            "atlas": atlas.key,
+            "columns": atlas.columns,
+            "rows": atlas.rows,
+            "albums": {
+                album_group_id: [round(v, 6) for v in atlas.cell_uv(i)]
+                for i, (album_group_id, _) in enumerate(page)
+                if atlas.filled[i]
+            },
+        })
+    return pages
+
+
+async def main():
+    print("\n" + "=" * 60)
+    print(f"🧩 Map cover atlases ({ATLAS_SIZE}px cells)")
+    print("=" * 60)
+
+    if ATLAS_SIZE not in thumbnails.THUMB_SIZES:
+        print(f"❌ ATLAS_SIZE must be one of {thumbnails.THUMB_SIZES}")
+        sys.exit(1)
+
+    started = time.monotonic()
+    tiles = await load_albums()
+    total_albums = sum(len(a) for a in tiles.values())
+    print(f"📊 {total_albums} albums with covers in {len(tiles)} tiles")
+
+    max_cells = thumbnails.atlas_max_cells(ATLAS_SIZE)
+    semaphore = asyncio.Semaphore(ATLAS_CONCURRENCY)
+    index_tiles = {}
+    done = 0
+
+    async def run(key: str, albums: list[tuple[str, str]]):
+        nonlocal done
+        async with semaphore:
+            index_tiles[key] = await build_tile(albums, max_cells)
+        done += 1
+        if done % 20 == 0 or done == len(tiles):
+            print(f"  ⏳ {done}/{len(tiles)} tiles ({time.monotonic() - started:.0f}s)")
+
+    try:
+        await asyncio.gather(*(run(key, albums) for key, albums in tiles.items()))
+    finally:
+        await thumbnails.close()
+
+    index = {
+        "size": ATLAS_SIZE,
+        "tile_years": TILE_YEARS,
+        "tiles_per_vibe": TILES_PER_VIBE,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "tiles": dict(sorted(index_tiles.items())),
+    }
+    path = index_path(ATLAS_SIZE)
+    thumbnails.write_atomic(path, json.dumps(index, separators=(",", ":")).encode("utf-8"))
+
+    # 캐시된 이전 인덱스가 아직 가리킬 수 있는 아틀라스는 남기고 정리 (key에 크기가 들어가 있어 다른 크기와 겹치지 않음)
+    new_keys = {page["atlas"] for pages in index["tiles"].values() for page in pages}
+    removed = prune_generations(path.with_suffix(".generations.json"), new_keys)
+
+    pages = sum(len(p) for p in index["tiles"].values())
+    placed = sum(len(page["albums"]) for p in index["tiles"].values() for page in p)
+    print("\n" + "=" * 60)
+    print("✅ Atlases built")
+    print(f"  - tiles: {len(index['tiles'])}, atlas images: {pages}")
+    print(f"  - albums placed: {placed}/{total_albums}")
+    print(f"  - stale atlases removed: {removed} (kept for {ATLAS_RETAIN_SEC}s after replacement)")
+    print(f"  - index: {path}")
+    print(f"  - elapsed: {time.monotonic() - started:.1f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
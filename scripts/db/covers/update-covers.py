@@ -9,10 +9,9 @@
 import asyncio
 import os
 import sys
-import re
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
 
 # Docker 컨테이너 내부에서는 /app이 루트
 sys.path.insert(0, '/app')
@@ -33,31 +32,21 @@ async def update_musicbrainz_covers():
     print("\n🎨 Updating MusicBrainz album covers...")
     
     async with async_session() as session:
-        # MusicBrainz 앨범들 조회 (커버가 없는 것들)
-        stmt = select(AlbumGroup).where(
-            AlbumGroup.album_group_id.like('musicbrainz:release-group:%'),
-            (AlbumGroup.cover_url == None) | (AlbumGroup.cover_url.like('%picsum.photos%'))
+        # MusicBrainz 앨범들 (커버가 없는 것들) 을 한 번의 UPDATE로 처리
+        # 예: "musicbrainz:release-group:abc123" -> ".../release-group/abc123/front-500"
+        prefix = 'musicbrainz:release-group:'
+        rg_id = func.substr(AlbumGroup.album_group_id, len(prefix) + 1)
+        stmt = (
+            update(AlbumGroup)
+            .where(
+                AlbumGroup.album_group_id.like(f'{prefix}_%'),
+                (AlbumGroup.cover_url == None) | (AlbumGroup.cover_url.like('%picsum.photos%'))
+            )
+            .values(cover_url='https://coverartarchive.org/release-group/' + rg_id + '/front-500')
+            .execution_options(synchronize_session=False)
         )
         result = await session.execute(stmt)
-        albums = result.scalars().all()
-        
-        print(f"📊 Found {len(albums)} MusicBrainz albums without covers")
-        
-        updated_count = 0
-        for album in albums:
-            # MusicBrainz Release Group ID 추출
-            # 예: "musicbrainz:release-group:abc123" -> "abc123"
-            match = re.match(r'musicbrainz:release-group:(.+)', album.album_group_id)
-            if match:
-                rg_id = match.group(1)
-                cover_url = f"https://coverartarchive.org/release-group/{rg_id}/front-500"
-                
-                # 앨범 업데이트
-                album.cover_url = cover_url
-                updated_count += 1
-                
-                if updated_count % 50 == 0:
-                    print(f"   ✅ Updated: {updated_count}/{len(albums)}")
+        updated_count = result.rowcount
         
         # DB에 커밋
         await session.commit()
@@ -94,18 +83,17 @@ async def update_dummy_covers():
     print("\n📊 Checking for dummy covers (picsum.photos)...")
     
     async with async_session() as session:
-        stmt = select(AlbumGroup).where(AlbumGroup.cover_url.like('%picsum.photos%'))
-        result = await session.execute(stmt)
-        albums = result.scalars().all()
+        stmt = select(func.count()).select_from(AlbumGroup).where(AlbumGroup.cover_url.like('%picsum.photos%'))
+        dummy_count = (await session.execute(stmt)).scalar()
         
-        print(f"   Found {len(albums)} albums with dummy covers")
+        print(f"   Found {dummy_count} albums with dummy covers")
         
-        if len(albums) > 0:
+        if dummy_count > 0:
             print("\n   These are likely test/seed data. Consider:")
             print("   1. Delete them: DELETE FROM albums WHERE cover_url LIKE '%picsum.photos%';")
             print("   2. Or ignore them (they're just test data)")
         
-        return len(albums)
+        return dummy_count
 
 
 async def show_cover_stats():
@@ -115,43 +103,38 @@ async def show_cover_stats():
     print("=" * 60)
     
     async with async_session() as session:
+        async def count(*conditions) -> int:
+            stmt = select(func.count()).select_from(AlbumGroup).where(*conditions)
+            return (await session.execute(stmt)).scalar()
+
         # 전체 앨범 수
-        stmt = select(AlbumGroup)
-        result = await session.execute(stmt)
-        total = len(result.scalars().all())
+        total = await count()
         
         # 커버가 있는 앨범
-        stmt = select(AlbumGroup).where(AlbumGroup.cover_url != None, AlbumGroup.cover_url != '')
-        result = await session.execute(stmt)
-        with_covers = len(result.scalars().all())
+        with_covers = await count(AlbumGroup.cover_url != None, AlbumGroup.cover_url != '')
         
         # 커버가 없는 앨범
-        stmt = select(AlbumGroup).where((AlbumGroup.cover_url == None) | (AlbumGroup.cover_url == ''))
-        result = await session.execute(stmt)
-        without_covers = len(result.scalars().all())
+        without_covers = await count((AlbumGroup.cover_url == None) | (AlbumGroup.cover_url == ''))
         
         # 더미 이미지
-        stmt = select(AlbumGroup).where(AlbumGroup.cover_url.like('%picsum.photos%'))
-        result = await session.execute(stmt)
-        dummy_covers = len(result.scalars().all())
+        dummy_covers = await count(AlbumGroup.cover_url.like('%picsum.photos%'))
         
         # MusicBrainz 커버
-        stmt = select(AlbumGroup).where(
+        mb_covers = await count(
             AlbumGroup.album_group_id.like('musicbrainz:%'),
             AlbumGroup.cover_url.like('%coverartarchive.org%')
         )
-        result = await session.execute(stmt)
-        mb_covers = len(result.scalars().all())
         
         # Spotify 커버
-        stmt = select(AlbumGroup).where(
+        spotify_covers = await count(
             AlbumGroup.album_group_id.like('spotify:%'),
             AlbumGroup.cover_url != None
         )
-        result = await session.execute(stmt)
-        spotify_covers = len(result.scalars().all())
         
         print(f"\n📊 Total Albums: {total}")
+        if not total:
+            print("=" * 60)
+            return
         print(f"   ✅ With Covers: {with_covers} ({with_covers/total*100:.1f}%)")
         print(f"   ❌ Without Covers: {without_covers} ({without_covers/total*100:.1f}%)")
         print(f"   🎲 Dummy Covers (picsum): {dummy_covers}")
@@ -182,6 +165,9 @@ async def main():
     
     print("\n✅ Cover update completed!")
     print(f"   Updated: {mb_updated} MusicBrainz albums")
+    if mb_updated:
+        # Cover Art Archive URL은 존재 여부를 확인하지 않고 만든 것이므로 검증 단계를 돌린다
+        print("   ➡️  Run scripts/db/covers/validate-covers.py to verify the new cover URLs")
 
 
 if __name__ == "__main__":
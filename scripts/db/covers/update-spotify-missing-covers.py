@@ -7,18 +7,18 @@ Strategy:
 3) Fallback to Discogs search (strict).
 4) Update cover_url only on confident match.
 
+MusicBrainz와 Discogs는 앨범마다 동시에 조회하고, 제공자별 허용 속도 안에서 여러 앨범을 병렬로 처리한다.
+
 Env:
   DISCOGS_TOKEN (optional)
   COVER_LIMIT (optional, default: 0 = no limit)
   DRY_RUN (optional, "1" to skip DB updates)
+  COVER_CONCURRENCY (optional, default: 8 albums in flight)
 """
 
 import asyncio
-import json
 import os
-import re
 import sys
-from difflib import SequenceMatcher
 from pathlib import Path
 
 import httpx
@@ -28,7 +28,12 @@ from sqlalchemy import select
 
 # Docker 컨테이너 내부에서는 /app이 루트
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from app.models import AlbumGroup
+from lib.cover_check import check_cover
+from lib.enrichment import Provider, map_bounded
+from lib.kv_cache import DAY, KVCache
+from lib.matching import best_candidate
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -39,39 +44,19 @@ DISCOGS_TOKEN = os.getenv("DISCOGS_TOKEN")
 COVER_LIMIT = int(os.getenv("COVER_LIMIT", "0"))
 DRY_RUN = os.getenv("DRY_RUN", "0") == "1"
 
+# 캐시 (SQLite, 키 단위 저장). 예전 JSON 캐시는 처음 실행할 때 가져온다.
+CACHE_DB = Path("./out/enrich_cache.sqlite")
 MB_CACHE_FILE = Path("./out/cover_cache_mb.json")
 DISCOGS_CACHE_FILE = Path("./out/cover_cache_discogs.json")
+NOT_FOUND_TTL = 30 * DAY  # 커버를 못 찾은 앨범은 30일 뒤 다시 조회
 
-MB_RATE_LIMIT_SEC = 1.0
-DISCOGS_RATE_LIMIT_SEC = 1.1
-
-
-def normalize_text(text: str) -> str:
-    if not text:
-        return ""
-    text = text.lower()
-    text = re.sub(r"\([^)]*\)", " ", text)
-    text = re.sub(r"\[[^]]*\]", " ", text)
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
-
-
-def similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
-
-
-def load_cache(path: Path) -> dict:
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+COVER_CONCURRENCY = int(os.getenv("COVER_CONCURRENCY", "8"))
+PROGRESS_EVERY = 50
 
-
-def save_cache(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+MUSICBRAINZ = Provider("musicbrainz", rate=1.0, concurrency=2,
+                       headers={"User-Agent": "MusicMapApp/1.0 (contact@example.com)"})
+DISCOGS = Provider("discogs", rate=0.9, concurrency=2)  # 60 req/min 보다 약간 낮게
+COVER_ART_ARCHIVE = Provider("coverartarchive", rate=10.0, burst=5, concurrency=8)
 
 
 async def mb_search_release_group(client: httpx.AsyncClient, artist: str, title: str, year: int | None):
@@ -81,45 +66,35 @@ async def mb_search_release_group(client: httpx.AsyncClient, artist: str, title:
     query = " AND ".join(query_parts)
     url = "https://musicbrainz.org/ws/2/release-group"
     params = {"query": query, "fmt": "json", "limit": 5}
-    res = await client.get(url, params=params, headers={"User-Agent": "MusicMapApp/1.0 (contact@example.com)"})
+    res = await MUSICBRAINZ.get(client, url, params=params)
     res.raise_for_status()
     return res.json().get("release-groups", [])
 
 
 async def mb_cover_exists(client: httpx.AsyncClient, rg_id: str) -> bool:
     url = f"https://coverartarchive.org/release-group/{rg_id}/front-500"
-    res = await client.head(url)
-    return res.status_code == 200
+    status = await check_cover(COVER_ART_ARCHIVE, client, url)
+    return bool(status.ok)
+
+
+def release_year(value) -> int | None:
+    try:
+        return int(str(value)[:4]) if value else None
+    except ValueError:
+        return None
 
 
 def pick_mb_candidate(artist: str, title: str, year: int | None, candidates: list[dict]) -> dict | None:
-    norm_artist = normalize_text(artist)
-    norm_title = normalize_text(title)
-    best = None
-    best_score = 0.0
-    for c in candidates:
-        c_title = c.get("title", "")
+    def extract(c: dict):
         c_artist_credits = c.get("artist-credit") or []
         c_artist = c_artist_credits[0].get("name") if c_artist_credits else ""
-        c_year = None
-        if c.get("first-release-date"):
-            try:
-                c_year = int(str(c.get("first-release-date"))[:4])
-            except Exception:
-                c_year = None
-        title_sim = similarity(norm_title, normalize_text(c_title))
-        artist_sim = similarity(norm_artist, normalize_text(c_artist))
-        year_bonus = 0.0
-        if year and c_year and abs(year - c_year) <= 1:
-            year_bonus = 0.05
-        mb_score = float(c.get("score", 0)) / 100.0
-        combined = (0.45 * title_sim) + (0.45 * artist_sim) + (0.10 * mb_score) + year_bonus
-        if combined > best_score:
-            best_score = combined
-            best = c
-    if best_score >= 0.90:
-        return best
-    return None
+        return c.get("title", ""), c_artist, release_year(c.get("first-release-date"))
+
+    return best_candidate(
+        title, artist, year, candidates, extract,
+        title_weight=0.45, artist_weight=0.45,
+        extra_score=lambda c: 0.10 * float(c.get("score", 0)) / 100.0,
+    )
 
 
 async def discogs_search(client: httpx.AsyncClient, artist: str, title: str, year: int | None):
@@ -134,35 +109,45 @@ async def discogs_search(client: httpx.AsyncClient, artist: str, title: str, yea
     }
     if year:
         params["year"] = year
-    res = await client.get("https://api.discogs.com/database/search", params=params)
+    res = await DISCOGS.get(client, "https://api.discogs.com/database/search", params=params)
     res.raise_for_status()
     return res.json().get("results", [])
 
 
 def pick_discogs_candidate(artist: str, title: str, year: int | None, results: list[dict]) -> dict | None:
-    norm_artist = normalize_text(artist)
-    norm_title = normalize_text(title)
-    best = None
-    best_score = 0.0
-    for r in results:
+    def extract(r: dict):
         r_title = r.get("title", "")
         # Discogs title often "Artist - Album"
         if " - " in r_title:
             r_artist, r_album = r_title.split(" - ", 1)
         else:
             r_artist, r_album = "", r_title
-        title_sim = similarity(norm_title, normalize_text(r_album))
-        artist_sim = similarity(norm_artist, normalize_text(r_artist))
-        year_bonus = 0.0
-        r_year = r.get("year")
-        if year and r_year and abs(year - int(r_year)) <= 1:
-            year_bonus = 0.05
-        combined = (0.5 * title_sim) + (0.45 * artist_sim) + year_bonus
-        if combined > best_score:
-            best_score = combined
-            best = r
-    if best_score >= 0.90:
-        return best
+        return r_album, r_artist, release_year(r.get("year"))
+
+    return best_candidate(title, artist, year, results, extract, title_weight=0.5, artist_weight=0.45)
+
+
+async def find_mb_cover(client: httpx.AsyncClient, artist: str, title: str, year: int | None) -> str | None:
+    try:
+        candidates = await mb_search_release_group(client, artist, title, year)
+        mb_best = pick_mb_candidate(artist, title, year, candidates)
+        if mb_best:
+            rg_id = mb_best.get("id")
+            if rg_id and await mb_cover_exists(client, rg_id):
+                return f"https://coverartarchive.org/release-group/{rg_id}/front-500"
+    except Exception:
+        return None
+    return None
+
+
+async def find_discogs_cover(client: httpx.AsyncClient, artist: str, title: str, year: int | None) -> str | None:
+    try:
+        results = await discogs_search(client, artist, title, year)
+        discogs_best = pick_discogs_candidate(artist, title, year, results)
+        if discogs_best:
+            return discogs_best.get("cover_image")
+    except Exception:
+        return None
     return None
 
 
@@ -170,98 +155,79 @@ async def main():
     engine = create_async_engine(DATABASE_URL, echo=False)
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-    mb_cache = load_cache(MB_CACHE_FILE)
-    discogs_cache = load_cache(DISCOGS_CACHE_FILE)
+    # cover_url이 없는 항목은 음성 결과 (NOT_FOUND_TTL 뒤 만료)
+    not_found = lambda entry: not (entry or {}).get("cover_url")
+    mb_cache = KVCache(CACHE_DB, "cover_mb", negative_ttl=NOT_FOUND_TTL,
+                       legacy_json=MB_CACHE_FILE, is_negative=not_found)
+    discogs_cache = KVCache(CACHE_DB, "cover_discogs", negative_ttl=NOT_FOUND_TTL,
+                            legacy_json=DISCOGS_CACHE_FILE, is_negative=not_found)
+
+    async def resolve_cover(album) -> str | None:
+        """캐시 -> (MusicBrainz, Discogs 동시 조회) 순으로 커버 URL 결정. MusicBrainz 결과 우선."""
+        cache_key = f"{album.album_group_id}"
+        if cache_key in mb_cache and mb_cache[cache_key].get("cover_url"):
+            return mb_cache[cache_key]["cover_url"]
+
+        title = album.title or ""
+        artist = album.primary_artist_display or ""
+        year = album.original_year
+
+        cached_discogs = discogs_cache.get(cache_key) if DISCOGS_TOKEN else None
+        if cached_discogs and cached_discogs.get("cover_url"):
+            return cached_discogs["cover_url"]
+
+        lookups = [find_mb_cover(client, artist, title, year)]
+        if DISCOGS_TOKEN and not (cached_discogs and cached_discogs.get("notFound")):
+            lookups.append(find_discogs_cover(client, artist, title, year))
+        found = await asyncio.gather(*lookups)
+        cover_url = found[0] or (found[1] if len(found) > 1 else None)
+
+        mb_cache[cache_key] = {
+            "cover_url": cover_url,
+            "source": "musicbrainz" if cover_url and "coverartarchive.org" in cover_url else "discogs" if cover_url else None,
+        }
+        discogs_cache[cache_key] = {
+            "cover_url": cover_url if cover_url and "coverartarchive.org" not in cover_url else None,
+            "notFound": cover_url is None,
+        }
+        return cover_url
 
     async with async_session() as session:
         stmt = select(AlbumGroup).where(
             AlbumGroup.album_group_id.like("spotify:album:%"),
             (AlbumGroup.cover_url == None) | (AlbumGroup.cover_url == "")
         )
+        if COVER_LIMIT > 0:
+            stmt = stmt.limit(COVER_LIMIT)
         result = await session.execute(stmt)
         albums = result.scalars().all()
 
-        if COVER_LIMIT > 0:
-            albums = albums[:COVER_LIMIT]
-
         print(f"🖼️  Missing Spotify covers: {len(albums)} (limit={COVER_LIMIT or 'all'})")
 
         updated = 0
         async with httpx.AsyncClient(timeout=30) as client:
-            for idx, album in enumerate(albums, start=1):
-                album_id = album.album_group_id
-                title = album.title or ""
-                artist = album.primary_artist_display or ""
-                year = album.original_year
-
-                cache_key = f"{album_id}"
-                if cache_key in mb_cache and mb_cache[cache_key].get("cover_url"):
-                    cover_url = mb_cache[cache_key]["cover_url"]
-                    if not DRY_RUN:
-                        album.cover_url = cover_url
-                    updated += 1
-                    continue
-
-                cover_url = None
-
-                # 1) MusicBrainz
-                try:
-                    candidates = await mb_search_release_group(client, artist, title, year)
-                    mb_best = pick_mb_candidate(artist, title, year, candidates)
-                    if mb_best:
-                        rg_id = mb_best.get("id")
-                        if rg_id and await mb_cover_exists(client, rg_id):
-                            cover_url = f"https://coverartarchive.org/release-group/{rg_id}/front-500"
-                except Exception:
+            idx = 0
+            async for album, cover_url in map_bounded(albums, resolve_cover, COVER_CONCURRENCY):
+                idx += 1
+                if isinstance(cover_url, Exception):
                     cover_url = None
 
-                await asyncio.sleep(MB_RATE_LIMIT_SEC)
-
-                # 2) Discogs fallback
-                if not cover_url and DISCOGS_TOKEN:
-                    cached_discogs = discogs_cache.get(cache_key)
-                    if cached_discogs:
-                        if cached_discogs.get("cover_url"):
-                            cover_url = cached_discogs["cover_url"]
-                        elif cached_discogs.get("notFound"):
-                            cover_url = None
-                        if cover_url:
-                            if not DRY_RUN:
-                                album.cover_url = cover_url
-                            updated += 1
-                            continue
-                    try:
-                        results = await discogs_search(client, artist, title, year)
-                        discogs_best = pick_discogs_candidate(artist, title, year, results)
-                        if discogs_best:
-                            cover_url = discogs_best.get("cover_image")
-                    except Exception:
-                        cover_url = None
-                    await asyncio.sleep(DISCOGS_RATE_LIMIT_SEC)
-
-                mb_cache[cache_key] = {
-                    "cover_url": cover_url,
-                    "source": "musicbrainz" if cover_url and "coverartarchive.org" in cover_url else "discogs" if cover_url else None,
-                }
-                discogs_cache[cache_key] = {
-                    "cover_url": cover_url if cover_url and "coverartarchive.org" not in cover_url else None,
-                    "notFound": cover_url is None,
-                }
-                save_cache(MB_CACHE_FILE, mb_cache)
-                save_cache(DISCOGS_CACHE_FILE, discogs_cache)
-
                 if cover_url:
                     if not DRY_RUN:
                         album.cover_url = cover_url
                     updated += 1
 
-                if idx % 50 == 0:
+                if idx % PROGRESS_EVERY == 0:
                     print(f"Processed {idx}/{len(albums)} | Updated: {updated}")
 
-            if not DRY_RUN:
-                await session.commit()
+        mb_cache.close()
+        discogs_cache.close()
+
+        if not DRY_RUN:
+            await session.commit()
 
     await engine.dispose()
+    print(f"   {MUSICBRAINZ.stats()} | {DISCOGS.stats()} | {COVER_ART_ARCHIVE.stats()}")
     print(f"✅ Done. Updated covers: {updated}")
 
 
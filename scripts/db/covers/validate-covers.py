@@ -0,0 +1,147 @@
+"""
+Validate album cover URLs and record the result in cover_checks.
+
+Strategy:
+1) Collect distinct cover_url values from album_groups / releases that were never checked,
+   were checked before COVER_RECHECK_DAYS, or hit a transient error last time.
+2) Probe each URL with a small Range GET over one pooled (HTTP/2 when h2 is installed) client,
+   many requests in flight per host within each host's rate limit.
+3) Upsert status code, content type and image dimensions into cover_checks.
+
+API는 cover_checks에서 깨진 것으로 확인된 URL(ok = false)을 응답에서 뺀다 (app/covers.py).
+
+Env:
+  COVER_RECHECK_DAYS (optional, default: 30)
+  VALIDATE_CONCURRENCY (optional, default: 32 requests in flight)
+  VALIDATE_LIMIT (optional, default: 0 = no limit)
+
+Usage:
+  docker exec sonic_backend python scripts/db/covers/validate-covers.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+
+sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.database import DATABASE_URL, Base
+from app.models import CoverCheck
+from lib.cover_check import check_cover
+from lib.enrichment import Provider, map_bounded
+from lib.incremental import upsert_rows
+
+try:
+    import h2  # noqa: F401 - httpx[http2]
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+COVER_RECHECK_DAYS = int(os.getenv("COVER_RECHECK_DAYS", "30"))
+VALIDATE_CONCURRENCY = int(os.getenv("VALIDATE_CONCURRENCY", "32"))
+VALIDATE_LIMIT = int(os.getenv("VALIDATE_LIMIT", "0"))
+WRITE_EVERY = 500
+
+# 호스트별 속도 제한. Spotify CDN은 넉넉하고 Cover Art Archive는 archive.org로 리다이렉트된다.
+PROVIDERS = {
+    "i.scdn.co": Provider("i.scdn.co", rate=50.0, burst=20, concurrency=VALIDATE_CONCURRENCY),
+    "coverartarchive.org": Provider("coverartarchive", rate=10.0, burst=5, concurrency=8),
+}
+DEFAULT_PROVIDER = Provider("other", rate=10.0, burst=5, concurrency=8)
+
+
+def provider_for(url: str) -> Provider:
+    return PROVIDERS.get(urlsplit(url).hostname or "", DEFAULT_PROVIDER)
+
+
+async def load_urls(session: AsyncSession) -> list[str]:
+    sql = """
+        SELECT u.cover_url
+        FROM (
+            SELECT cover_url FROM album_groups WHERE cover_url IS NOT NULL
+            UNION
+            SELECT cover_url FROM releases WHERE cover_url IS NOT NULL
+        ) u
+        LEFT JOIN cover_checks c ON c.cover_url = u.cover_url
+        WHERE c.cover_url IS NULL
+           OR c.ok IS NULL
+           OR c.checked_at < now() - make_interval(days => :days)
+        ORDER BY c.checked_at NULLS FIRST
+    """
+    if VALIDATE_LIMIT:
+        sql += f" LIMIT {VALIDATE_LIMIT}"
+    result = await session.execute(text(sql), {"days": COVER_RECHECK_DAYS})
+    return [r[0] for r in result.all() if r[0].startswith(("http://", "https://"))]
+
+
+async def main():
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[CoverCheck.__table__])
+
+    async with async_session() as session:
+        urls = await load_urls(session)
+
+    print(f"🔍 Covers to validate: {len(urls)} (HTTP/2: {'on' if HTTP2 else 'off'})")
+    if not urls:
+        return
+
+    counts = Counter()
+    pending = []
+    started = time.monotonic()
+
+    async def flush(session: AsyncSession):
+        if not pending:
+            return
+        await upsert_rows(
+            session, CoverCheck, pending, ["cover_url"],
+            update_columns=["ok", "status_code", "content_type", "width", "height", "checked_at"],
+        )
+        await session.commit()
+        pending.clear()
+
+    limits = httpx.Limits(max_connections=VALIDATE_CONCURRENCY * 2, max_keepalive_connections=VALIDATE_CONCURRENCY)
+    async with httpx.AsyncClient(http2=HTTP2, limits=limits, timeout=20) as client, async_session() as session:
+        done = 0
+        async for url, status in map_bounded(
+            urls, lambda u: check_cover(provider_for(u), client, u), VALIDATE_CONCURRENCY
+        ):
+            done += 1
+            if isinstance(status, Exception):
+                counts["error"] += 1
+                continue
+            counts["ok" if status.ok else "broken" if status.ok is False else "retry"] += 1
+            pending.append({**status.as_row(), "checked_at": datetime.now(timezone.utc)})
+            if len(pending) >= WRITE_EVERY:
+                await flush(session)
+                elapsed = time.monotonic() - started
+                print(f"  ⏳ {done}/{len(urls)} ({done / elapsed:.0f} urls/s) | ok {counts['ok']}, broken {counts['broken']}")
+        await flush(session)
+
+    await engine.dispose()
+
+    print("\n" + "=" * 60)
+    print("✅ Cover validation done")
+    print(f"  - ok: {counts['ok']}")
+    print(f"  - broken: {counts['broken']}")
+    print(f"  - transient (retry next run): {counts['retry'] + counts['error']}")
+    print(f"  - elapsed: {time.monotonic() - started:.1f}s")
+    for provider in [*PROVIDERS.values(), DEFAULT_PROVIDER]:
+        print(f"  - {provider.stats()}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,97 +2,106 @@
 발매일자 보완 스크립트
 
 Spotify에서 발매일이 없는 앨범에 대해 MusicBrainz와 Discogs에서 발매일을 가져옴
+(두 제공자를 앨범마다 동시에 조회하고, 각 제공자의 허용 속도만큼 여러 앨범을 병렬 처리)
 
 Usage:
   docker exec sonic_backend python scripts/db/enrich/enrich-release-dates.py
 """
 
 import asyncio
+import os
 import sys
-import aiohttp
-import json
+import httpx
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select, update
 from app.database import DATABASE_URL
 from app.models import AlbumGroup, Release
+from lib.enrichment import Provider, map_bounded
+from lib.kv_cache import DAY, KVCache
+from lib.matching import best_candidate
 
-# 캐시 파일 경로
+# 캐시 (SQLite, 키 단위 저장). 예전 JSON 캐시는 처음 실행할 때 가져온다.
 CACHE_DIR = Path("/out")
+CACHE_DB = CACHE_DIR / "enrich_cache.sqlite"
 MB_CACHE_FILE = CACHE_DIR / "mb_release_cache.json"
-DISCOGS_CACHE_FILE = CACHE_DIR / "discogs_release_cache.json"
+NOT_FOUND_TTL = 30 * DAY  # 못 찾은 앨범은 30일 뒤 다시 조회
 
 # API 설정
 MUSICBRAINZ_API = "https://musicbrainz.org/ws/2"
 DISCOGS_API = "https://api.discogs.com"
 USER_AGENT = "SonicChronos/1.0 (https://github.com/yourusername/sonic-chronos)"
 
-# Rate limiting
-REQUEST_DELAY = 1.0  # MusicBrainz: 1 req/sec, Discogs: 60 req/min
+# Rate limiting (제공자별 허용 속도)
+MUSICBRAINZ = Provider("musicbrainz", rate=1.0, concurrency=2, headers={'User-Agent': USER_AGENT})  # 1 req/sec
+DISCOGS = Provider("discogs", rate=1.0, concurrency=2, headers={'User-Agent': USER_AGENT})  # 60 req/min (인증)
+ALBUM_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", "8"))
+COMMIT_EVERY = 50
+SEARCH_LIMIT = 5  # 검색 결과 몇 개 중 가장 비슷한 것을 고른다
 
 
-def load_cache(cache_file: Path) -> dict:
-    """캐시 파일 로드"""
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+def mb_release_fields(release: dict):
+    credits = release.get('artist-credit') or []
+    return release.get('title', ''), credits[0].get('name', '') if credits else '', None
 
 
-def save_cache(cache_file: Path, cache: dict):
-    """캐시 파일 저장"""
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+def discogs_result_fields(result: dict):
+    # Discogs title은 "Artist - Album" 형식
+    title = result.get('title', '')
+    if ' - ' in title:
+        artist, album = title.split(' - ', 1)
+        return album, artist, None
+    return title, '', None
 
 
-async def search_musicbrainz(session: aiohttp.ClientSession, artist: str, title: str) -> Optional[date]:
+async def search_musicbrainz(client: httpx.AsyncClient, artist: str, title: str) -> Optional[date]:
     """MusicBrainz에서 앨범 발매일 검색"""
     try:
         # Release 검색
         params = {
             'query': f'artist:"{artist}" AND release:"{title}"',
             'fmt': 'json',
-            'limit': 1
+            'limit': SEARCH_LIMIT
         }
         
         url = f"{MUSICBRAINZ_API}/release"
-        headers = {'User-Agent': USER_AGENT}
         
-        async with session.get(url, params=params, headers=headers) as response:
-            if response.status != 200:
-                return None
-            
-            data = await response.json()
-            releases = data.get('releases', [])
-            
-            if not releases:
-                return None
-            
-            # 첫 번째 결과의 날짜 가져오기
-            release = releases[0]
-            date_str = release.get('date')
-            
-            if date_str:
-                # YYYY, YYYY-MM, YYYY-MM-DD 형식 지원
-                try:
-                    if len(date_str) == 4:  # YYYY
-                        return date(int(date_str), 1, 1)
-                    elif len(date_str) == 7:  # YYYY-MM
-                        parts = date_str.split('-')
-                        return date(int(parts[0]), int(parts[1]), 1)
-                    else:  # YYYY-MM-DD
-                        return datetime.fromisoformat(date_str).date()
-                except (ValueError, AttributeError):
-                    pass
+        response = await MUSICBRAINZ.get(client, url, params=params)
+        if response.status_code != 200:
+            return None
+        
+        data = response.json()
+        releases = data.get('releases', [])
+        
+        if not releases:
+            return None
+        
+        # 제목/아티스트가 충분히 비슷한 결과의 날짜만 사용
+        release = best_candidate(title, artist, None, releases, mb_release_fields)
+        if not release:
+            return None
+        date_str = release.get('date')
+        
+        if date_str:
+            # YYYY, YYYY-MM, YYYY-MM-DD 형식 지원
+            try:
+                if len(date_str) == 4:  # YYYY
+                    return date(int(date_str), 1, 1)
+                elif len(date_str) == 7:  # YYYY-MM
+                    parts = date_str.split('-')
+                    return date(int(parts[0]), int(parts[1]), 1)
+                else:  # YYYY-MM-DD
+                    return datetime.fromisoformat(date_str).date()
+            except (ValueError, AttributeError):
+                pass
         
-        await asyncio.sleep(REQUEST_DELAY)
         return None
     
     except Exception as e:
@@ -100,7 +109,7 @@ async def search_musicbrainz(session: aiohttp.ClientSession, artist: str, title:
         return None
 
 
-async def search_discogs(session: aiohttp.ClientSession, artist: str, title: str, discogs_token: Optional[str]) -> Optional[date]:
+async def search_discogs(client: httpx.AsyncClient, artist: str, title: str, discogs_token: Optional[str]) -> Optional[date]:
     """Discogs에서 앨범 발매일 검색"""
     if not discogs_token:
         return None
@@ -109,32 +118,34 @@ async def search_discogs(session: aiohttp.ClientSession, artist: str, title: str
         params = {
             'q': f'{artist} {title}',
             'type': 'release',
-            'token': discogs_token
+            'token': discogs_token,
+            'per_page': SEARCH_LIMIT
         }
         
         url = f"{DISCOGS_API}/database/search"
         
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                return None
-            
-            data = await response.json()
-            results = data.get('results', [])
-            
-            if not results:
-                return None
-            
-            # 첫 번째 결과의 날짜 가져오기
-            result = results[0]
-            year_str = result.get('year')
-            
-            if year_str:
-                try:
-                    return date(int(year_str), 1, 1)
-                except (ValueError, AttributeError):
-                    pass
+        response = await DISCOGS.get(client, url, params=params)
+        if response.status_code != 200:
+            return None
+        
+        data = response.json()
+        results = data.get('results', [])
+        
+        if not results:
+            return None
+        
+        # 제목/아티스트가 충분히 비슷한 결과의 날짜만 사용
+        result = best_candidate(title, artist, None, results, discogs_result_fields)
+        if not result:
+            return None
+        year_str = result.get('year')
+        
+        if year_str:
+            try:
+                return date(int(year_str), 1, 1)
+            except (ValueError, AttributeError):
+                pass
         
-        await asyncio.sleep(REQUEST_DELAY)
         return None
     
     except Exception as e:
@@ -152,12 +163,10 @@ async def enrich_release_dates():
     engine = create_async_engine(DATABASE_URL, echo=False)
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     
-    # 캐시 로드
-    mb_cache = load_cache(MB_CACHE_FILE)
-    discogs_cache = load_cache(DISCOGS_CACHE_FILE)
+    # 캐시 열기 (artist|||title -> 발매일 또는 None)
+    mb_cache = KVCache(CACHE_DB, "release_date", negative_ttl=NOT_FOUND_TTL, legacy_json=MB_CACHE_FILE)
     
     # Discogs 토큰 (환경변수에서)
-    import os
     discogs_token = os.getenv('DISCOGS_TOKEN')
     
     if not discogs_token:
@@ -180,74 +189,72 @@ async def enrich_release_dates():
         print("✅ 모든 앨범에 발매일이 있습니다!")
         return
     
-    # HTTP 세션 생성
-    async with aiohttp.ClientSession() as http_session:
-        enriched = 0
-        failed = 0
+    async def lookup(row):
+        """앨범 하나: 캐시 확인 후 MusicBrainz와 Discogs를 동시에 조회 (MusicBrainz 결과 우선)"""
+        album, _ = row
+        cache_key = f"{album.primary_artist_display}|||{album.title}"
         
-        for i, (album, release) in enumerate(albums_without_dates):
-            if i % 10 == 0:
-                print(f"진행중: {i}/{len(albums_without_dates)}...")
-            
-            cache_key = f"{album.primary_artist_display}|||{album.title}"
+        # 캐시 확인
+        if cache_key in mb_cache:
+            cached = mb_cache[cache_key]
+            try:
+                return datetime.fromisoformat(cached).date() if cached else None
+            except ValueError:
+                return None
+        
+        mb_date, discogs_date = await asyncio.gather(
+            search_musicbrainz(http_client, album.primary_artist_display, album.title),
+            search_discogs(http_client, album.primary_artist_display, album.title, discogs_token),
+        )
+        release_date = mb_date or discogs_date
+        
+        # 캐시 저장
+        mb_cache[cache_key] = release_date.isoformat() if release_date else None
+        return release_date
+    
+    enriched = 0
+    failed = 0
+    processed = 0
+    
+    # 앨범 ALBUM_CONCURRENCY개를 동시에 처리, 완료되는 대로 DB에 반영
+    async with httpx.AsyncClient(timeout=30) as http_client, async_session() as session:
+        async for (album, release), release_date in map_bounded(albums_without_dates, lookup, ALBUM_CONCURRENCY):
+            processed += 1
+            if processed % 10 == 0:
+                print(f"진행중: {processed}/{len(albums_without_dates)}...")
             
-            # 캐시 확인
-            if cache_key in mb_cache:
-                release_date = mb_cache[cache_key]
-                if release_date:
-                    try:
-                        release_date = datetime.fromisoformat(release_date).date()
-                    except:
-                        release_date = None
-            else:
-                # MusicBrainz 검색
-                release_date = await search_musicbrainz(
-                    http_session,
-                    album.primary_artist_display,
-                    album.title
-                )
-                
-                # 없으면 Discogs 검색
-                if not release_date and discogs_token:
-                    release_date = await search_discogs(
-                        http_session,
-                        album.primary_artist_display,
-                        album.title,
-                        discogs_token
-                    )
-                
-                # 캐시 저장
-                mb_cache[cache_key] = release_date.isoformat() if release_date else None
+            if isinstance(release_date, Exception):
+                print(f"⚠️  {album.primary_artist_display} - {album.title}: {release_date}")
+                release_date = None
             
             # DB 업데이트
             if release_date:
-                async with async_session() as session:
-                    # Release 업데이트
-                    stmt = (
-                        update(Release)
-                        .where(Release.release_id == release.release_id)
-                        .values(release_date=release_date)
-                    )
-                    await session.execute(stmt)
-                    
-                    # AlbumGroup의 earliest_release_date도 업데이트
-                    stmt = (
-                        update(AlbumGroup)
-                        .where(AlbumGroup.album_group_id == album.album_group_id)
-                        .values(earliest_release_date=release_date)
-                    )
-                    await session.execute(stmt)
-                    
-                    await session.commit()
+                # Release 업데이트
+                stmt = (
+                    update(Release)
+                    .where(Release.release_id == release.release_id)
+                    .values(release_date=release_date)
+                )
+                await session.execute(stmt)
+                
+                # AlbumGroup의 earliest_release_date도 업데이트
+                stmt = (
+                    update(AlbumGroup)
+                    .where(AlbumGroup.album_group_id == album.album_group_id)
+                    .values(earliest_release_date=release_date)
+                )
+                await session.execute(stmt)
                 
                 enriched += 1
                 print(f"✅ {album.primary_artist_display} - {album.title}: {release_date}")
+                if enriched % COMMIT_EVERY == 0:
+                    await session.commit()
             else:
                 failed += 1
+        
+        await session.commit()
     
-    # 캐시 저장
-    save_cache(MB_CACHE_FILE, mb_cache)
-    save_cache(DISCOGS_CACHE_FILE, discogs_cache)
+    mb_cache.close()
     
     print("\n" + "="*70)
     print("✅ 발매일자 보완 완료")
@@ -255,6 +262,8 @@ async def enrich_release_dates():
     print(f"\n📈 결과:")
     print(f"   • 보완 성공: {enriched}개")
     print(f"   • 실패: {failed}개")
+    print(f"   • {MUSICBRAINZ.stats()}")
+    print(f"   • {DISCOGS.stats()}")
     print()
 
 
@@ -0,0 +1,151 @@
+"""
+Spotify 앨범 메타데이터 일괄 갱신
+
+spotify:album:* 앨범 전체를 /v1/albums?ids= 배치(20개씩, 여러 배치 동시)로 다시 조회해서
+제목 / popularity / 커버 / 발매일을 갱신한다.
+조회 결과는 임시 테이블에 COPY 한 번으로 적재하고, 테이블마다 UPDATE ... FROM 한 문장으로 반영한다.
+Spotify가 값을 주지 않은 컬럼은 기존 값을 유지하고, 값이 실제로 바뀐 행만 UPDATE 한다.
+
+Usage:
+  docker exec sonic_backend python scripts/db/enrich/refresh-spotify-albums.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncpg
+import httpx
+
+from lib.bulk_load import asyncpg_dsn, copy_rows
+from lib.spotify import SPOTIFY_ALBUM_PREFIX, SpotifyAlbumClient, cover_url, parse_release_date, to_spotify_id
+
+PROGRESS_EVERY = 2000
+
+STAGE_COLUMNS = ["album_group_id", "title", "popularity", "cover_url", "release_date"]
+
+
+def to_stage_row(spotify_id: str, album: dict) -> tuple:
+    popularity = album.get("popularity")
+    return (
+        f"{SPOTIFY_ALBUM_PREFIX}{spotify_id}",
+        album.get("name") or None,
+        popularity / 100.0 if popularity is not None else None,  # import.py와 같은 0~1 스케일
+        cover_url(album),
+        parse_release_date(album.get("release_date")),
+    )
+
+
+def updated_count(status: str) -> int:
+    return int(status.split()[-1])
+
+
+async def main():
+    print("\n" + "="*70)
+    print("🔄 Spotify 앨범 메타데이터 일괄 갱신")
+    print("="*70 + "\n")
+
+    try:
+        spotify = SpotifyAlbumClient()
+    except RuntimeError:
+        print("❌ SPOTIFY_CLIENT_ID와 SPOTIFY_CLIENT_SECRET 환경 변수가 필요합니다.")
+        sys.exit(1)
+
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        album_group_ids = [
+            r["album_group_id"]
+            for r in await conn.fetch(
+                "SELECT album_group_id FROM album_groups WHERE album_group_id LIKE $1",
+                f"{SPOTIFY_ALBUM_PREFIX}%",
+            )
+        ]
+        total = len(album_group_ids)
+        print(f"📊 Spotify 앨범: {total}개")
+        if total == 0:
+            return
+
+        # 1. Spotify 배치 조회
+        rows = []
+        missing = 0
+        started = time.monotonic()
+        async with httpx.AsyncClient(timeout=30) as client:
+            done = 0
+            async for spotify_id, album in spotify.iter_albums(client, map(to_spotify_id, album_group_ids)):
+                done += 1
+                if album:
+                    rows.append(to_stage_row(spotify_id, album))
+                else:
+                    missing += 1
+                if done % PROGRESS_EVERY == 0:
+                    print(f"  ⏳ {done}/{total} ({done/total*100:.1f}%) | {time.monotonic() - started:.0f}s")
+        print(f"🎵 조회 완료: {len(rows)}개 ({missing}개 없음, {time.monotonic() - started:.0f}s)")
+
+        # 2. COPY + UPDATE ... FROM
+        async with conn.transaction():
+            await conn.execute("""
+                CREATE TEMP TABLE stage_spotify_albums (
+                    album_group_id VARCHAR PRIMARY KEY,
+                    title VARCHAR,
+                    popularity DOUBLE PRECISION,
+                    cover_url VARCHAR,
+                    release_date DATE
+                ) ON COMMIT DROP
+            """)
+            await copy_rows(conn, "stage_spotify_albums", STAGE_COLUMNS, rows)
+
+            updated_groups = updated_count(await conn.execute("""
+                UPDATE album_groups ag
+                SET title = COALESCE(s.title, ag.title),
+                    popularity = COALESCE(s.popularity, ag.popularity),
+                    cover_url = COALESCE(s.cover_url, ag.cover_url),
+                    earliest_release_date = COALESCE(s.release_date, ag.earliest_release_date),
+                    updated_at = now()
+                FROM stage_spotify_albums s
+                WHERE ag.album_group_id = s.album_group_id
+                  AND (ag.title IS DISTINCT FROM COALESCE(s.title, ag.title)
+                       OR ag.popularity IS DISTINCT FROM COALESCE(s.popularity, ag.popularity)
+                       OR ag.cover_url IS DISTINCT FROM COALESCE(s.cover_url, ag.cover_url)
+                       OR ag.earliest_release_date IS DISTINCT FROM COALESCE(s.release_date, ag.earliest_release_date))
+            """))
+
+            updated_releases = updated_count(await conn.execute("""
+                UPDATE releases r
+                SET cover_url = COALESCE(s.cover_url, r.cover_url),
+                    release_date = COALESCE(s.release_date, r.release_date),
+                    updated_at = now()
+                FROM stage_spotify_albums s
+                WHERE r.album_group_id = s.album_group_id
+                  AND (r.cover_url IS DISTINCT FROM COALESCE(s.cover_url, r.cover_url)
+                       OR r.release_date IS DISTINCT FROM COALESCE(s.release_date, r.release_date))
+            """))
+
+            # 노드 크기는 popularity에서 계산 (import.py와 같은 식)
+            updated_nodes = updated_count(await conn.execute("""
+                UPDATE map_nodes m
+                SET size = s.popularity * 10 + 2,
+                    updated_at = now()
+                FROM stage_spotify_albums s
+                WHERE m.album_group_id = s.album_group_id
+                  AND s.popularity IS NOT NULL
+                  AND m.size IS DISTINCT FROM s.popularity * 10 + 2
+            """))
+    finally:
+        await conn.close()
+
+    print("\n" + "="*70)
+    print("✅ 갱신 완료")
+    print("="*70)
+    print(f"   • 업데이트된 album_groups: {updated_groups}개")
+    print(f"   • 업데이트된 releases: {updated_releases}개")
+    print(f"   • 업데이트된 map_nodes: {updated_nodes}개")
+    print(f"   • {spotify.provider.stats()}")
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
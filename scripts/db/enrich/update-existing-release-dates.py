@@ -3,112 +3,124 @@
 
 Spotify JSON 파일에서 releaseDate를 읽어서 기존 DB 레코드를 업데이트
 
+(album_id, release_date) 쌍을 JSON에서 읽으면서 임시 테이블에 COPY 한 번으로 흘려 넣은 뒤
+releases / album_groups 를 각각 UPDATE ... FROM 한 문장으로 갱신한다.
+값이 실제로 바뀌는 행만 UPDATE 하므로 여러 번 실행해도 안전하다.
+
 Usage:
   docker exec sonic_backend python scripts/db/enrich/update-existing-release-dates.py
 """
 
-import json
 import asyncio
 import sys
 from pathlib import Path
 from datetime import datetime
 
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncpg
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, update
-from app.database import DATABASE_URL
-from app.models import AlbumGroup, Release
+from lib.bulk_load import asyncpg_dsn, copy_rows
+from lib.json_stream import iter_array
 
 JSON_PATH = Path("/out/albums_spotify_v3.json")
 
 
-async def main():
-    print("\n" + "="*70)
-    print("📅 기존 데이터 발매일 업데이트")
-    print("="*70 + "\n")
-    
-    if not JSON_PATH.exists():
-        print(f"❌ File not found: {JSON_PATH}")
-        return
-    
-    # JSON 로드
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    albums = data.get("albums", [])
-    print(f"📊 JSON 앨범 수: {len(albums)}")
-    
-    # DB 연결
-    engine = create_async_engine(DATABASE_URL, echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    updated_releases = 0
-    updated_groups = 0
-    skipped = 0
-    
-    for album in albums:
+def iter_release_dates(stats: dict):
+    """JSON에서 (album_id, release_date) 쌍을 하나씩 꺼낸다. 파싱 불가한 항목은 stats['skipped']에 센다."""
+    for album in iter_array(JSON_PATH, "albums"):
+        stats["processed"] += 1
         album_id = album.get("albumId")
         release_date_str = album.get("releaseDate")
-        
+
         if not album_id or not release_date_str:
-            skipped += 1
+            stats["skipped"] += 1
             continue
-        
+
         # Date 객체로 변환
         try:
             release_date = datetime.fromisoformat(release_date_str).date()
-        except (ValueError, AttributeError):
-            skipped += 1
+        except (ValueError, AttributeError, TypeError):
+            stats["skipped"] += 1
             continue
-        
-        # DB 업데이트
-        async with async_session() as session:
-            # 1. Release 업데이트
-            stmt = (
-                update(Release)
-                .where(Release.album_group_id == album_id)
-                .values(release_date=release_date)
+
+        yield album_id, release_date
+
+
+async def main():
+    print("\n" + "="*70)
+    print("📅 기존 데이터 발매일 업데이트")
+    print("="*70 + "\n")
+
+    if not JSON_PATH.exists():
+        print(f"❌ File not found: {JSON_PATH}")
+        return
+
+    stats = {"processed": 0, "skipped": 0}
+
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        async with conn.transaction():
+            await conn.execute("""
+                CREATE TEMP TABLE stage_release_dates (
+                    album_group_id VARCHAR NOT NULL,
+                    release_date DATE NOT NULL
+                ) ON COMMIT DROP
+            """)
+            staged = await copy_rows(
+                conn, "stage_release_dates", ["album_group_id", "release_date"], iter_release_dates(stats),
+                batch_size=None,
             )
-            result = await session.execute(stmt)
-            if result.rowcount > 0:
-                updated_releases += result.rowcount
-            
+            print(f"📥 Staged {staged} release dates (JSON 앨범 수: {stats['processed']})")
+
+            # JSON에 같은 앨범이 여러 번 나오면 가장 이른 날짜 하나만 사용
+            dedup = """
+                (SELECT album_group_id, min(release_date) AS release_date
+                 FROM stage_release_dates GROUP BY album_group_id)
+            """
+
+            # 1. Release 업데이트
+            updated_releases = int((await conn.execute(f"""
+                UPDATE releases r
+                SET release_date = s.release_date
+                FROM {dedup} s
+                WHERE r.album_group_id = s.album_group_id
+                  AND r.release_date IS DISTINCT FROM s.release_date
+            """)).split()[-1])
+
             # 2. AlbumGroup의 earliest_release_date 업데이트
-            stmt = (
-                update(AlbumGroup)
-                .where(AlbumGroup.album_group_id == album_id)
-                .values(earliest_release_date=release_date)
-            )
-            result = await session.execute(stmt)
-            if result.rowcount > 0:
-                updated_groups += 1
-            
-            await session.commit()
-        
-        if (updated_releases + skipped) % 100 == 0:
-            print(f"진행중: {updated_releases + skipped}/{len(albums)}...")
-    
-    # 통계 출력
-    async with async_session() as session:
-        stmt = select(AlbumGroup).where(AlbumGroup.earliest_release_date.isnot(None))
-        result = await session.execute(stmt)
-        total_with_dates = len(result.scalars().all())
-        
-        stmt = select(AlbumGroup)
-        result = await session.execute(stmt)
-        total = len(result.scalars().all())
-    
+            updated_groups = int((await conn.execute(f"""
+                UPDATE album_groups ag
+                SET earliest_release_date = s.release_date
+                FROM {dedup} s
+                WHERE ag.album_group_id = s.album_group_id
+                  AND ag.earliest_release_date IS DISTINCT FROM s.release_date
+            """)).split()[-1])
+
+        # 통계
+        row = await conn.fetchrow("""
+            SELECT count(*) AS total,
+                   count(earliest_release_date) AS with_dates
+            FROM album_groups
+        """)
+        total, total_with_dates = row["total"], row["with_dates"]
+    finally:
+        await conn.close()
+
     print("\n" + "="*70)
     print("✅ 발매일 업데이트 완료")
     print("="*70)
     print(f"\n📈 결과:")
+    print(f"   • JSON 앨범 수: {stats['processed']}개")
     print(f"   • 업데이트된 releases: {updated_releases}개")
     print(f"   • 업데이트된 album_groups: {updated_groups}개")
-    print(f"   • 스킵: {skipped}개")
+    print(f"   • 스킵: {stats['skipped']}개")
     print(f"\n📊 전체 통계:")
-    print(f"   • 발매일 있음: {total_with_dates}/{total} ({total_with_dates/total*100:.1f}%)")
+    if total:
+        print(f"   • 발매일 있음: {total_with_dates}/{total} ({total_with_dates/total*100:.1f}%)")
+    else:
+        print("   • album_groups가 비어 있습니다.")
     print()
 
 
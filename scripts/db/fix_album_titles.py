@@ -1,117 +1,62 @@
 import asyncio
-import base64
-import os
-from typing import List, Dict
+import sys
+from pathlib import Path
+from typing import List, Tuple
 
-import aiohttp
-import asyncpg
-
-SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
-SPOTIFY_ALBUMS_URL = "https://api.spotify.com/v1/albums"
-
-
-def chunk(items: List[str], size: int) -> List[List[str]]:
-    return [items[i:i + size] for i in range(0, len(items), size)]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import asyncpg
+import httpx
 
-async def get_spotify_token(session: aiohttp.ClientSession) -> str:
-    client_id = os.getenv("SPOTIFY_CLIENT_ID")
-    client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
-    if not client_id or not client_secret:
-        raise RuntimeError("Missing SPOTIFY_CLIENT_ID or SPOTIFY_CLIENT_SECRET")
-
-    auth = base64.b64encode(f"{client_id}:{client_secret}".encode("utf-8")).decode("ascii")
-    data = {"grant_type": "client_credentials"}
-    headers = {"Authorization": f"Basic {auth}"}
-
-    async with session.post(SPOTIFY_TOKEN_URL, data=data, headers=headers) as res:
-        if res.status != 200:
-            text = await res.text()
-            raise RuntimeError(f"Token request failed: {res.status} {text}")
-        payload = await res.json()
-        return payload["access_token"]
+from lib.bulk_load import asyncpg_dsn
+from lib.spotify import SPOTIFY_ALBUM_PREFIX, SpotifyAlbumClient, to_spotify_id
 
+BROKEN_CHARS = ("?", "�")  # 인코딩이 깨진 제목에 남는 문자
 
-async def fetch_spotify_albums(
-    session: aiohttp.ClientSession,
-    token: str,
-    ids: List[str],
-) -> List[Dict]:
-    params = {"ids": ",".join(ids)}
-    headers = {"Authorization": f"Bearer {token}"}
 
-    for attempt in range(6):
-        async with session.get(SPOTIFY_ALBUMS_URL, params=params, headers=headers) as res:
-            if res.status == 429:
-                retry_after = int(res.headers.get("Retry-After", "1"))
-                await asyncio.sleep(retry_after + 0.2)
-                continue
-            if res.status >= 500 and attempt < 5:
-                await asyncio.sleep(0.5 * (attempt + 1))
-                continue
-            if res.status != 200:
-                text = await res.text()
-                raise RuntimeError(f"Albums request failed: {res.status} {text}")
-            payload = await res.json()
-            return payload.get("albums", [])
-    return []
+def is_broken(title: str) -> bool:
+    return not title or any(c in title for c in BROKEN_CHARS)
 
 
 async def main() -> None:
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        raise RuntimeError("Missing DATABASE_URL")
-
-    async with asyncpg.create_pool(dsn=db_url, min_size=1, max_size=4) as pool:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT album_group_id
-                FROM album_groups
-                WHERE title LIKE '%?%' OR title LIKE '%?%'
-                """
-            )
-            album_ids = [r["album_group_id"] for r in rows if r["album_group_id"].startswith("spotify:album:")]
-
-    if not album_ids:
-        print("No album_group titles to fix.")
-        return
-
-    spotify_ids = [a.replace("spotify:album:", "") for a in album_ids]
-    fixed = 0
-    skipped = 0
-
-    async with aiohttp.ClientSession() as session:
-        token = await get_spotify_token(session)
-
-        async with asyncpg.create_pool(dsn=db_url, min_size=1, max_size=4) as pool:
-            for batch in chunk(spotify_ids, 20):
-                albums = await fetch_spotify_albums(session, token, batch)
-                async with pool.acquire() as conn:
-                    for album in albums:
-                        if not album or not album.get("id"):
-                            continue
-                        title = album.get("name") or ""
-                        if not title or "?" in title or "?" in title:
-                            skipped += 1
-                            continue
-                        album_id = f"spotify:album:{album['id']}"
-                        await conn.execute(
-                            "UPDATE album_groups SET title = $1, updated_at = NOW() WHERE album_group_id = $2",
-                            title,
-                            album_id,
-                        )
-                        await conn.execute(
-                            "UPDATE albums SET title = $1 WHERE id = $2",
-                            title,
-                            album_id,
-                        )
-                        fixed += 1
-
-                await asyncio.sleep(0.2)
-
-    print(f"Fixed titles: {fixed}")
+    spotify = SpotifyAlbumClient()
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        rows = await conn.fetch(
+            """
+            SELECT album_group_id
+            FROM album_groups
+            WHERE (title LIKE '%?%' OR title LIKE '%�%')
+              AND album_group_id LIKE 'spotify:album:%'
+            """
+        )
+        spotify_ids = [to_spotify_id(r["album_group_id"]) for r in rows]
+
+        if not spotify_ids:
+            print("No album_group titles to fix.")
+            return
+
+        fixes: List[Tuple[str, str]] = []
+        skipped = 0
+        async with httpx.AsyncClient(timeout=30) as client:
+            async for spotify_id, album in spotify.iter_albums(client, spotify_ids):
+                title = (album or {}).get("name") or ""
+                if is_broken(title):
+                    skipped += 1
+                    continue
+                fixes.append((title, f"{SPOTIFY_ALBUM_PREFIX}{spotify_id}"))
+
+        # 예전 albums 테이블은 album_groups로 대체되어 album_groups만 갱신한다
+        await conn.executemany(
+            "UPDATE album_groups SET title = $1, updated_at = NOW() WHERE album_group_id = $2",
+            fixes,
+        )
+    finally:
+        await conn.close()
+
+    print(f"Fixed titles: {len(fixes)}")
     print(f"Skipped titles (still invalid): {skipped}")
+    print(spotify.provider.stats())
 
 
 if __name__ == "__main__":
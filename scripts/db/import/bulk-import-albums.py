@@ -0,0 +1,151 @@
+"""
+v3 앨범 데이터 대량 임포트 (COPY + ON CONFLICT)
+
+albums_spotify_v3.json을 스트리밍으로 읽어서
+album_groups / map_nodes / releases 를 스테이징 테이블에 COPY 한 뒤 한 번에 병합한다.
+
+- 행 값은 lib/album_rows.py (import.py, import-album-groups.py와 같은 규칙)
+- album_groups: 새 앨범은 INSERT, 기존 앨범은 JSON이 원본인 컬럼(ALBUM_UPDATE_COLUMNS)만 값이 바뀐 경우 UPDATE
+  (title / popularity / cover_url / earliest_release_date는 fix_album_titles.py, refresh-spotify-albums.py 등이
+   고친 값이라 기존 값이 NULL일 때만 채운다)
+- map_nodes: 좌표(x, y)가 바뀐 경우만 UPDATE (size는 popularity에서 나오므로 새 노드에만)
+- releases: 릴리스가 하나도 없는 앨범에만 기본 릴리스 생성
+
+Usage:
+  docker exec sonic_backend python scripts/db/import/bulk-import-albums.py [path/to/albums_spotify_v3.json]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Docker 컨테이너 내부에서는 /app이 루트
+sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncpg
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import Base, DATABASE_URL
+from lib.album_rows import ALBUM_FILL_COLUMNS, ALBUM_UPDATE_COLUMNS, NODE_UPDATE_COLUMNS, album_rows
+from lib.bulk_load import asyncpg_dsn, batched, create_staging_table, merge, upsert_sql
+from lib.json_stream import iter_array
+
+JSON_PATH = Path("/out/albums_spotify_v3.json")
+
+ALBUM_COLUMNS = [
+    "album_group_id", "title", "primary_artist_display", "original_year", "earliest_release_date",
+    "country_code", "primary_genre", "region_bucket", "genre_vibe", "popularity", "cover_url",
+]
+NODE_COLUMNS = ["album_group_id", "x", "y", "size"]
+RELEASE_COLUMNS = ["release_id", "album_group_id", "release_title", "release_date"]
+
+
+def to_records(album: dict):
+    """v3 앨범 하나 -> (album_groups, map_nodes, releases) COPY 레코드 (lib/album_rows와 같은 값)"""
+    rows = album_rows(album)
+    if rows is None:
+        return None
+    group, node, release = rows
+    return (
+        tuple(group[c] for c in ALBUM_COLUMNS),
+        tuple(node[c] for c in NODE_COLUMNS),
+        tuple(release[c] for c in RELEASE_COLUMNS),
+    )
+
+
+async def main():
+    json_path = Path(sys.argv[1]) if len(sys.argv) > 1 else JSON_PATH
+    if not json_path.exists():
+        print(f"❌ File not found: {json_path}")
+        return
+
+    # 테이블 생성 (없으면)
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+    started = time.perf_counter()
+    print(f"📂 Streaming: {json_path}")
+
+    conn = await asyncpg.connect(asyncpg_dsn())
+    try:
+        async with conn.transaction():
+            await create_staging_table(conn, "stage_album_groups", "album_groups")
+            await create_staging_table(conn, "stage_map_nodes", "map_nodes")
+            await create_staging_table(conn, "stage_releases", "releases")
+
+            staged = 0
+            skipped = 0
+            for batch in batched(iter_array(json_path, "albums")):
+                groups, nodes, releases = [], [], []
+                for album in batch:
+                    rows = to_records(album)
+                    if rows is None:
+                        skipped += 1
+                        continue
+                    groups.append(rows[0])
+                    nodes.append(rows[1])
+                    releases.append(rows[2])
+                await conn.copy_records_to_table("stage_album_groups", records=groups, columns=ALBUM_COLUMNS)
+                await conn.copy_records_to_table("stage_map_nodes", records=nodes, columns=NODE_COLUMNS)
+                await conn.copy_records_to_table("stage_releases", records=releases, columns=RELEASE_COLUMNS)
+                staged += len(groups)
+                print(f"📥 Staged {staged} albums...")
+
+            groups_result = await merge(conn, upsert_sql(
+                "album_groups", "stage_album_groups", ALBUM_COLUMNS, ["album_group_id"],
+                update_columns=ALBUM_UPDATE_COLUMNS,
+                fill_missing=ALBUM_FILL_COLUMNS,
+                touch="updated_at",
+            ))
+            nodes_result = await merge(conn, upsert_sql(
+                "map_nodes", "stage_map_nodes", NODE_COLUMNS, ["album_group_id"],
+                update_columns=NODE_UPDATE_COLUMNS,
+                touch="updated_at",
+            ))
+            releases_inserted = await conn.fetchval(f"""
+                WITH inserted AS (
+                    INSERT INTO releases ({", ".join(RELEASE_COLUMNS)})
+                    SELECT DISTINCT ON (s.album_group_id) {", ".join("s." + c for c in RELEASE_COLUMNS)}
+                    FROM stage_releases s
+                    WHERE NOT EXISTS (SELECT 1 FROM releases r WHERE r.album_group_id = s.album_group_id)
+                    ORDER BY s.album_group_id
+                    ON CONFLICT (release_id) DO NOTHING
+                    RETURNING 1
+                )
+                SELECT count(*) FROM inserted
+            """)
+
+        await conn.execute("ANALYZE album_groups")
+        await conn.execute("ANALYZE map_nodes")
+        total_groups = await conn.fetchval("SELECT count(*) FROM album_groups")
+        total_with_country = await conn.fetchval("SELECT count(*) FROM album_groups WHERE country_code IS NOT NULL")
+        region_dist = await conn.fetch("""
+            SELECT region_bucket, count(*) AS n FROM album_groups
+            GROUP BY region_bucket ORDER BY n DESC LIMIT 5
+        """)
+    finally:
+        await conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{'='*70}")
+    print(f"📊 Bulk import complete in {elapsed:.1f}s")
+    print(f"   • Staged from JSON: {staged} (skipped without albumId: {skipped})")
+    print(f"   • album_groups: +{groups_result[0]} inserted, {groups_result[1]} updated")
+    print(f"   • map_nodes: +{nodes_result[0]} inserted, {nodes_result[1]} updated")
+    print(f"   • releases: +{releases_inserted} inserted")
+    print(f"{'='*70}")
+    print(f"\n📊 Database Statistics:")
+    print(f"  - Total albums: {total_groups}")
+    if total_groups:
+        print(f"  - Albums with country: {total_with_country}/{total_groups} ({total_with_country/total_groups*100:.1f}%)")
+    print(f"\n📍 Top 5 Regions:")
+    for row in region_dist:
+        print(f"    {row['region_bucket']}: {row['n']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,7 +9,6 @@ import asyncio
 import json
 import re
 import uuid
-import unicodedata
 from pathlib import Path
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -17,24 +16,17 @@ from sqlalchemy import select
 
 import sys
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.database import DATABASE_URL, Base
 from app.models import AlbumGroup, AlbumAward
+from lib.matching import AlbumMatcher
 
 DEFAULT_SEED_FILES = [
     "/app/scripts/fetch/award_seeds.json",
     "/app/scripts/fetch/award_seeds_alltime.json",
 ]
 
-def normalize_text(value: str) -> str:
-    if not value:
-        return ""
-    text = unicodedata.normalize("NFKD", value)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return " ".join(text.split())
-
 def parse_query(query: str):
     if not query:
         return None, None
@@ -59,34 +51,12 @@ def load_seeds(path: Path, default_award_kind: str):
             seed["award_kind"] = default_award_kind
     return seeds
 
-def build_album_index(albums):
-    by_album_artist = {}
-    by_album_artist_year = {}
-    for album in albums:
-        title = normalize_text(album.title)
-        artist = normalize_text(album.primary_artist_display)
-        if not title or not artist:
-            continue
-        key = f"{title}|||{artist}"
-        by_album_artist.setdefault(key, []).append(album.album_group_id)
-        if album.original_year:
-            key_year = f"{title}|||{artist}|||{album.original_year}"
-            by_album_artist_year.setdefault(key_year, []).append(album.album_group_id)
-    return by_album_artist, by_album_artist_year
-
-def find_album_id(by_album_artist, by_album_artist_year, title, artist, year):
-    norm_title = normalize_text(title)
-    norm_artist = normalize_text(artist)
-    if not norm_title or not norm_artist:
-        return None
-    if year:
-        key_year = f"{norm_title}|||{norm_artist}|||{year}"
-        if key_year in by_album_artist_year:
-            return by_album_artist_year[key_year][0]
-    key = f"{norm_title}|||{norm_artist}"
-    if key in by_album_artist:
-        return by_album_artist[key][0]
-    return None
+def build_album_index(albums) -> AlbumMatcher:
+    """(album_group_id, title, artist, year) 행들로 퍼지 매칭 색인 생성"""
+    matcher = AlbumMatcher()
+    for album_group_id, title, artist, year in albums:
+        matcher.add(album_group_id, title, artist, year)
+    return matcher
 
 async def main():
     seeds = []
@@ -105,8 +75,15 @@ async def main():
         await conn.run_sync(Base.metadata.create_all)
 
     async with async_session() as session:
-        albums_res = await session.execute(select(AlbumGroup))
-        albums = albums_res.scalars().all()
+        albums_res = await session.execute(
+            select(
+                AlbumGroup.album_group_id,
+                AlbumGroup.title,
+                AlbumGroup.primary_artist_display,
+                AlbumGroup.original_year
+            )
+        )
+        albums = albums_res.all()
 
         existing_res = await session.execute(
             select(
@@ -119,11 +96,12 @@ async def main():
         )
         existing = set(existing_res.all())
 
-    by_album_artist, by_album_artist_year = build_album_index(albums)
+    matcher = build_album_index(albums)
 
     new_awards = []
     skipped_no_match = 0
     skipped_no_award = 0
+    fuzzy_matched = 0
 
     for seed in seeds:
         album = seed.get("album")
@@ -146,10 +124,13 @@ async def main():
             sources = [sources]
 
         year = seed.get("year")
-        album_id = find_album_id(by_album_artist, by_album_artist_year, album, artist, year)
-        if not album_id:
+        match = matcher.match(album, artist, year)
+        if not match:
             skipped_no_match += 1
             continue
+        album_id = match.key
+        if not match.exact:
+            fuzzy_matched += 1
 
         award_kind = seed.get("award_kind") or "award"
 
@@ -174,6 +155,7 @@ async def main():
             ))
 
     print(f"✅ album_awards to insert: {len(new_awards)}")
+    print(f"🔎 fuzzy matched (not exact): {fuzzy_matched}")
     print(f"⚠️  skipped (no award): {skipped_no_award}")
     print(f"⚠️  skipped (no match): {skipped_no_match}")
 
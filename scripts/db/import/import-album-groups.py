@@ -1,13 +1,13 @@
 """
 Import v3 album data into album_groups + map_nodes + releases.
 
+Only albums that are new or changed since the last run (per import_ledger content hash) are written.
+
 Usage:
   docker exec sonic_backend python scripts/db/import/import-album-groups.py
 """
 
-import json
 import asyncio
-import uuid
 import sys
 from pathlib import Path
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -16,26 +16,25 @@ from sqlalchemy import select
 
 # Docker 컨테이너 내부에서는 /app이 루트
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.database import DATABASE_URL, Base
 from app.models import AlbumGroup, MapNode, Release
+from lib.album_rows import ALBUM_FILL_COLUMNS, ALBUM_UPDATE_COLUMNS, NODE_UPDATE_COLUMNS, album_rows
+from lib.bulk_load import batched
+from lib.incremental import changed_records, mark_imported, upsert_rows
+from lib.json_stream import iter_array
 
 JSON_PATH = Path("/out/albums_spotify_v3.json")
+BATCH_SIZE = 1000
+LEDGER_SOURCE = "import-album-groups:albums_v3"
 
-def to_release_id():
-    return f"local:release:{uuid.uuid4()}"
 
 async def main():
     if not JSON_PATH.exists():
         print(f"❌ File not found: {JSON_PATH}")
         return
 
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    albums = data.get("albums", [])
-    print(f"📊 Total albums in JSON: {len(albums)}")
-
     engine = create_async_engine(DATABASE_URL, echo=False)
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -43,81 +42,45 @@ async def main():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    # existing ids
-    async with async_session() as session:
-        stmt = select(AlbumGroup.album_group_id)
-        result = await session.execute(stmt)
-        existing_ids = set(result.scalars().all())
-        print(f"📋 Existing album_groups in DB: {len(existing_ids)}")
-
-    new_groups = []
-    new_nodes = []
-    new_releases = []
-    skipped = 0
-
-    for album in albums:
-        album_id = album.get("albumId")
-        if not album_id:
-            continue
-        if album_id in existing_ids:
-            skipped += 1
-            continue
-
-        title = album.get("title", "Unknown Title")
-        artist = album.get("artistName", "Unknown Artist")
-        year = album.get("year")
-        release_date_str = album.get("releaseDate")  # "YYYY-MM-DD" 형식
-        country = album.get("country")
-        primary_genre = album.get("genreFamily", album.get("primaryGenre"))
-        popularity = album.get("popularity", 0) / 100.0
-        cover_url = album.get("artworkUrl")
-        genre_vibe = album.get("genreVibe", 0.5)
-        
-        # release_date를 Date 객체로 변환 (있으면)
-        release_date = None
-        if release_date_str:
-            try:
-                from datetime import datetime
-                release_date = datetime.fromisoformat(release_date_str).date()
-            except (ValueError, AttributeError):
-                # 파싱 실패 시 None으로 유지
-                pass
-
-        new_groups.append(AlbumGroup(
-            album_group_id=album_id,
-            title=title,
-            primary_artist_display=artist,
-            original_year=year,
-            earliest_release_date=release_date,  # 최초 릴리스 날짜 저장
-            country_code=country,
-            primary_genre=primary_genre,
-            popularity=popularity,
-            cover_url=cover_url
-        ))
-
-        new_nodes.append(MapNode(
-            album_group_id=album_id,
-            x=year or 0,
-            y=genre_vibe,
-            size=(popularity * 10) + 2
-        ))
-
-        new_releases.append(Release(
-            release_id=to_release_id(),
-            album_group_id=album_id,
-            release_title=title,
-            release_date=release_date  # 릴리스 날짜 저장
-        ))
-
-    print(f"📊 To insert: {len(new_groups)} album_groups, {len(new_nodes)} map_nodes, {len(new_releases)} releases")
+    total_in_json = 0
+    written = 0
+    unchanged = 0
 
     async with async_session() as session:
-        session.add_all(new_groups)
-        session.add_all(new_nodes)
-        session.add_all(new_releases)
-        await session.commit()
-
-    print(f"✅ Import complete. Skipped: {skipped}")
+        for batch in batched(iter_array(JSON_PATH, "albums"), BATCH_SIZE):
+            total_in_json += len(batch)
+            items = [(album["albumId"], album) for album in batch if album.get("albumId")]
+            changed = await changed_records(session, LEDGER_SOURCE, items)
+            unchanged += len(items) - len(changed)
+            if not changed:
+                continue
+
+            rows = [album_rows(album) for _, album, _ in changed]
+            await upsert_rows(
+                session, AlbumGroup, [r[0] for r in rows], ["album_group_id"],
+                update_columns=ALBUM_UPDATE_COLUMNS, fill_missing=ALBUM_FILL_COLUMNS,
+            )
+            await upsert_rows(
+                session, MapNode, [r[1] for r in rows], ["album_group_id"], update_columns=NODE_UPDATE_COLUMNS
+            )
+
+            # 릴리스가 하나도 없는 앨범에만 기본 릴리스 생성
+            result = await session.execute(
+                select(Release.album_group_id).where(Release.album_group_id.in_([r[0]["album_group_id"] for r in rows]))
+            )
+            has_release = set(result.scalars().all())
+            await upsert_rows(
+                session, Release, [r[2] for r in rows if r[2]["album_group_id"] not in has_release], ["release_id"]
+            )
+
+            await mark_imported(session, LEDGER_SOURCE, [(key, h) for key, _, h in changed])
+            await session.commit()
+            written += len(rows)
+            print(f"📥 Upserted {written} albums...")
+
+    print(f"📊 Total albums in JSON: {total_in_json}")
+    print(f"📊 New or changed: {written} album_groups (+ map_nodes, releases)")
+    print(f"✅ Import complete. Unchanged: {unchanged}")
 
 if __name__ == "__main__":
     asyncio.run(main())
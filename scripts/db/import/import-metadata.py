@@ -3,11 +3,13 @@
 
 아티스트, 협업 관계, 크레딧 정보를 DB에 임포트
 
+레코드별 content hash를 import_ledger에 남겨서 재실행 시 새로 생겼거나 바뀐 레코드만 쓴다.
+대상 테이블의 기존 ID를 미리 전부 읽지 않고 INSERT ... ON CONFLICT 로 반영한다.
+
 Usage:
   docker exec sonic_backend python scripts/db/import/import-metadata.py
 """
 
-import json
 import sys
 import asyncio
 import uuid
@@ -15,25 +17,30 @@ from pathlib import Path
 
 # Docker 컨테이너 내부에서는 /app이 루트
 sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.database import Base, DATABASE_URL
 from app.models import (
-    CreatorIdMap,
     Creator,
     CreatorSpotifyProfile,
     AlbumGroup,
     AlbumCredit,
     Role,
 )
+from lib.bulk_load import batched
+from lib.incremental import changed_records, mark_imported, upsert_rows
+from lib.json_stream import iter_object
 
 # JSON 파일 경로
 ARTISTS_FILE = "/out/artists_spotify.json"
 COLLABORATIONS_FILE = "/out/album_collaborations.json"
 CREDITS_FILE = "/out/album_credits.json"
 
+BATCH_SIZE = 500
+
 # DB 엔진 생성
 engine = create_async_engine(DATABASE_URL, echo=False)
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -42,86 +49,100 @@ async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False
 def to_creator_id(raw_spotify_artist_id: str) -> str:
     return f"spotify:artist:{raw_spotify_artist_id}"
 
-async def ensure_role(session: AsyncSession, role_name: str, role_group: str = "other") -> str:
-    stmt = select(Role).where(Role.role_name == role_name)
-    result = await session.execute(stmt)
-    role = result.scalars().first()
-    if role:
-        return role.role_id
-    role_id = f"local:role:{uuid.uuid4()}"
-    role = Role(role_id=role_id, role_name=role_name, role_group=role_group)
-    session.add(role)
-    await session.commit()
+def normalize_name(name: str) -> str:
+    """크레딧 이름 매칭 키 (앞뒤/연속 공백 정리 + 대소문자 무시)"""
+    return " ".join(name.split()).casefold()
+
+async def load_roles(session: AsyncSession) -> dict:
+    """role_name -> role_id 캐시"""
+    result = await session.execute(select(Role.role_name, Role.role_id))
+    return dict(result.all())
+
+async def load_creator_names(session: AsyncSession) -> dict:
+    """정규화된 display_name -> creator_id 캐시 (같은 이름이 여러 명이면 먼저 생성된 쪽)"""
+    result = await session.execute(
+        select(Creator.display_name, Creator.creator_id).order_by(Creator.created_at, Creator.creator_id)
+    )
+    names = {}
+    for display_name, creator_id in result.all():
+        names.setdefault(normalize_name(display_name), creator_id)
+    return names
+
+def resolve_role(roles: dict, new_roles: list, role_name: str, role_group: str = "other") -> str:
+    """캐시에서 role_id를 찾고, 없으면 새 id를 발급해 new_roles에 쌓는다 (DB 왕복 없음)"""
+    role_id = roles.get(role_name)
+    if role_id is None:
+        role_id = f"local:role:{uuid.uuid4()}"
+        roles[role_name] = role_id
+        new_roles.append({"role_id": role_id, "role_name": role_name, "role_group": role_group})
     return role_id
 
+async def existing_album_ids(session: AsyncSession, album_ids) -> set:
+    """배치에 등장한 앨범 중 DB에 있는 것 (FK 때문에 없는 앨범의 크레딧은 다음 실행으로 미룬다)"""
+    result = await session.execute(
+        select(AlbumGroup.album_group_id).where(AlbumGroup.album_group_id.in_(list(album_ids)))
+    )
+    return set(result.scalars().all())
+
 async def import_creators():
     """Phase 1a: 아티스트 기본 정보 임포트 -> creators"""
     print("\n" + "="*70)
     print("🎤 Phase 1a: Creators 임포트")
     print("="*70 + "\n")
 
-    # JSON 로드
-    try:
-        with open(ARTISTS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            artists_data = data.get('artists', {})
-    except FileNotFoundError:
+    # JSON은 스트리밍으로 읽는다 (파일 전체를 메모리에 올리지 않음)
+    if not Path(ARTISTS_FILE).exists():
         print(f"⚠️  {ARTISTS_FILE} 파일이 없습니다. 스킵합니다.")
         return 0
-    
-    print(f"📥 아티스트 데이터 로드: {len(artists_data)}개")
 
-    # 기존 아티스트 ID 체크
+    source = "import-metadata:artists"
+    loaded = 0
+    unchanged = 0
+    written = 0
+    with_country = 0
+
     async with async_session() as session:
-        stmt = select(Creator.creator_id)
-        result = await session.execute(stmt)
-        existing_ids = set(result.scalars().all())
-        print(f"📋 기존 DB creators: {len(existing_ids)}개")
-
-    # 새 아티스트 필터링
-    new_creators = []
-    skipped = 0
-
-    for artist_id, artist_data in artists_data.items():
-        creator_id = to_creator_id(artist_id)
-        if creator_id in existing_ids:
-            skipped += 1
-            continue
-
-        new_creators.append(Creator(
-            creator_id=creator_id,
-            display_name=artist_data['name'],
-            bio=None,
-            image_url=artist_data.get('image_url'),
-            kind='person',
-            primary_role_tag='artist',
-            country_code=artist_data.get('country_code')
-        ))
+        for batch in batched(iter_object(ARTISTS_FILE, 'artists'), BATCH_SIZE):
+            loaded += len(batch)
+            changed = await changed_records(session, source, batch)
+            unchanged += len(batch) - len(changed)
+            if not changed:
+                continue
 
-    # 국가 정보 통계
-    country_count = sum(1 for c in new_creators if c.country_code)
-    country_percentage = (country_count / len(new_creators) * 100) if len(new_creators) > 0 else 0
-    
-    print(f"📊 임포트 분석:")
-    print(f"   • 이미 존재: {skipped}개")
-    print(f"   • 새로 추가: {len(new_creators)}개")
-    print(f"   • 국가 정보: {country_count}/{len(new_creators)} ({country_percentage:.1f}%)\n")
+            rows = [
+                {
+                    "creator_id": to_creator_id(artist_id),
+                    "display_name": artist_data['name'],
+                    "bio": None,
+                    "image_url": artist_data.get('image_url'),
+                    "kind": 'person',
+                    "primary_role_tag": 'artist',
+                    "country_code": artist_data.get('country_code'),
+                }
+                for artist_id, artist_data, _ in changed
+            ]
+            with_country += sum(1 for r in rows if r["country_code"])
+            await upsert_rows(
+                session, Creator, rows, ["creator_id"],
+                update_columns=["display_name", "image_url", "country_code"],
+                keep_existing=["image_url", "country_code"],
+            )
+            await mark_imported(session, source, [(key, h) for key, _, h in changed])
+            await session.commit()
+            written += len(rows)
+            print(f"💾 Upserted {written} creators...")
 
-    if len(new_creators) == 0:
-        print("✅ 추가할 creator가 없습니다.\n")
-        return 0
+    # 국가 정보 통계
+    country_percentage = (with_country / written * 100) if written > 0 else 0
 
-    # 배치 임포트
-    async with async_session() as session:
-        batch_size = 500
-        for i in range(0, len(new_creators), batch_size):
-            batch = new_creators[i:i+batch_size]
-            session.add_all(batch)
-            await session.commit()
-            print(f"💾 Inserted {min(i+batch_size, len(new_creators))}/{len(new_creators)} creators...")
+    print(f"📥 JSON 항목: {loaded}개")
+    print(f"📊 임포트 분석:")
+    print(f"   • 변경 없음: {unchanged}개")
+    print(f"   • 새로 추가/변경: {written}개")
+    print(f"   • 국가 정보: {with_country}/{written} ({country_percentage:.1f}%)\n")
 
-    print(f"\n✅ Creators 임포트 완료: {len(new_creators)}개\n")
-    return len(new_creators)
+    print(f"\n✅ Creators 임포트 완료: {written}개\n")
+    return written
 
 
 async def import_spotify_profiles():
@@ -130,62 +151,50 @@ async def import_spotify_profiles():
     print("🎵 Phase 1b: Spotify 프로필 임포트")
     print("="*70 + "\n")
 
-    # JSON 로드
-    try:
-        with open(ARTISTS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            artists_data = data.get('artists', {})
-    except FileNotFoundError:
+    # JSON은 스트리밍으로 읽는다 (파일 전체를 메모리에 올리지 않음)
+    if not Path(ARTISTS_FILE).exists():
         print(f"⚠️  {ARTISTS_FILE} 파일이 없습니다. 스킵합니다.")
         return 0
-    
-    print(f"📥 아티스트 데이터 로드: {len(artists_data)}개")
 
-    # 기존 프로필 체크
-    async with async_session() as session:
-        stmt = select(CreatorSpotifyProfile.creator_id)
-        result = await session.execute(stmt)
-        existing_profiles = set(result.scalars().all())
-        print(f"📋 기존 DB profiles: {len(existing_profiles)}개")
-
-    # 새 프로필 생성
-    new_profiles = []
-    skipped = 0
-
-    for artist_id, artist_data in artists_data.items():
-        creator_id = to_creator_id(artist_id)
-        
-        if creator_id in existing_profiles:
-            skipped += 1
-            continue
-        
-        new_profiles.append(CreatorSpotifyProfile(
-            creator_id=creator_id,
-            genres=artist_data.get('genres', []),
-            popularity=artist_data.get('popularity'),
-            followers=artist_data.get('followers'),
-            spotify_url=artist_data.get('spotify_url')
-        ))
-    
-    print(f"📊 임포트 분석:")
-    print(f"   • 이미 존재: {skipped}개")
-    print(f"   • 새로 추가: {len(new_profiles)}개\n")
-    
-    if len(new_profiles) == 0:
-        print("✅ 추가할 프로필이 없습니다.\n")
-        return 0
-    
-    # 배치 임포트
+    source = "import-metadata:artist_profiles"
+    loaded = 0
+    unchanged = 0
+    written = 0
+
     async with async_session() as session:
-        batch_size = 500
-        for i in range(0, len(new_profiles), batch_size):
-            batch = new_profiles[i:i+batch_size]
-            session.add_all(batch)
+        for batch in batched(iter_object(ARTISTS_FILE, 'artists'), BATCH_SIZE):
+            loaded += len(batch)
+            changed = await changed_records(session, source, batch)
+            unchanged += len(batch) - len(changed)
+            if not changed:
+                continue
+
+            rows = [
+                {
+                    "creator_id": to_creator_id(artist_id),
+                    "genres": artist_data.get('genres', []),
+                    "popularity": artist_data.get('popularity'),
+                    "followers": artist_data.get('followers'),
+                    "spotify_url": artist_data.get('spotify_url'),
+                }
+                for artist_id, artist_data, _ in changed
+            ]
+            await upsert_rows(
+                session, CreatorSpotifyProfile, rows, ["creator_id"],
+                update_columns=["genres", "popularity", "followers", "spotify_url"],
+            )
+            await mark_imported(session, source, [(key, h) for key, _, h in changed])
             await session.commit()
-            print(f"💾 Inserted {min(i+batch_size, len(new_profiles))}/{len(new_profiles)} profiles...")
-    
-    print(f"\n✅ Spotify 프로필 임포트 완료: {len(new_profiles)}개\n")
-    return len(new_profiles)
+            written += len(rows)
+            print(f"💾 Upserted {written} profiles...")
+
+    print(f"📥 JSON 항목: {loaded}개")
+    print(f"📊 임포트 분석:")
+    print(f"   • 변경 없음: {unchanged}개")
+    print(f"   • 새로 추가/변경: {written}개\n")
+
+    print(f"\n✅ Spotify 프로필 임포트 완료: {written}개\n")
+    return written
 
 
 async def import_collaborations():
@@ -194,115 +203,81 @@ async def import_collaborations():
     print("🤝 Phase 2: 협업 관계 임포트")
     print("="*70 + "\n")
 
-    # JSON 로드
-    try:
-        with open(COLLABORATIONS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            collab_data = data.get('albums', {})
-    except FileNotFoundError:
+    # JSON은 스트리밍으로 읽는다 (파일 전체를 메모리에 올리지 않음)
+    if not Path(COLLABORATIONS_FILE).exists():
         print(f"⚠️  {COLLABORATIONS_FILE} 파일이 없습니다. 스킵합니다.")
         return 0
-    
-    print(f"📥 협업 데이터 로드: {len(collab_data)}개 앨범")
 
-    async with async_session() as session:
-        # 기존 관계/크리에이터 체크
-        stmt = select(AlbumCredit.album_group_id, AlbumCredit.creator_id, AlbumCredit.role_id)
-        result = await session.execute(stmt)
-        existing_triples = set((r[0], r[1], r[2]) for r in result.all())
-        print(f"📋 기존 DB album_credits: {len(existing_triples)}개\n")
-
-        stmt = select(AlbumGroup.album_group_id)
-        result = await session.execute(stmt)
-        existing_album_ids = set(result.scalars().all())
-
-        stmt = select(Creator.creator_id)
-        result = await session.execute(stmt)
-        existing_creator_ids = set(result.scalars().all())
+    source = "import-metadata:collaborations"
+    loaded = 0
+    unchanged = 0
+    missing_album = 0
+    new_credit_count = 0
+    new_creator_count = 0
 
+    async with async_session() as session:
         # 역할 보장 (한 번만)
-        primary_role_id = await ensure_role(session, "Primary Artist", "artist")
-        featured_role_id = await ensure_role(session, "Featured Artist", "artist")
-
-        # 새 크리에이터/관계 생성
-        new_creators = {}
-        new_credits = []
-        skipped = 0
+        roles = await load_roles(session)
+        new_roles = []
+        primary_role_id = resolve_role(roles, new_roles, "Primary Artist", "artist")
+        featured_role_id = resolve_role(roles, new_roles, "Featured Artist", "artist")
+        if new_roles:
+            await upsert_rows(session, Role, new_roles, ["role_name"])
+            await session.commit()
 
-        for album_id, album_data in collab_data.items():
-            if album_data['album_id'] not in existing_album_ids:
-                skipped += 1
+        for batch in batched(iter_object(COLLABORATIONS_FILE, 'albums'), BATCH_SIZE):
+            loaded += len(batch)
+            changed = await changed_records(session, source, batch)
+            unchanged += len(batch) - len(changed)
+            if not changed:
                 continue
-            # 메인 아티스트
-            for idx, artist in enumerate(album_data.get('main_artists', [])):
-                creator_id = to_creator_id(artist['id'])
-                if creator_id not in existing_creator_ids:
-                    new_creators[creator_id] = artist.get('name') or "Unknown"
-                triple = (album_data['album_id'], creator_id, primary_role_id)
-                if triple not in existing_triples:
-                    new_credits.append(AlbumCredit(
-                        album_group_id=album_data['album_id'],
-                        creator_id=creator_id,
-                        role_id=primary_role_id,
-                        credit_order=idx
-                    ))
-                else:
-                    skipped += 1
-
-            # 피처링 아티스트
-            for idx, artist in enumerate(album_data.get('featured_artists', [])):
-                creator_id = to_creator_id(artist['id'])
-                if creator_id not in existing_creator_ids:
-                    new_creators[creator_id] = artist.get('name') or "Unknown"
-                triple = (album_data['album_id'], creator_id, featured_role_id)
-                if triple not in existing_triples:
-                    new_credits.append(AlbumCredit(
-                        album_group_id=album_data['album_id'],
-                        creator_id=creator_id,
-                        role_id=featured_role_id,
-                        credit_order=idx
-                    ))
-                else:
-                    skipped += 1
 
-    print(f"📊 임포트 분석:")
-    print(f"   • 이미 존재: {skipped}개")
-    print(f"   • 새로 추가: {len(new_credits)}개\n")
-
-    if len(new_credits) == 0 and len(new_creators) == 0:
-        print("✅ 추가할 협업 크레딧이 없습니다.")
-        return 0
-
-    # 배치 임포트 (creators 먼저)
-    async with async_session() as session:
-        if new_creators:
-            creator_rows = [
-                Creator(
-                    creator_id=creator_id,
-                    display_name=name,
-                    kind='person',
-                    primary_role_tag='artist'
-                )
-                for creator_id, name in new_creators.items()
-                if creator_id not in existing_creator_ids
-            ]
-            batch_size = 500
-            for i in range(0, len(creator_rows), batch_size):
-                batch = creator_rows[i:i+batch_size]
-                session.add_all(batch)
-                await session.commit()
-                print(f"💾 Inserted {min(i+batch_size, len(creator_rows))}/{len(creator_rows)} creators...")
+            known_albums = await existing_album_ids(session, {d['album_id'] for _, d, _ in changed})
+            creators = {}
+            credits = {}
+            done = []
+            for key, album_data, h in changed:
+                album_group_id = album_data['album_id']
+                if album_group_id not in known_albums:
+                    missing_album += 1
+                    continue
+                done.append((key, h))
+                for role_id, artists in (
+                    (primary_role_id, album_data.get('main_artists', [])),  # 메인 아티스트
+                    (featured_role_id, album_data.get('featured_artists', [])),  # 피처링 아티스트
+                ):
+                    for idx, artist in enumerate(artists):
+                        creator_id = to_creator_id(artist['id'])
+                        creators.setdefault(creator_id, {
+                            "creator_id": creator_id,
+                            "display_name": artist.get('name') or "Unknown",
+                            "kind": 'person',
+                            "primary_role_tag": 'artist',
+                        })
+                        credits.setdefault((album_group_id, creator_id, role_id), {
+                            "album_group_id": album_group_id,
+                            "creator_id": creator_id,
+                            "role_id": role_id,
+                            "credit_order": idx,
+                        })
+
+            # creators 먼저 (이미 있으면 그대로 둠)
+            new_creator_count += await upsert_rows(session, Creator, list(creators.values()), ["creator_id"])
+            new_credit_count += await upsert_rows(
+                session, AlbumCredit, list(credits.values()), ["album_group_id", "creator_id", "role_id"]
+            )
+            await mark_imported(session, source, done)
+            await session.commit()
+            print(f"💾 Inserted {new_credit_count} credits ({new_creator_count} new creators)...")
 
-        if new_credits:
-            batch_size = 1000
-            for i in range(0, len(new_credits), batch_size):
-                batch = new_credits[i:i+batch_size]
-                session.add_all(batch)
-                await session.commit()
-                print(f"💾 Inserted {min(i+batch_size, len(new_credits))}/{len(new_credits)} credits...")
+    print(f"📥 JSON 항목: {loaded}개")
+    print(f"📊 임포트 분석:")
+    print(f"   • 변경 없음: {unchanged}개")
+    print(f"   • DB에 없는 앨범: {missing_album}개")
+    print(f"   • 새로 추가: {new_credit_count}개 (새 크리에이터 {new_creator_count}개)\n")
 
-    print(f"\n✅ 협업 크레딧 임포트 완료: {len(new_credits)}개")
-    return len(new_credits)
+    print(f"\n✅ 협업 크레딧 임포트 완료: {new_credit_count}개")
+    return new_credit_count
 
 
 async def import_credits():
@@ -311,94 +286,95 @@ async def import_credits():
     print("🎼 Phase 3: 크레딧 정보 임포트")
     print("="*70 + "\n")
 
-    # JSON 로드
-    try:
-        with open(CREDITS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            credits_data = data.get('albums', {})
-    except FileNotFoundError:
+    # JSON은 스트리밍으로 읽는다 (파일 전체를 메모리에 올리지 않음)
+    if not Path(CREDITS_FILE).exists():
         print(f"⚠️  {CREDITS_FILE} 파일이 없습니다. 스킵합니다.")
         return 0
-    
-    print(f"📥 크레딧 데이터 로드: {len(credits_data)}개 앨범")
-
-    # 기존 크레딧 체크
-    async with async_session() as session:
-        stmt = select(AlbumCredit.album_group_id, AlbumCredit.creator_id, AlbumCredit.role_id)
-        result = await session.execute(stmt)
-        existing_triples = set((r[0], r[1], r[2]) for r in result.all())
-        print(f"📋 기존 DB 크레딧: {len(existing_triples)}개\n")
-
-        stmt = select(AlbumGroup.album_group_id)
-        result = await session.execute(stmt)
-        existing_album_ids = set(result.scalars().all())
-
-    # 새 크레딧 생성
-    new_credits = []
-    skipped = 0
-
-    for album_id, album_data in credits_data.items():
-        if album_data['album_id'] not in existing_album_ids:
-            skipped += 1
-            continue
-        if not album_data.get('found'):
-            continue
-
-        for credit in album_data.get('credits', []):
-            creator_name = credit['person_name']
-            role_name = credit['role']
-
-            async with async_session() as session:
-                # ensure role
-                role_id = await ensure_role(session, role_name, "other")
-
-                # ensure creator
-                stmt = select(Creator).where(Creator.display_name == creator_name)
-                result = await session.execute(stmt)
-                creator = result.scalars().first()
-                if not creator:
-                    creator_id = f"local:creator:{uuid.uuid4()}"
-                    creator = Creator(
-                        creator_id=creator_id,
-                        display_name=creator_name,
-                        kind='person',
-                        primary_role_tag=role_name
-                    )
-                    session.add(creator)
-                    await session.commit()
-                else:
-                    creator_id = creator.creator_id
-
-            triple = (album_data['album_id'], creator_id, role_id)
-            if triple not in existing_triples:
-                new_credits.append(AlbumCredit(
-                    album_group_id=album_data['album_id'],
-                    creator_id=creator_id,
-                    role_id=role_id,
-                    source_confidence=50
-                ))
-            else:
-                skipped += 1
 
-    print(f"📊 임포트 분석:")
-    print(f"   • 이미 존재: {skipped}개")
-    print(f"   • 새로 추가: {len(new_credits)}개\n")
+    source = "import-metadata:credits"
+    loaded = 0
+    unchanged = 0
+    missing_album = 0
+    new_credit_count = 0
+    new_role_count = 0
+    new_creator_count = 0
 
-    if len(new_credits) == 0:
-        print("✅ 추가할 크레딧이 없습니다.")
-        return 0
+    # 역할/크리에이터 캐시는 바뀐 레코드가 처음 나올 때 한 번만 조회
+    roles = None
+    creator_names = None
 
-    # 배치 임포트
     async with async_session() as session:
-        batch_size = 1000
-        for i in range(0, len(new_credits), batch_size):
-            batch = new_credits[i:i+batch_size]
-            session.add_all(batch)
+        for batch in batched(iter_object(CREDITS_FILE, 'albums'), BATCH_SIZE):
+            loaded += len(batch)
+            changed = await changed_records(session, source, batch)
+            unchanged += len(batch) - len(changed)
+            if not changed:
+                continue
+
+            if roles is None:
+                roles = await load_roles(session)
+                creator_names = await load_creator_names(session)
+                print(f"📋 캐시: roles {len(roles)}개, creator 이름 {len(creator_names)}개\n")
+
+            known_albums = await existing_album_ids(session, {d['album_id'] for _, d, _ in changed})
+            # 역할/크리에이터는 메모리에서 해석하고, 없는 것만 모아 두었다가 한 번에 INSERT
+            new_roles = []
+            new_creators = []
+            credits = {}
+            done = []
+            for key, album_data, h in changed:
+                album_group_id = album_data['album_id']
+                if album_group_id not in known_albums:
+                    missing_album += 1
+                    continue
+                done.append((key, h))
+                if not album_data.get('found'):
+                    continue
+
+                for credit in album_data.get('credits', []):
+                    creator_name = credit['person_name']
+                    role_name = credit['role']
+
+                    role_id = resolve_role(roles, new_roles, role_name, "other")
+
+                    name_key = normalize_name(creator_name)
+                    creator_id = creator_names.get(name_key)
+                    if creator_id is None:
+                        creator_id = f"local:creator:{uuid.uuid4()}"
+                        creator_names[name_key] = creator_id
+                        new_creators.append({
+                            "creator_id": creator_id,
+                            "display_name": creator_name,
+                            "kind": 'person',
+                            "primary_role_tag": role_name,
+                        })
+
+                    credits.setdefault((album_group_id, creator_id, role_id), {
+                        "album_group_id": album_group_id,
+                        "creator_id": creator_id,
+                        "role_id": role_id,
+                        "source_confidence": 50,
+                    })
+
+            # roles, creators 먼저
+            new_role_count += await upsert_rows(session, Role, new_roles, ["role_name"])
+            new_creator_count += await upsert_rows(session, Creator, new_creators, ["creator_id"])
+            new_credit_count += await upsert_rows(
+                session, AlbumCredit, list(credits.values()), ["album_group_id", "creator_id", "role_id"]
+            )
+            await mark_imported(session, source, done)
             await session.commit()
-            print(f"💾 Inserted {min(i+batch_size, len(new_credits))}/{len(new_credits)} 크레딧...")
+            print(f"💾 Inserted {new_credit_count} 크레딧...")
 
-    print(f"\n✅ 크레딧 임포트 완료: {len(new_credits)}개")
-    return len(new_credits)
+    print(f"📥 JSON 항목: {loaded}개")
+    print(f"📊 임포트 분석:")
+    print(f"   • 변경 없음: {unchanged}개")
+    print(f"   • DB에 없는 앨범: {missing_album}개")
+    print(f"   • 새로 추가: {new_credit_count}개")
+    print(f"   • 새 역할: {new_role_count}개, 새 크리에이터: {new_creator_count}개\n")
+
+    print(f"\n✅ 크레딧 임포트 완료: {new_credit_count}개")
+    return new_credit_count
 
 
 async def show_statistics():
@@ -408,44 +384,28 @@ async def show_statistics():
     print("="*70 + "\n")
 
     async with async_session() as session:
-        # Creators
-        stmt = select(Creator)
-        result = await session.execute(stmt)
-        creators = result.scalars().all()
-        print(f"✅ creators: {len(creators)}개")
-
-        # Spotify Profiles
-        stmt = select(CreatorSpotifyProfile)
-        result = await session.execute(stmt)
-        profiles = result.scalars().all()
-        print(f"✅ creator_spotify_profile: {len(profiles)}개")
-
-        # Album Credits
-        stmt = select(AlbumCredit)
-        result = await session.execute(stmt)
-        credits = result.scalars().all()
-        print(f"✅ album_credits: {len(credits)}개")
-
-        # Album Groups
-        stmt = select(AlbumGroup)
-        result = await session.execute(stmt)
-        albums = result.scalars().all()
-        print(f"✅ album_groups: {len(albums)}개")
-
-        # Roles
-        stmt = select(Role)
-        result = await session.execute(stmt)
-        roles = result.scalars().all()
-        print(f"✅ roles: {len(roles)}개")
+        for label, model in (
+            ("creators", Creator),
+            ("creator_spotify_profile", CreatorSpotifyProfile),
+            ("album_credits", AlbumCredit),
+            ("album_groups", AlbumGroup),
+            ("roles", Role),
+        ):
+            count = (await session.execute(select(func.count()).select_from(model))).scalar()
+            print(f"✅ {label}: {count}개")
 
         # 크레딧 역할별 분포
-        role_counts = {}
-        for credit in credits:
-            role_counts[credit.role_id] = role_counts.get(credit.role_id, 0) + 1
-        
+        result = await session.execute(
+            select(AlbumCredit.role_id, func.count())
+            .group_by(AlbumCredit.role_id)
+            .order_by(func.count().desc())
+            .limit(10)
+        )
+        role_counts = result.all()
+
         if role_counts:
             print("\n   역할별 분포 (Top 10):")
-            for role, count in sorted(role_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
+            for role, count in role_counts:
                 print(f"   • {role}: {count}개")
 
 
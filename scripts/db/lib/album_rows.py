@@ -0,0 +1,93 @@
+"""
+v3 앨범 JSON -> album_groups / map_nodes / releases 행
+
+import.py, import-album-groups.py, bulk-import-albums.py가 모두 이 규칙 하나를 쓴다.
+같은 앨범은 어느 스크립트로 넣어도 같은 genre_vibe / 좌표 / release_id가 나와야 한다.
+
+- region_bucket / genre_vibe는 app.taxonomy로 다시 계산한다 (JSON의 region_bucket / genreVibe는 쓰지 않음)
+- country "Unknown"은 NULL, genreFamily가 없으면 "Unknown"
+- map_nodes: x = 연도(모르면 0 - 맵 / nearby 인덱스에서 빠진다), y = genre_vibe, size = popularity * 10 + 2
+
+Usage:
+  rows = album_rows(album)   # albumId가 없으면 None
+  if rows: group, node, release = rows
+"""
+
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from app.taxonomy import country_to_region, genre_to_vibe
+
+# 이미 있는 앨범을 다시 임포트할 때 JSON 값으로 덮어쓰는 컬럼 / 기존 값이 NULL일 때만 채우는 컬럼
+# (title / popularity / cover_url / earliest_release_date는 fix_album_titles.py, refresh-spotify-albums.py가 고친 값을 유지)
+ALBUM_UPDATE_COLUMNS = [
+    "primary_artist_display", "original_year", "country_code", "primary_genre", "region_bucket", "genre_vibe",
+]
+ALBUM_FILL_COLUMNS = ["title", "popularity", "cover_url", "earliest_release_date"]
+# map_nodes.size는 popularity에서 나오므로 새 노드에만
+NODE_UPDATE_COLUMNS = ["x", "y"]
+
+
+def release_id(album_id: str) -> str:
+    """같은 앨범은 항상 같은 release_id -> 재실행해도 중복 릴리스가 생기지 않음"""
+    return f"local:release:{uuid.uuid5(uuid.NAMESPACE_URL, album_id)}"
+
+
+def parse_release_date(value: Optional[str]) -> Optional[date]:
+    """릴리스 날짜 문자열(YYYY / YYYY-MM / YYYY-MM-DD) -> date (파싱 불가면 None)"""
+    if not value:
+        return None
+    try:
+        if len(value) == 4:  # YYYY
+            return date(int(value), 1, 1)
+        if len(value) == 7:  # YYYY-MM
+            return datetime.strptime(value, "%Y-%m").date()
+        return datetime.fromisoformat(value).date()
+    except (ValueError, TypeError):
+        return None
+
+
+def album_rows(album: dict) -> Optional[tuple[dict, dict, dict]]:
+    """v3 앨범 하나 -> (album_groups, map_nodes, releases) 행 (컬럼 이름 -> 값)"""
+    album_id = album.get("albumId")
+    if not album_id:
+        return None
+
+    title = album.get("title") or "Unknown Title"
+    year = album.get("year")
+    year = int(year) if year else None
+    country = album.get("country")
+    if country == "Unknown":
+        country = None
+    genre_family = album.get("genreFamily") or "Unknown"
+    genre_vibe = genre_to_vibe(genre_family, album.get("primaryGenre"))
+    popularity = (album.get("popularity") or 0) / 100.0
+    release_date = parse_release_date(album.get("releaseDate"))
+
+    group = {
+        "album_group_id": album_id,
+        "title": title,
+        "primary_artist_display": album.get("artistName") or "Unknown Artist",
+        "original_year": year,
+        "earliest_release_date": release_date,
+        "country_code": country,
+        "primary_genre": genre_family,
+        "region_bucket": country_to_region(country),
+        "genre_vibe": genre_vibe,
+        "popularity": popularity,
+        "cover_url": album.get("artworkUrl"),
+    }
+    node = {
+        "album_group_id": album_id,
+        "x": float(year or 0),
+        "y": genre_vibe,
+        "size": (popularity * 10) + 2,
+    }
+    release = {
+        "release_id": release_id(album_id),
+        "album_group_id": album_id,
+        "release_title": title,
+        "release_date": release_date,
+    }
+    return group, node, release
@@ -0,0 +1,128 @@
+"""
+asyncpg COPY 기반 대량 적재 헬퍼
+
+레코드를 COPY로 임시 스테이징 테이블에 밀어 넣은 뒤
+INSERT ... SELECT ... ON CONFLICT 한 문장으로 대상 테이블에 병합한다.
+ORM 객체 생성/flush 없이 테이블당 COPY 몇 번 + SQL 한 번으로 끝난다.
+"""
+
+import os
+from typing import Iterable, Iterator, Optional, Sequence
+
+import asyncpg
+
+DEFAULT_DATABASE_URL = "postgresql+asyncpg://sonic:0416@db:5432/sonic_db"
+COPY_BATCH_SIZE = 10000
+
+
+def asyncpg_dsn(url: Optional[str] = None) -> str:
+    """SQLAlchemy URL(postgresql+asyncpg://)을 asyncpg가 받는 DSN으로 변환"""
+    url = url or os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def batched(items: Iterable, size: int = COPY_BATCH_SIZE) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def create_staging_table(conn: asyncpg.Connection, stage: str, like: str) -> None:
+    """대상 테이블과 같은 컬럼 구조의 임시 테이블 (트랜잭션 종료 시 삭제)"""
+    await conn.execute(f"CREATE TEMP TABLE {stage} (LIKE {like} INCLUDING DEFAULTS) ON COMMIT DROP")
+
+
+async def copy_rows(
+    conn: asyncpg.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    batch_size: Optional[int] = COPY_BATCH_SIZE,
+) -> int:
+    """
+    rows를 batch_size 단위로 끊어 COPY. generator를 넘기면 메모리에 전부 올리지 않는다.
+    batch_size=None이면 COPY 한 번 (asyncpg가 rows를 읽으면서 버퍼 단위로 흘려보내므로 역시 메모리에 모으지 않는다).
+    """
+    if batch_size is None:
+        counted = _Counted(rows)
+        await conn.copy_records_to_table(table, records=counted, columns=list(columns))
+        return counted.count
+    total = 0
+    for batch in batched(rows, batch_size):
+        await conn.copy_records_to_table(table, records=batch, columns=list(columns))
+        total += len(batch)
+    return total
+
+
+class _Counted:
+    """COPY 한 번으로 흘려보낸 행 수를 세는 iterable"""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def upsert_sql(
+    target: str,
+    stage: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+    update_columns: Sequence[str] = (),
+    keep_existing: Sequence[str] = (),
+    fill_missing: Sequence[str] = (),
+    touch: Optional[str] = None,
+) -> str:
+    """
+    스테이징 -> 대상 병합 SQL.
+
+    - update_columns가 비어 있으면 ON CONFLICT DO NOTHING
+    - keep_existing 컬럼은 새 값이 NULL이면 기존 값을 유지 (COALESCE)
+    - fill_missing 컬럼은 기존 값이 NULL일 때만 채운다 (다른 스크립트가 고친 값을 덮어쓰지 않음)
+    - 값이 실제로 바뀐 행만 UPDATE 한다 (IS DISTINCT FROM)
+    - 결과는 (inserted, updated) 한 행
+    """
+    cols = ", ".join(columns)
+    keys = ", ".join(key_columns)
+    sql = (
+        f"INSERT INTO {target} ({cols}) "
+        f"SELECT DISTINCT ON ({keys}) {cols} FROM {stage} ORDER BY {keys} "
+        f"ON CONFLICT ({keys}) "
+    )
+    if not update_columns:
+        sql += "DO NOTHING"
+    else:
+        set_columns = list(update_columns) + [c for c in fill_missing if c not in update_columns]
+        new_values = [
+            f"COALESCE({target}.{c}, EXCLUDED.{c})" if c in fill_missing
+            else f"COALESCE(EXCLUDED.{c}, {target}.{c})" if c in keep_existing
+            else f"EXCLUDED.{c}"
+            for c in set_columns
+        ]
+        assignments = [f"{c} = {v}" for c, v in zip(set_columns, new_values)]
+        if touch:
+            assignments.append(f"{touch} = now()")
+        current = ", ".join(f"{target}.{c}" for c in set_columns)
+        sql += (
+            f"DO UPDATE SET {', '.join(assignments)} "
+            f"WHERE ROW({current}) IS DISTINCT FROM ROW({', '.join(new_values)})"
+        )
+    return (
+        f"WITH merged AS ({sql} RETURNING (xmax = 0) AS inserted) "
+        f"SELECT count(*) FILTER (WHERE inserted) AS inserted, "
+        f"count(*) FILTER (WHERE NOT inserted) AS updated FROM merged"
+    )
+
+
+async def merge(conn: asyncpg.Connection, sql: str) -> tuple[int, int]:
+    row = await conn.fetchrow(sql)
+    return row["inserted"], row["updated"]
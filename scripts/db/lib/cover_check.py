@@ -0,0 +1,98 @@
+"""
+커버 이미지 URL 검증
+
+HEAD 대신 앞부분만 받는 Range GET 한 번으로 상태 코드, Content-Type, 이미지 크기(가로/세로)를
+같이 확인한다. 크기는 JPEG/PNG/GIF/WebP 헤더에서 읽는다 (이미지 전체를 받지 않음).
+
+결과 ok 값:
+  True  - 이미지 확인
+  False - 깨진 URL (404/410 등 4xx, 이미지가 아닌 응답)
+  None  - 일시 오류 (5xx, 타임아웃, 연결 오류) -> 다음 실행에서 다시 확인
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from lib.enrichment import Provider
+
+PROBE_BYTES = 32 * 1024  # 대부분의 JPEG SOF 마커는 앞 몇 KB 안에 있다
+
+
+@dataclass
+class CoverStatus:
+    cover_url: str
+    ok: Optional[bool]
+    status_code: Optional[int] = None
+    content_type: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    def as_row(self) -> dict:
+        return {
+            "cover_url": self.cover_url,
+            "ok": self.ok,
+            "status_code": self.status_code,
+            "content_type": self.content_type,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+def image_size(data: bytes) -> Optional[tuple[int, int]]:
+    """이미지 앞부분 바이트에서 (가로, 세로). 알 수 없는 형식이거나 잘렸으면 None."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        return None
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                i += 1 if marker == 0xFF else 2
+                continue
+            length = struct.unpack(">H", data[i + 2:i + 4])[0]
+            # SOF0~SOF15 (DHT 0xC4, JPG 0xC8, DAC 0xCC 제외)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                h, w = struct.unpack(">HH", data[i + 5:i + 9])
+                return w, h
+            i += 2 + length
+    return None
+
+
+async def check_cover(provider: Provider, client: httpx.AsyncClient, url: str) -> CoverStatus:
+    """URL 하나 검증 (provider의 속도 제한/재시도 적용)"""
+    try:
+        res = await provider.get(
+            client, url, headers={"Range": f"bytes=0-{PROBE_BYTES - 1}"}, follow_redirects=True
+        )
+    except (httpx.HTTPError, RuntimeError):
+        return CoverStatus(url, None)
+
+    content_type = (res.headers.get("Content-Type") or "").split(";")[0].strip() or None
+    if res.status_code >= 500 or res.status_code == 429:
+        return CoverStatus(url, None, res.status_code, content_type)
+    if res.status_code not in (200, 206):
+        return CoverStatus(url, False, res.status_code, content_type)
+
+    size = image_size(res.content[:PROBE_BYTES])
+    is_image = (content_type or "").startswith("image/") or size is not None
+    width, height = size if size else (None, None)
+    return CoverStatus(url, is_image, res.status_code, content_type, width, height)
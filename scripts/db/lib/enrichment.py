@@ -0,0 +1,199 @@
+"""
+외부 메타데이터 보강용 병렬 요청 엔진
+
+- Provider: 제공자별 토큰 버킷(초당 요청 수 + burst)과 동시 요청 수 제한
+- 429/5xx 및 연결 오류는 Retry-After(없으면 지수 백오프)만큼 기다린 뒤 재시도
+  429를 받으면 해당 제공자의 버킷 전체를 멈춰서 다른 작업도 같이 기다린다.
+- map_bounded: 앨범 목록을 정해진 동시성으로 처리 (완료 순서대로 결과를 넘김)
+
+asyncio.sleep(고정 지연)으로 한 건씩 처리하는 대신, 각 제공자의 허용 속도에 맞춰
+여러 앨범/여러 제공자 요청을 동시에 흘려보낸다.
+
+Usage:
+  musicbrainz = Provider("musicbrainz", rate=1.0, headers={"User-Agent": USER_AGENT})
+  async with httpx.AsyncClient(timeout=30) as client:
+      res = await musicbrainz.get(client, url, params=params)
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SEC = 60.0
+
+
+class TokenBucket:
+    """rate 개/초로 채워지고 최대 burst 개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """서버가 속도 제한을 알려 왔을 때 버킷 전체를 잠시 멈춘다"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    self.updated = time.monotonic()
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+def retry_after_seconds(res: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜)"""
+    value = res.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt: int, base: float = 1.0) -> float:
+    return min(MAX_BACKOFF_SEC, base * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+
+class Provider:
+    """외부 API 하나의 속도/동시성 제한과 재시도 정책"""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int = 1,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        headers: Optional[dict] = None,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_retries = max_retries
+        self.headers = headers or {}
+        self.requests = 0
+        self.retries = 0
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        속도 제한을 지키면서 요청. 재시도 가능한 오류는 max_retries까지 다시 보내고,
+        마지막 응답(상태 코드와 무관)을 돌려준다. 연결 오류가 끝까지 나면 예외를 올린다.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        for attempt in range(self.max_retries + 1):
+            async with self.semaphore:
+                await self.bucket.acquire()
+                self.requests += 1
+                try:
+                    res = await client.request(method, url, headers=headers, **kwargs)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = backoff_seconds(attempt)
+                else:
+                    if res.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                        return res
+                    delay = retry_after_seconds(res)
+                    if delay is None:
+                        delay = backoff_seconds(attempt)
+                    if res.status_code in (429, 503):
+                        self.bucket.pause(delay)
+            self.retries += 1
+            await asyncio.sleep(delay)
+        raise RuntimeError(f"{self.name}: retries exhausted for {url}")
+
+    async def get(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        return await self.request(client, "GET", url, **kwargs)
+
+    async def head(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        return await self.request(client, "HEAD", url, **kwargs)
+
+    def stats(self) -> str:
+        return f"{self.name}: {self.requests} requests, {self.retries} retries"
+
+
+async def map_bounded(
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    concurrency: int,
+) -> AsyncIterator[tuple[T, R]]:
+    """
+    items를 최대 concurrency개씩 동시에 fn으로 처리하고 (item, 결과)를 완료 순서대로 yield.
+    fn에서 난 예외는 결과 자리에 예외 객체로 넘긴다 (한 건 실패로 전체가 멈추지 않게).
+    items를 읽다가 난 예외(JSON 파싱 오류 등)는 이미 넣은 항목을 다 처리한 뒤 호출한 쪽으로 다시 던진다.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def feed():
+        try:
+            for item in items:
+                await queue.put(item)
+        except Exception:
+            # items에서 예외가 나도 워커가 queue.get()에서 영원히 기다리지 않게 done을 보낸다
+            # (취소(CancelledError)일 때는 보내지 않는다 - 워커도 같이 취소되므로 꽉 찬 queue에서 멈출 수 있다)
+            await stop_workers()
+            raise
+        await stop_workers()
+
+    async def stop_workers():
+        for _ in range(concurrency):
+            await queue.put(done)
+
+    async def work():
+        while True:
+            item = await queue.get()
+            if item is done:
+                await results.put(done)
+                return
+            try:
+                result = await fn(item)
+            except Exception as e:  # noqa: BLE001 - 호출한 쪽에서 건별로 처리
+                result = e
+            await results.put((item, result))
+
+    tasks = [asyncio.create_task(feed())] + [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < concurrency:
+            entry = await results.get()
+            if entry is done:
+                finished += 1
+                continue
+            yield entry
+        feeder = tasks[0]
+        await asyncio.wait([feeder])  # done을 다 넣었으면 이미 끝났다
+        if feeder.exception() is not None:
+            raise feeder.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,101 @@
+"""
+증분 임포트 헬퍼 (import_ledger + ON CONFLICT)
+
+레코드마다 원본 JSON의 content hash를 import_ledger에 남겨 두고,
+다음 실행에서는 해시가 달라진 레코드만 대상 테이블에 쓴다.
+대상 테이블의 기존 ID를 미리 전부 읽어 오지 않고, 배치 단위로 ledger만 조회한 뒤
+INSERT ... ON CONFLICT DO NOTHING/UPDATE 로 반영한다.
+
+Usage:
+  changed = await changed_records(session, SOURCE, [(key, record), ...])
+  ... changed 레코드만 upsert_rows(...) ...
+  await mark_imported(session, SOURCE, [(key, content_hash), ...])
+"""
+
+import hashlib
+import json
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ImportLedger
+
+UPSERT_BATCH_SIZE = 1000
+
+
+def content_hash(record: Any) -> str:
+    """키 순서와 무관한 JSON 직렬화의 SHA-1"""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+async def changed_records(
+    session: AsyncSession, source: str, items: Iterable[tuple[str, Any]]
+) -> list[tuple[str, Any, str]]:
+    """
+    (key, record) 중 ledger에 없거나 해시가 달라진 것만 (key, record, hash)로 반환.
+    같은 key가 배치 안에 여러 번 있으면 마지막 레코드를 사용한다.
+    """
+    hashed = {key: (record, content_hash(record)) for key, record in items}
+    if not hashed:
+        return []
+    result = await session.execute(
+        select(ImportLedger.record_key, ImportLedger.content_hash).where(
+            ImportLedger.source == source,
+            ImportLedger.record_key.in_(list(hashed)),
+        )
+    )
+    known = dict(result.all())
+    return [(key, record, h) for key, (record, h) in hashed.items() if known.get(key) != h]
+
+
+async def mark_imported(session: AsyncSession, source: str, entries: Sequence[tuple[str, str]]) -> None:
+    """반영이 끝난 (key, hash)를 ledger에 기록 (대상 테이블 쓰기와 같은 트랜잭션에서 호출)"""
+    rows = [{"source": source, "record_key": key, "content_hash": h} for key, h in entries]
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(ImportLedger).values(rows[i:i+UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImportLedger.source, ImportLedger.record_key],
+            set_={"content_hash": stmt.excluded.content_hash, "imported_at": func.now()},
+        )
+        await session.execute(stmt)
+
+
+async def upsert_rows(
+    session: AsyncSession,
+    model,
+    rows: Sequence[dict],
+    index_elements: Sequence[str],
+    update_columns: Sequence[str] = (),
+    keep_existing: Sequence[str] = (),
+    fill_missing: Sequence[str] = (),
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> int:
+    """
+    rows를 multi-row INSERT ... ON CONFLICT 로 넣고 실제로 INSERT/UPDATE 된 행 수를 반환.
+
+    - update_columns가 비어 있으면 DO NOTHING
+    - keep_existing 컬럼은 새 값이 NULL이면 기존 값을 유지 (COALESCE)
+    - fill_missing 컬럼은 기존 값이 NULL일 때만 채운다 (bulk_load.upsert_sql과 같은 규칙)
+    """
+    table = model.__table__
+    written = 0
+    for i in range(0, len(rows), batch_size):
+        stmt = pg_insert(model).values(list(rows[i:i+batch_size]))
+        if not update_columns:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+        else:
+            set_ = {
+                c: func.coalesce(stmt.excluded[c], table.c[c]) if c in keep_existing else stmt.excluded[c]
+                for c in update_columns
+            }
+            for c in fill_missing:
+                set_[c] = func.coalesce(table.c[c], stmt.excluded[c])
+            if "updated_at" in table.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+        result = await session.execute(stmt)
+        written += result.rowcount
+    return written
@@ -0,0 +1,134 @@
+"""
+/out 파이프라인 JSON 파일 스트리밍 파서
+
+최상위 객체의 한 키에 들어 있는 배열(예: "albums": [...]) 또는 객체(예: "artists": {...})를
+통째로 읽지 않고 원소 단위로 디코딩해 generator로 넘긴다.
+메모리 사용량은 원소 하나 + 읽기 버퍼 크기로 고정되고, 소비하는 쪽은 읽는 도중에 처리를 시작할 수 있다.
+
+Usage:
+  for album in iter_array("/out/albums_spotify_v3.json", "albums"): ...
+  for artist_id, artist in iter_object("/out/artists_spotify.json", "artists"): ...
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, Tuple, Union
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """파일을 청크 단위로 읽으면서 앞부분을 버리는 버퍼."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # 이미 소비한 앞부분은 버려서 버퍼가 커지지 않게 한다.
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (EOF면 '')."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON stream: expected {ch!r}, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """다음 JSON 값 하나를 디코딩. 값이 버퍼 경계에 걸리면 더 읽어서 재시도한다."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 숫자/리터럴은 버퍼 끝에서 잘렸을 수 있으므로 뒤에 구분자가 보일 때까지 읽는다.
+            if end == len(self.buf) and not self.eof and not isinstance(obj, (dict, list, str)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return obj
+
+
+def _seek_key(reader: _Reader, key: str) -> bool:
+    """최상위 객체에서 key의 값 시작 위치로 이동. 다른 키의 값은 디코딩해서 건너뛴다."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return False
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            return True
+        reader.value()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            return False
+        if sep != ",":
+            raise ValueError(f"JSON stream: unexpected {sep!r} after value of {name!r}")
+
+
+def iter_array(path: Union[str, Path], key: str) -> Iterator[Any]:
+    """{"<key>": [item, item, ...], ...} 형태 파일에서 item을 하나씩 yield."""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f)
+        if not _seek_key(reader, key):
+            return
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        while True:
+            yield reader.value()
+            sep = reader.peek()
+            reader.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"JSON stream: unexpected {sep!r} in {key!r} array")
+
+
+def iter_object(path: Union[str, Path], key: str) -> Iterator[Tuple[str, Any]]:
+    """{"<key>": {name: value, ...}, ...} 형태 파일에서 (name, value)를 하나씩 yield."""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f)
+        if not _seek_key(reader, key):
+            return
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            name = reader.value()
+            reader.expect(":")
+            yield name, reader.value()
+            sep = reader.peek()
+            reader.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"JSON stream: unexpected {sep!r} in {key!r} object")
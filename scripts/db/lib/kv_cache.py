@@ -0,0 +1,153 @@
+"""
+SQLite 기반 영속 키-값 캐시 (보강 스크립트의 외부 API 응답 캐시)
+
+- 키 하나를 쓸 때 그 행만 INSERT/UPDATE (JSON 파일 전체를 다시 쓰지 않음)
+- 쓰기마다 바로 커밋 (WAL) -> 실행 중에 죽어도 그때까지의 결과가 남는다
+- 항목별 만료 시간(TTL). "찾을 수 없음" 같은 음성 결과(기본: None)는 별도의 짧은 TTL로 저장해 나중에 다시 시도
+- 한 파일 안에서 namespace로 캐시를 구분하고, 기존 JSON 캐시 파일이 있으면 처음 열 때 한 번 가져온다
+  (가져온 기록은 kv_cache_imports에 남긴다 - 가져온 항목이 모두 만료 / purge된 뒤에도 다시 가져오지 않도록)
+
+dict처럼 쓸 수 있다:
+  cache = KVCache(Path("/out/enrich_cache.sqlite"), "spotify_release",
+                  legacy_json=Path("/out/spotify_release_cache.json"), negative_ttl=30 * DAY)
+  if album_id in cache: value = cache[album_id]
+  cache[album_id] = "2001-05-01"   # 양성 결과 (ttl)
+  cache[album_id] = None           # 음성 결과 (negative_ttl)
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+DAY = 24 * 60 * 60
+
+_MISSING = object()
+
+
+class KVCache:
+    """namespace 하나에 대한 dict 형태의 영속 캐시"""
+
+    def __init__(
+        self,
+        path: Path,
+        namespace: str,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        legacy_json: Optional[Path] = None,
+        is_negative: Callable[[Any], bool] = lambda value: value is None,
+    ):
+        self.namespace = namespace
+        self.is_negative = is_negative
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl if negative_ttl is not None else ttl
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: 문장마다 자동 커밋
+        self.db = sqlite3.connect(str(path), isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS kv_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS kv_cache_imports (
+                namespace TEXT NOT NULL,
+                source TEXT NOT NULL,
+                imported_at REAL NOT NULL,
+                PRIMARY KEY (namespace, source)
+            )
+        """)
+        if legacy_json is not None:
+            self._import_legacy(Path(legacy_json))
+
+    def _import_legacy(self, legacy_json: Path) -> None:
+        """기존 JSON 캐시를 namespace마다 한 번만 가져온다 (kv_cache_imports 기록 기준)"""
+        if not legacy_json.exists():
+            return
+        source = legacy_json.name
+        imported = self.db.execute(
+            "SELECT 1 FROM kv_cache_imports WHERE namespace = ? AND source = ?", (self.namespace, source)
+        ).fetchone()
+        if imported:
+            return
+        # 기록을 남기기 전에 가져온 캐시: 만료된 행까지 세서 비어 있지 않으면 이미 가져온 것으로 본다
+        has_rows = self.db.execute("SELECT 1 FROM kv_cache WHERE namespace = ? LIMIT 1", (self.namespace,)).fetchone()
+        if has_rows:
+            self._mark_imported(source)
+            return
+        try:
+            data = json.loads(legacy_json.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        rows = [
+            (self.namespace, str(key), json.dumps(value, ensure_ascii=False), self._expires(value, now))
+            for key, value in data.items()
+        ]
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR REPLACE INTO kv_cache VALUES (?, ?, ?, ?)", rows)
+            self._mark_imported(source)
+        print(f"📦 {legacy_json.name} -> {self.namespace}: {len(rows)} entries imported")
+
+    def _mark_imported(self, source: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO kv_cache_imports VALUES (?, ?, ?)", (self.namespace, source, time.time())
+        )
+
+    def _expires(self, value: Any, now: float, ttl: Optional[float] = None) -> Optional[float]:
+        if ttl is None:
+            ttl = self.negative_ttl if self.is_negative(value) else self.ttl
+        return now + ttl if ttl is not None else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self.db.execute(
+            "SELECT value FROM kv_cache WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.namespace, key, time.time()),
+        ).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """값 저장. ttl을 주지 않으면 음성 결과(is_negative)는 negative_ttl, 나머지는 ttl 적용."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO kv_cache VALUES (?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value, ensure_ascii=False), self._expires(value, time.time(), ttl)),
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return self.db.execute(
+            "SELECT count(*) FROM kv_cache WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (self.namespace, time.time()),
+        ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        cur = self.db.execute(
+            "DELETE FROM kv_cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.namespace, time.time()),
+        )
+        return cur.rowcount
+
+    def close(self) -> None:
+        self.db.close()
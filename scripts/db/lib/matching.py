@@ -0,0 +1,273 @@
+"""
+앨범 (제목, 아티스트) 퍼지 매칭 엔진
+
+- normalize_text: 악센트 제거, 소문자, 괄호 안 수식어("(Remastered)", "[Deluxe]") 제거
+- edit_similarity: 비트 병렬 LCS 기반 편집 유사도(difflib.SequenceMatcher.ratio와 같은 스케일).
+  토큰을 정렬한 문자열끼리도 비교해서 단어 순서만 바뀐 경우("beatles the")도 잡는다. min_score 판정은 이 값으로 한다.
+- similarity: 후보 순위용. 위 값과 token-set 유사도 중 큰 값인데, token-set은 두 쪽 토큰 수가 비슷할 때만 쓴다
+  (한쪽 토큰이 다른 쪽의 부분집합이면 항상 1.0이라 "Greatest Hits" / "Greatest Hits II"를 같게 본다).
+- 숫자 / 로마 숫자 / 서수("2", "II", "second", "2nd")가 다르면 유사도 0: 속편 / Vol. / Part는 다른 앨범이다.
+- AlbumMatcher: 카탈로그를 정규화 토큰 역색인으로 묶어 두고(blocking), 시드마다
+  희귀 토큰을 공유하는 후보 몇십 개만 점수를 매긴다. 정확히 같은 키는 dict로 바로 찾는다.
+
+Usage:
+  matcher = AlbumMatcher()
+  for album in albums:
+      matcher.add(album.album_group_id, album.title, album.primary_artist_display, album.original_year)
+  match = matcher.match("Abbey Road (Remastered)", "The Beatles", 1969)
+  if match: match.key, match.score
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_MIN_SCORE = 0.90
+BLOCKING_TOKENS = 3  # 시드마다 가장 희귀한 토큰 몇 개의 색인만 본다
+MAX_CANDIDATES = 50  # 공유 토큰 수 상위 몇 개만 점수 계산
+YEAR_BONUS = 0.05
+TOKEN_SET_MIN_SIZE_RATIO = 0.75  # 토큰 수 비율(작은 쪽 / 큰 쪽)이 이 이상일 때만 token-set 유사도를 쓴다
+
+# 정규화 후 토큰 -> 숫자 ("i"는 영어 대명사와 겹쳐서 뺀다)
+_ROMAN = {r: n for n, r in enumerate(
+    ["", "", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x",
+     "xi", "xii", "xiii", "xiv", "xv", "xvi", "xvii", "xviii", "xix", "xx"]) if r}
+_NUMBER_WORDS = {
+    w: n for n, words in enumerate([
+        (), ("one", "first"), ("two", "second"), ("three", "third"), ("four", "fourth"), ("five", "fifth"),
+        ("six", "sixth"), ("seven", "seventh"), ("eight", "eighth"), ("nine", "ninth"), ("ten", "tenth"),
+    ]) for w in words
+}
+_ORDINAL_DIGITS = re.compile(r"^(\d+)(st|nd|rd|th)?$")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """비교용 정규화. 괄호 수식어를 지우면 빈 문자열이 되는 제목은 괄호 안 내용을 남긴다."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", value)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    stripped = re.sub(r"\([^)]*\)|\[[^\]]*\]", " ", text)
+    if re.search(r"[a-z0-9]", stripped):
+        text = stripped
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return " ".join(text.split())
+
+
+def lcs_length(a: str, b: str) -> int:
+    """최장 공통 부분 수열 길이 (Allison-Dix/Hyyrö 비트 병렬, O(len(b)) 정수 연산)"""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count("1")
+
+
+def edit_ratio(a: str, b: str) -> float:
+    """삽입/삭제 편집 거리 기반 유사도 2*LCS/(len(a)+len(b)) (0~1)"""
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return 2.0 * lcs_length(a, b) / (len(a) + len(b))
+
+
+def numerals(text: str) -> frozenset:
+    """정규화된 문자열 안의 숫자 토큰 ("vol 2" / "vol ii" / "second volume" -> {2})"""
+    found = set()
+    for token in text.split():
+        digits = _ORDINAL_DIGITS.match(token)
+        if digits:
+            found.add(int(digits.group(1)))
+        elif token in _ROMAN:
+            found.add(_ROMAN[token])
+        elif token in _NUMBER_WORDS:
+            found.add(_NUMBER_WORDS[token])
+    return frozenset(found)
+
+
+def token_sort_ratio(a: str, b: str) -> float:
+    """토큰을 정렬해 이어 붙인 문자열끼리의 편집 유사도 (단어 순서 차이만 무시)"""
+    return edit_ratio(" ".join(sorted(a.split())), " ".join(sorted(b.split())))
+
+
+def token_set_ratio(a: str, b: str) -> float:
+    """
+    공통 토큰과 나머지 토큰을 정렬해 이어 붙인 문자열끼리 비교 (fuzzywuzzy token_set_ratio 방식).
+    "beatles the" / "the beatles", "abbey road" / "abbey road super deluxe" 같은 경우 높게 나온다.
+    """
+    ta, tb = set(a.split()), set(b.split())
+    if not ta or not tb:
+        return 0.0
+    common = " ".join(sorted(ta & tb))
+    if not common:
+        return edit_ratio(" ".join(sorted(ta)), " ".join(sorted(tb)))
+    rest_a = " ".join(sorted(ta - tb))
+    rest_b = " ".join(sorted(tb - ta))
+    full_a = f"{common} {rest_a}".strip()
+    full_b = f"{common} {rest_b}".strip()
+    return max(edit_ratio(common, full_a), edit_ratio(common, full_b), edit_ratio(full_a, full_b))
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """min_score 판정용 유사도 (0~1). 숫자가 다르면 0."""
+    if a == b:
+        return 1.0 if a else 0.0
+    if numerals(a) != numerals(b):
+        return 0.0
+    return max(edit_ratio(a, b), token_sort_ratio(a, b))
+
+
+def similarity(a: str, b: str) -> float:
+    """후보 순위용 유사도 (0~1). 토큰 수가 비슷할 때만 token-set 유사도를 쓴다."""
+    base = edit_similarity(a, b)
+    if base in (0.0, 1.0):
+        return base
+    na, nb = len(set(a.split())), len(set(b.split()))
+    if min(na, nb) / max(na, nb) >= TOKEN_SET_MIN_SIZE_RATIO:
+        return max(base, token_set_ratio(a, b))
+    return base
+
+
+def year_bonus(year: Optional[int], other_year: Optional[int]) -> float:
+    if year and other_year and abs(int(year) - int(other_year)) <= 1:
+        return YEAR_BONUS
+    return 0.0
+
+
+def score_album(
+    title: str,
+    artist: str,
+    other_title: str,
+    other_artist: str,
+    title_weight: float = 0.5,
+    artist_weight: float = 0.5,
+) -> tuple[float, float]:
+    """
+    정규화된 (제목, 아티스트) 쌍의 (판정 점수, 순위 점수).
+    판정 점수는 편집 유사도의 가중 평균(가중치 합으로 나눠 0~1) - min_score와 비교한다.
+    순위 점수는 similarity의 가중 합 - 여기에 연도 / 외부 점수 보너스를 더해 후보끼리 비교한다.
+    """
+    total = title_weight + artist_weight
+    passing = (
+        title_weight * edit_similarity(title, other_title) + artist_weight * edit_similarity(artist, other_artist)
+    ) / total
+    ranking = title_weight * similarity(title, other_title) + artist_weight * similarity(artist, other_artist)
+    return passing, ranking
+
+
+def best_candidate(
+    title: str,
+    artist: str,
+    year: Optional[int],
+    candidates: Iterable[Any],
+    extract: Callable[[Any], tuple[str, str, Optional[int]]],
+    min_score: float = DEFAULT_MIN_SCORE,
+    title_weight: float = 0.5,
+    artist_weight: float = 0.5,
+    extra_score: Optional[Callable[[Any], float]] = None,
+) -> Optional[Any]:
+    """
+    외부 API 검색 결과 몇 개 중 가장 잘 맞는 후보 (판정 점수가 min_score 이상인 후보가 없으면 None).
+    extract(candidate) -> (제목, 아티스트, 연도), extra_score(candidate)는 순위 점수에만 더할 값.
+    """
+    norm_title = normalize_text(title)
+    norm_artist = normalize_text(artist)
+    best = None
+    best_score = 0.0
+    for candidate in candidates:
+        c_title, c_artist, c_year = extract(candidate)
+        passing, score = score_album(
+            norm_title, norm_artist, normalize_text(c_title), normalize_text(c_artist), title_weight, artist_weight
+        )
+        if passing < min_score:
+            continue
+        score += year_bonus(year, c_year)
+        if extra_score:
+            score += extra_score(candidate)
+        if score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+@dataclass
+class Match:
+    key: Any
+    score: float
+    exact: bool = False  # 정규화 키가 그대로 일치
+
+
+class AlbumMatcher:
+    """카탈로그 (제목, 아티스트) 역색인. add()로 채우고 match()로 시드를 찾는다."""
+
+    def __init__(self, min_score: float = DEFAULT_MIN_SCORE, max_candidates: int = MAX_CANDIDATES):
+        self.min_score = min_score
+        self.max_candidates = max_candidates
+        self.entries: list[tuple[Any, str, str, Optional[int]]] = []
+        self.exact: dict[str, list[int]] = {}
+        self.postings: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, key: Any, title: str, artist: str, year: Optional[int] = None) -> None:
+        norm_title = normalize_text(title)
+        norm_artist = normalize_text(artist)
+        if not norm_title or not norm_artist:
+            return
+        idx = len(self.entries)
+        self.entries.append((key, norm_title, norm_artist, year))
+        self.exact.setdefault(f"{norm_title}|||{norm_artist}", []).append(idx)
+        for token in set(norm_title.split()) | set(norm_artist.split()):
+            self.postings.setdefault(token, []).append(idx)
+
+    def _pick(
+        self, indexes: Iterable[int], score_of: Callable[[int], tuple[float, float]], exact: bool = False
+    ) -> Optional[Match]:
+        """score_of(idx) -> (판정 점수, 순위 점수). 판정 점수가 min_score 이상인 것 중 순위 점수가 가장 높은 항목"""
+        best_idx, best_score = None, 0.0
+        for idx in indexes:
+            passing, score = score_of(idx)
+            if passing >= self.min_score and score > best_score:
+                best_idx, best_score = idx, score
+        if best_idx is None:
+            return None
+        return Match(self.entries[best_idx][0], best_score, exact)
+
+    def match(self, title: str, artist: str, year: Optional[int] = None) -> Optional[Match]:
+        """가장 잘 맞는 카탈로그 항목. 정확히 같은 키가 있으면 연도가 가까운 것을 우선한다."""
+        norm_title = normalize_text(title)
+        norm_artist = normalize_text(artist)
+        if not norm_title or not norm_artist:
+            return None
+
+        exact_hits = self.exact.get(f"{norm_title}|||{norm_artist}")
+        if exact_hits:
+            return self._pick(exact_hits, lambda idx: (1.0, 1.0 + year_bonus(year, self.entries[idx][3])), exact=True)
+
+        # blocking: 희귀한 토큰부터 몇 개만 골라 그 색인에 있는 항목을 후보로
+        tokens = [t for t in set(norm_title.split()) | set(norm_artist.split()) if t in self.postings]
+        tokens.sort(key=lambda t: len(self.postings[t]))
+        shared = Counter()
+        for token in tokens[:BLOCKING_TOKENS]:
+            shared.update(self.postings[token])
+        candidates = [idx for idx, _ in shared.most_common(self.max_candidates)]
+
+        def score_of(idx: int) -> tuple[float, float]:
+            _, c_title, c_artist, c_year = self.entries[idx]
+            passing, score = score_album(norm_title, norm_artist, c_title, c_artist)
+            return passing, score + year_bonus(year, c_year)
+
+        return self._pick(candidates, score_of)
@@ -0,0 +1,128 @@
+"""
+Spotify 앨범 배치 클라이언트
+
+- client-credentials 토큰을 만료 1분 전까지 재사용 (401이면 새로 발급)
+- GET /v1/albums?ids= 로 20개씩 조회
+- 429는 Retry-After만큼 기다린 뒤 재시도 (lib.enrichment.Provider)
+- 여러 배치를 동시에 요청
+
+Usage:
+  spotify = SpotifyAlbumClient()
+  async with httpx.AsyncClient(timeout=30) as client:
+      async for spotify_id, album in spotify.iter_albums(client, ids):
+          ...  # album은 Spotify album 객체, 없는 앨범이면 None
+"""
+
+import asyncio
+import os
+import time
+from base64 import b64encode
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Optional
+
+import httpx
+
+from lib.bulk_load import batched
+from lib.enrichment import Provider, map_bounded
+
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+SPOTIFY_ALBUMS_URL = "https://api.spotify.com/v1/albums"
+SPOTIFY_ALBUM_PREFIX = "spotify:album:"
+
+ALBUMS_PER_REQUEST = 20  # /v1/albums 최대 ids 개수
+BATCH_CONCURRENCY = 4
+REQUESTS_PER_SEC = 8.0  # Spotify는 30초 단위 rolling window, 여유 있게
+
+
+def to_spotify_id(album_group_id: str) -> str:
+    """spotify:album:xxxxx -> xxxxx"""
+    return album_group_id.replace(SPOTIFY_ALBUM_PREFIX, "", 1)
+
+
+def parse_release_date(value: Optional[str]) -> Optional[date]:
+    """Spotify release_date (YYYY, YYYY-MM, YYYY-MM-DD)"""
+    if not value:
+        return None
+    try:
+        if len(value) == 4:  # YYYY
+            return date(int(value), 1, 1)
+        if len(value) == 7:  # YYYY-MM
+            return datetime.strptime(value, "%Y-%m").date()
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return None
+
+
+def cover_url(album: dict) -> Optional[str]:
+    """가장 큰 커버 이미지 URL (Spotify는 큰 것부터 준다)"""
+    images = album.get("images") or []
+    return images[0].get("url") if images else None
+
+
+class SpotifyAlbumClient:
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        concurrency: int = BATCH_CONCURRENCY,
+        rate: float = REQUESTS_PER_SEC,
+    ):
+        self.client_id = client_id or os.getenv("SPOTIFY_CLIENT_ID")
+        self.client_secret = client_secret or os.getenv("SPOTIFY_CLIENT_SECRET")
+        if not self.client_id or not self.client_secret:
+            raise RuntimeError("Missing SPOTIFY_CLIENT_ID or SPOTIFY_CLIENT_SECRET")
+        self.concurrency = concurrency
+        self.provider = Provider("spotify", rate=rate, burst=concurrency, concurrency=concurrency)
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def access_token(self, client: httpx.AsyncClient, force: bool = False) -> str:
+        """토큰 재사용. 동시에 여러 배치가 요청해도 발급은 한 번만 한다."""
+        async with self._token_lock:
+            if not force and self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+            auth = b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+            res = await client.post(
+                SPOTIFY_TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                headers={"Authorization": f"Basic {auth}"},
+            )
+            if res.status_code != 200:
+                raise RuntimeError(f"Spotify token request failed: {res.status_code} {res.text[:200]}")
+            payload = res.json()
+            self._token = payload["access_token"]
+            self._token_expires_at = time.monotonic() + payload.get("expires_in", 3600) - 60  # 1분 여유
+            return self._token
+
+    async def fetch_albums(self, client: httpx.AsyncClient, spotify_ids: list[str]) -> list[Optional[dict]]:
+        """ids 최대 20개 -> 같은 순서의 album 객체 목록 (없는 ID는 None)"""
+        for attempt in range(2):
+            token = await self.access_token(client, force=attempt > 0)
+            res = await self.provider.get(
+                client,
+                SPOTIFY_ALBUMS_URL,
+                params={"ids": ",".join(spotify_ids)},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if res.status_code == 401 and attempt == 0:
+                continue  # 토큰 만료 -> 재발급 후 한 번 더
+            if res.status_code != 200:
+                raise RuntimeError(f"Spotify albums request failed: {res.status_code} {res.text[:200]}")
+            return res.json().get("albums", [])
+        return [None] * len(spotify_ids)
+
+    async def iter_albums(
+        self, client: httpx.AsyncClient, spotify_ids: Iterable[str]
+    ) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        """
+        ID를 20개씩 묶어 concurrency개 배치를 동시에 요청하고 (spotify_id, album)을 넘긴다.
+        실패한 배치는 경고만 출력하고 건너뛴다 (다음 실행에서 다시 시도).
+        """
+        batches = batched(spotify_ids, ALBUMS_PER_REQUEST)
+        async for batch, albums in map_bounded(batches, lambda ids: self.fetch_albums(client, ids), self.concurrency):
+            if isinstance(albums, Exception):
+                print(f"⚠️  Spotify batch failed ({len(batch)} albums): {albums}")
+                continue
+            for spotify_id, album in zip(batch, albums):
+                yield spotify_id, album
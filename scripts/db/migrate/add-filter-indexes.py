@@ -0,0 +1,36 @@
+"""
+/map/points, /albums 서버 필터용 인덱스 생성
+
+create_all은 이미 존재하는 테이블에 새 인덱스를 만들지 않으므로,
+models.py의 album_groups 인덱스 중 없는 것만 생성한다. (add-taxonomy-columns.py 이후 실행)
+
+Usage:
+  docker exec sonic_backend python scripts/db/migrate/add-filter-indexes.py
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Docker 컨테이너 내부에서는 /app이 루트
+sys.path.insert(0, "/app")
+
+from app.database import DATABASE_URL
+from app.models import AlbumGroup
+
+
+async def main():
+    engine = create_async_engine(DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        for index in sorted(AlbumGroup.__table__.indexes, key=lambda i: i.name):
+            await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+            print(f"✅ {index.name} ({', '.join(c.name for c in index.columns)})")
+        await conn.exec_driver_sql("ANALYZE album_groups")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
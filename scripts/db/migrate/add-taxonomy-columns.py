@@ -0,0 +1,77 @@
+"""
+album_groups에 region_bucket / genre_vibe 파생 컬럼을 추가하고 기존 행을 채운다.
+
+- 컬럼이 없으면 추가 (create_all은 기존 테이블에 컬럼을 추가하지 않음)
+- region_bucket: app.taxonomy.COUNTRY_TO_REGION 기준, 매핑 없으면 UNKNOWN_REGION (임포트 스크립트와 같은 규칙)
+- genre_vibe: map_nodes.y (임포트 시 같은 값으로 저장됨), 노드가 없으면 GENRE_VIBE_MAP 기준
+- NULL인 행만 채우므로 여러 번 실행해도 안전하다.
+
+Usage:
+  docker exec sonic_backend python scripts/db/migrate/add-taxonomy-columns.py
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Docker 컨테이너 내부에서는 /app이 루트
+sys.path.insert(0, "/app")
+
+from app.database import DATABASE_URL
+from app.taxonomy import COUNTRY_TO_REGION, GENRE_VIBE_MAP, UNKNOWN_REGION, DEFAULT_VIBE
+
+
+async def main():
+    engine = create_async_engine(DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE album_groups ADD COLUMN IF NOT EXISTS region_bucket VARCHAR"))
+        await conn.execute(text("ALTER TABLE album_groups ADD COLUMN IF NOT EXISTS genre_vibe DOUBLE PRECISION"))
+
+        result = await conn.execute(
+            text("""
+                UPDATE album_groups ag
+                SET region_bucket = m.region
+                FROM unnest(CAST(:countries AS text[]), CAST(:regions AS text[])) AS m(country, region)
+                WHERE ag.country_code = m.country AND ag.region_bucket IS NULL
+            """),
+            {"countries": list(COUNTRY_TO_REGION.keys()), "regions": list(COUNTRY_TO_REGION.values())},
+        )
+        print(f"🌍 region_bucket (mapped): {result.rowcount}")
+        result = await conn.execute(
+            text("UPDATE album_groups SET region_bucket = :unknown WHERE region_bucket IS NULL"),
+            {"unknown": UNKNOWN_REGION},
+        )
+        print(f"🌍 region_bucket ({UNKNOWN_REGION}): {result.rowcount}")
+
+        result = await conn.execute(text("""
+            UPDATE album_groups ag
+            SET genre_vibe = mn.y
+            FROM map_nodes mn
+            WHERE mn.album_group_id = ag.album_group_id AND ag.genre_vibe IS NULL
+        """))
+        print(f"🎚️  genre_vibe (map_nodes.y): {result.rowcount}")
+        result = await conn.execute(
+            text("""
+                UPDATE album_groups ag
+                SET genre_vibe = m.vibe
+                FROM unnest(CAST(:genres AS text[]), CAST(:vibes AS float8[])) AS m(genre, vibe)
+                WHERE ag.primary_genre = m.genre AND ag.genre_vibe IS NULL
+            """),
+            {"genres": list(GENRE_VIBE_MAP.keys()), "vibes": list(GENRE_VIBE_MAP.values())},
+        )
+        print(f"🎚️  genre_vibe (genre family): {result.rowcount}")
+        result = await conn.execute(
+            text("UPDATE album_groups SET genre_vibe = :vibe WHERE genre_vibe IS NULL"),
+            {"vibe": DEFAULT_VIBE},
+        )
+        print(f"🎚️  genre_vibe (default): {result.rowcount}")
+
+    await engine.dispose()
+    print("✅ taxonomy columns ready")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,463 @@
+"""
+성능 테스트용 합성 카탈로그 생성
+
+운영 규모(1만 ~ 500만 앨범)의 데이터를 결정적으로(같은 SEED면 같은 데이터) 만들어
+COPY로 한 트랜잭션에 적재한다. 모든 ID는 "synthetic:" 접두사를 쓴다.
+
+생성하는 테이블과 분포:
+  creators / creator_spotify_profile  아티스트 = 앨범 수 / 4, 참여자(프로듀서·엔지니어 등) = 앨범 수 / 10
+                                      아티스트의 30%는 그룹 (creator_relations에 멤버 2~5명)
+  album_groups / map_nodes            아티스트별 앨범 수는 멱법칙(소수 아티스트가 많은 앨범),
+                                      장르·국가는 아티스트 단위로 고정, 연도는 최근으로 치우침,
+                                      popularity는 beta 분포 + 상위 아티스트 가산
+  releases / tracks                   앨범당 1개, 20%는 에디션 1~2개 추가. 릴리스당 트랙 ~ Poisson(10)+1
+  album_credits                       Primary Artist + 참여자 ~ Poisson(1.5)
+  album_awards                        인기 앨범일수록 많이 (전체 2~10%)
+  dev_users / user_likes / user_events  유저 = 앨범 수 / 50 (최소 100), 인기 앨범 쪽으로 치우친 좋아요,
+                                        최근 180일에 퍼진 이벤트 로그
+
+Env:
+  SYNTH_ALBUMS (default: 10000)
+  SYNTH_SEED (default: 42)
+  SYNTH_TRACKS_PER_RELEASE (default: 10, 0이면 tracks 생략)
+  SYNTH_RESET ("1"이면 기존 synthetic 데이터를 지우고 다시 생성)
+
+seed-roles.py로 roles를 먼저 넣어 두어야 한다.
+
+Usage:
+  docker exec -e SYNTH_ALBUMS=1000000 sonic_backend python scripts/db/seed/generate-synthetic-catalog.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, "/app")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncpg
+import numpy as np
+
+from app.taxonomy import country_to_region, genre_to_vibe
+from lib.bulk_load import asyncpg_dsn, copy_rows
+
+SYNTH_ALBUMS = int(os.getenv("SYNTH_ALBUMS", "10000"))
+SYNTH_SEED = int(os.getenv("SYNTH_SEED", "42"))
+TRACKS_PER_RELEASE = int(os.getenv("SYNTH_TRACKS_PER_RELEASE", "10"))
+SYNTH_RESET = os.getenv("SYNTH_RESET", "0") == "1"
+
+PREFIX = "synthetic"
+CHUNK_SIZE = 50000
+
+N_ARTISTS = max(10, SYNTH_ALBUMS // 4)
+N_CONTRIBUTORS = max(10, SYNTH_ALBUMS // 10)
+N_USERS = max(100, SYNTH_ALBUMS // 50)
+GROUP_SHARE = 0.3
+ARTIST_SKEW = 2.2  # 클수록 상위 아티스트에 앨범이 몰린다
+LATEST_YEAR = 2024
+EVENT_DAYS = 180
+
+# dev_users는 UUID라 접두사를 못 쓰므로 고정 prefix 범위를 쓴다
+USER_UUID_PREFIX = "5e000000-0000-4000-8000-"
+
+GENRE_WEIGHTS = {
+    "Pop": 18, "Rock": 16, "Hip Hop": 12, "Electronic": 9, "Alternative/Indie": 9, "R&B": 6,
+    "Jazz": 5, "Metal": 4, "Country": 4, "Soul": 3, "Folk": 3, "Latin": 3, "K-pop/Asia Pop": 3,
+    "Classical": 2, "Punk": 2, "Dance": 2, "Reggae": 1, "Blues": 1, "Ambient": 1, "World": 1,
+}
+COUNTRY_WEIGHTS = {
+    "US": 38, "UK": 14, "Japan": 5, "South Korea": 5, "Canada": 4, "Germany": 4, "France": 3,
+    "Australia": 3, "Brazil": 3, "Sweden": 2, "Mexico": 2, "Spain": 2, "Italy": 2, "Netherlands": 2,
+    "Jamaica": 1, "Nigeria": 1, None: 9,
+}
+AWARDS = [
+    ("Grammy Award", "award"), ("Mercury Prize", "award"), ("Polaris Music Prize", "award"),
+    ("Korean Music Awards", "award"), ("Latin Grammy Award", "award"), ("Brit Award", "award"),
+    ("Rolling Stone 500 Greatest Albums", "list"), ("Pitchfork Best New Music", "list"),
+    ("1001 Albums You Must Hear Before You Die", "list"),
+]
+EVENT_WEIGHTS = {
+    "view_album": 55, "search": 15, "view_artist": 12, "open_on_platform": 10,
+    "recommendation_click": 7, "playlist_create": 1,
+}
+CONTRIBUTOR_ROLES = [
+    "Producer", "Co-Producer", "Executive Producer", "Composer", "Lyricist", "Arranger",
+    "Recording Engineer", "Mixing Engineer", "Mastering Engineer", "Backing Vocals",
+]
+
+WORDS = (
+    "midnight summer electric golden silent velvet broken neon paper crystal wild blue "
+    "endless hidden northern burning distant lonely sacred modern quiet bright strange "
+    "river city heart dream fire ocean garden shadow light mirror road signal echo "
+    "machine island horizon season window stone thunder satellite memory rain weather "
+    "parade paradise frequency harbor avenue motel lullaby anthem ritual empire"
+).split()
+FIRST_NAMES = (
+    "Alex Maya Jin Noah Sora Leo Nina Omar Ivy Theo Lena Kai Ruby Hugo Mina Eli Zara Finn "
+    "Yuna Luca Ada Ravi Iris Milo Chloe Dae Aria Jonas Emi Sam"
+).split()
+LAST_NAMES = (
+    "Park Rivera Kim Novak Okafor Lindqvist Tanaka Moreau Silva Walker Chen Byrne Haddad "
+    "Costa Fischer Reyes Nakamura Lee Adeyemi Larsen Kowalski Sato Grant Duarte Hale"
+).split()
+BAND_SUFFIXES = "Collective Club Orchestra Society Brothers Sisters Machine Band Kids Project".split()
+
+
+def cdf(weights: dict) -> tuple[list, np.ndarray]:
+    keys = list(weights)
+    values = np.array([weights[k] for k in keys], dtype=np.float64)
+    return keys, np.cumsum(values) / values.sum()
+
+
+GENRES, GENRE_CDF = cdf(GENRE_WEIGHTS)
+COUNTRIES, COUNTRY_CDF = cdf(COUNTRY_WEIGHTS)
+EVENT_TYPES, EVENT_CDF = cdf(EVENT_WEIGHTS)
+
+
+def hashed_uniform(idx: np.ndarray, salt: int) -> np.ndarray:
+    """인덱스마다 고정된 [0, 1) 난수 (아티스트 속성을 앨범 청크와 무관하게 같게 유지)"""
+    x = (idx.astype(np.uint64) + np.uint64(SYNTH_SEED * 1000003 + salt)) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(31)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(29)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def artist_name(i: int) -> str:
+    if i % 10 < GROUP_SHARE * 10:  # 그룹
+        return f"The {WORDS[i % len(WORDS)].title()} {BAND_SUFFIXES[(i // len(WORDS)) % len(BAND_SUFFIXES)]}"
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last}" if i < len(FIRST_NAMES) * len(LAST_NAMES) else f"{first} {last} {i // 1000}"
+
+
+def is_group(i: int) -> bool:
+    return i % 10 < GROUP_SHARE * 10
+
+
+def contributor_name(i: int) -> str:
+    return f"{FIRST_NAMES[(i * 7) % len(FIRST_NAMES)]} {LAST_NAMES[(i * 3 + i // 97) % len(LAST_NAMES)]}"
+
+
+def title_pool(size: int = 20000) -> list[str]:
+    """앨범 / 트랙 제목 후보 (1~4 단어). 행마다 조합하지 않고 여기서 인덱스로 고른다."""
+    rng = np.random.default_rng([SYNTH_SEED, 9])
+    lengths = 1 + np.minimum(3, rng.poisson(1.0, size))
+    words = rng.integers(0, len(WORDS), (size, 4)).tolist()
+    return [" ".join(WORDS[w] for w in ws[:k]).title() for ws, k in zip(words, lengths.tolist())]
+
+
+TITLES = title_pool()
+
+
+def artist_id(i: int) -> str:
+    return f"{PREFIX}:artist:{i}"
+
+
+def contributor_id(i: int) -> str:
+    return f"{PREFIX}:person:{i}"
+
+
+def album_id(i: int) -> str:
+    return f"{PREFIX}:album:{i}"
+
+
+def user_uuid(i: int) -> uuid.UUID:
+    return uuid.UUID(f"{USER_UUID_PREFIX}{i:012x}")
+
+
+def artist_traits(idx: np.ndarray) -> dict:
+    """아티스트별로 고정된 장르 / 국가 / 데뷔 연도 / 인기 가산점"""
+    debut = 1955 + (LATEST_YEAR - 1955) * hashed_uniform(idx, 3) ** 0.6
+    return {
+        "genre": np.searchsorted(GENRE_CDF, hashed_uniform(idx, 1)),
+        "country": np.searchsorted(COUNTRY_CDF, hashed_uniform(idx, 2)),
+        "debut": debut.astype(np.int64),
+        "boost": 0.35 * (1.0 - idx / N_ARTISTS) ** 12,
+    }
+
+
+# ----------------------------------------
+# creators
+# ----------------------------------------
+
+def creator_rows():
+    for i in range(N_ARTISTS):
+        country = COUNTRIES[int(np.searchsorted(COUNTRY_CDF, hashed_uniform(np.array([i]), 2)[0]))]
+        yield (artist_id(i), artist_name(i), "group" if is_group(i) else "person", "artist", country)
+    for i in range(N_CONTRIBUTORS):
+        yield (contributor_id(i), contributor_name(i), "person", "producer" if i % 3 == 0 else "engineer", None)
+
+
+def profile_rows(rng: np.random.Generator):
+    for start in range(0, N_ARTISTS, CHUNK_SIZE):
+        idx = np.arange(start, min(start + CHUNK_SIZE, N_ARTISTS))
+        traits = artist_traits(idx)
+        popularity = np.clip(rng.beta(2, 5, len(idx)) * 70 + traits["boost"] * 85, 0, 100).astype(int).tolist()
+        followers = rng.lognormal(9, 2.2, len(idx)).astype(np.int64).tolist()
+        for i, g, p, f in zip(idx.tolist(), traits["genre"].tolist(), popularity, followers):
+            yield (artist_id(i), json.dumps([GENRES[g]]), p, f)
+
+
+def relation_rows(rng: np.random.Generator):
+    for i in range(N_ARTISTS):
+        if not is_group(i):
+            continue
+        members = rng.choice(N_CONTRIBUTORS, size=int(rng.integers(2, 6)), replace=False).tolist()
+        for m in members:
+            yield (contributor_id(m), artist_id(i), "member_of", 60)
+            yield (artist_id(i), contributor_id(m), "has_member", 60)
+
+
+# ----------------------------------------
+# albums (청크 단위로 album_groups ~ album_awards를 함께 생성)
+# ----------------------------------------
+
+def album_chunk(start: int, end: int, roles: dict) -> dict[str, list]:
+    rng = np.random.default_rng([SYNTH_SEED, 1, start])
+    n = end - start
+    idx = np.arange(start, end)
+    artists = (N_ARTISTS * rng.random(n) ** ARTIST_SKEW).astype(np.int64)
+    traits = artist_traits(artists)
+
+    # 20%는 아티스트 장르가 아닌 다른 장르
+    genres = np.where(rng.random(n) < 0.2, np.searchsorted(GENRE_CDF, rng.random(n)), traits["genre"])
+    years = np.minimum(traits["debut"] + rng.integers(0, 15, n), LATEST_YEAR)
+    # 앨범 번호가 작을수록 약간 더 인기 (좋아요 샘플링과 같은 방향)
+    popularity = np.clip(
+        rng.beta(1.6, 4.5, n) * 0.65 + traits["boost"] + 0.2 * (1.0 - idx / SYNTH_ALBUMS) ** 8, 0.0, 1.0
+    )
+    vibe_jitter = rng.normal(0, 0.03, n)
+    titles = rng.integers(0, len(TITLES), n).tolist()
+    # 트랙 제목 / 길이는 청크 단위로 미리 뽑아 두고 순서대로 꺼내 쓴다
+    track_pool = n * (TRACKS_PER_RELEASE + 1) * 2
+    track_titles = rng.integers(0, len(TITLES), track_pool).tolist()
+    track_durations = np.clip(rng.normal(215000, 60000, track_pool), 60000, 900000).astype(int).tolist()
+    cursor = 0
+    has_cover = rng.random(n) < 0.95
+    day_offsets = rng.integers(0, 365, n)
+
+    out = {k: [] for k in ("album_groups", "map_nodes", "releases", "tracks", "album_credits", "album_awards")}
+    for j in range(n):
+        a_id = album_id(start + j)
+        artist = int(artists[j])
+        genre = GENRES[int(genres[j])]
+        country = COUNTRIES[int(traits["country"][j])]
+        year = int(years[j])
+        pop = float(popularity[j])
+        vibe = float(min(1.0, max(0.0, genre_to_vibe(genre) + vibe_jitter[j])))
+        released = date(year, 1, 1) + timedelta(days=int(day_offsets[j]))
+        title = TITLES[titles[j]]
+        cover = f"https://i.scdn.co/image/ab67616d0000b273{rng.bytes(12).hex()}" if has_cover[j] else None
+
+        out["album_groups"].append((
+            a_id, title, artist_name(artist), year, released, country, genre,
+            country_to_region(country), vibe, pop, cover, False,
+        ))
+        out["map_nodes"].append((a_id, float(year), vibe, pop * 10 + 2))
+
+        editions = 1 + (int(rng.integers(1, 3)) if rng.random() < 0.2 else 0)
+        for e in range(editions):
+            release_id = f"{PREFIX}:release:{start + j}:{e}"
+            out["releases"].append((
+                release_id, a_id, title if e == 0 else f"{title} (Deluxe Edition)",
+                released if e == 0 else released + timedelta(days=int(rng.integers(365, 3650))),
+                country, None if e == 0 else "deluxe", cover,
+            ))
+            if TRACKS_PER_RELEASE:
+                n_tracks = min(30, int(rng.poisson(TRACKS_PER_RELEASE)) + 1)
+                for t in range(n_tracks):
+                    k = (cursor + t) % track_pool
+                    out["tracks"].append((
+                        f"{release_id}:{t + 1}", release_id, 1, t + 1, TITLES[track_titles[k]], track_durations[k],
+                    ))
+                cursor += n_tracks
+
+        out["album_credits"].append((a_id, artist_id(artist), roles["Primary Artist"], 1, 90))
+        credited = set()
+        for k in range(int(rng.poisson(1.5))):
+            person = int(rng.integers(0, N_CONTRIBUTORS))
+            role = CONTRIBUTOR_ROLES[int(rng.integers(0, len(CONTRIBUTOR_ROLES)))]
+            if role not in roles or (person, role) in credited:
+                continue
+            credited.add((person, role))
+            out["album_credits"].append((a_id, contributor_id(person), roles[role], k + 2, 50))
+
+        if rng.random() < 0.02 + 0.08 * pop:
+            for k in rng.choice(len(AWARDS), size=int(rng.integers(1, 3)), replace=False).tolist():
+                name, kind = AWARDS[k]
+                out["album_awards"].append((
+                    f"{PREFIX}:album_award:{start + j}:{k}", a_id, name, kind, year + 1,
+                    "won" if kind == "award" else None, country,
+                ))
+    return out
+
+
+ALBUM_COLUMNS = {
+    "album_groups": [
+        "album_group_id", "title", "primary_artist_display", "original_year", "earliest_release_date",
+        "country_code", "primary_genre", "region_bucket", "genre_vibe", "popularity", "cover_url", "is_anchor",
+    ],
+    "map_nodes": ["album_group_id", "x", "y", "size"],
+    "releases": ["release_id", "album_group_id", "release_title", "release_date", "country_code", "edition", "cover_url"],
+    "tracks": ["track_id", "release_id", "disc_no", "track_no", "title", "duration_ms"],
+    "album_credits": ["album_group_id", "creator_id", "role_id", "credit_order", "source_confidence"],
+    "album_awards": ["album_award_id", "album_group_id", "award_name", "award_kind", "award_year", "award_result", "country"],
+}
+
+
+# ----------------------------------------
+# users
+# ----------------------------------------
+
+def popular_albums(rng: np.random.Generator, n: int) -> list[int]:
+    """앨범 번호가 작을수록 잘 뽑히는 샘플 (popularity 가산과 같은 방향)"""
+    return (SYNTH_ALBUMS * rng.random(n) ** 3).astype(np.int64).tolist()
+
+
+def like_rows(rng: np.random.Generator):
+    for u in range(N_USERS):
+        user = user_uuid(u)
+        for a in set(popular_albums(rng, int(rng.poisson(20)))):
+            yield (user, "album", album_id(a))
+        for a in set((N_ARTISTS * rng.random(int(rng.poisson(4))) ** ARTIST_SKEW).astype(np.int64).tolist()):
+            yield (user, "artist", artist_id(a))
+
+
+def event_rows(rng: np.random.Generator, now: datetime):
+    for u in range(N_USERS):
+        user = user_uuid(u)
+        n = int(rng.poisson(60))
+        types = np.searchsorted(EVENT_CDF, rng.random(n)).tolist()
+        ages = rng.exponential(EVENT_DAYS / 4, n).clip(0, EVENT_DAYS).tolist()
+        albums = popular_albums(rng, n)
+        for event, age, a in zip(types, ages, albums):
+            event_type = EVENT_TYPES[event]
+            created_at = now - timedelta(days=age)
+            if event_type == "search":
+                payload = json.dumps({"query": WORDS[a % len(WORDS)]})
+                yield (user, event_type, None, None, payload, created_at)
+            elif event_type == "view_artist":
+                yield (user, event_type, "artist", artist_id(a % N_ARTISTS), None, created_at)
+            elif event_type == "playlist_create":
+                yield (user, event_type, None, None, json.dumps({"size": int(a % 30) + 5}), created_at)
+            else:
+                yield (user, event_type, "album", album_id(a), None, created_at)
+
+
+# ----------------------------------------
+# main
+# ----------------------------------------
+
+# 삭제 시 FK 검사(참조하는 행이 남아 있는지)가 행마다 이 컬럼들을 찾는데 인덱스가 없어
+# 대량 삭제가 제곱 시간이 된다. reset 동안만 임시 인덱스를 만든다.
+RESET_INDEXES = {
+    "tracks": "release_id",
+    "releases": "album_group_id",
+    "album_credits": "creator_id",
+    "creator_relations": "target_creator_id",
+}
+
+
+async def reset(conn: asyncpg.Connection):
+    users = (f"{USER_UUID_PREFIX}000000000000", f"{USER_UUID_PREFIX}ffffffffffff")
+    like = f"{PREFIX}:%"
+    statements = [
+        ("user_events", "DELETE FROM user_events WHERE user_id BETWEEN $1::uuid AND $2::uuid", users),
+        ("user_likes", "DELETE FROM user_likes WHERE user_id BETWEEN $1::uuid AND $2::uuid", users),
+        ("dev_users", "DELETE FROM dev_users WHERE id BETWEEN $1::uuid AND $2::uuid", users),
+        ("album_awards", "DELETE FROM album_awards WHERE album_award_id LIKE $1", (like,)),
+        ("album_credits", "DELETE FROM album_credits WHERE album_group_id LIKE $1", (like,)),
+        ("tracks", "DELETE FROM tracks WHERE track_id LIKE $1", (like,)),
+        ("releases", "DELETE FROM releases WHERE release_id LIKE $1", (like,)),
+        ("map_nodes", "DELETE FROM map_nodes WHERE album_group_id LIKE $1", (like,)),
+        ("album_groups", "DELETE FROM album_groups WHERE album_group_id LIKE $1", (like,)),
+        ("creator_relations", "DELETE FROM creator_relations WHERE source_creator_id LIKE $1", (like,)),
+        ("creator_spotify_profile", "DELETE FROM creator_spotify_profile WHERE creator_id LIKE $1", (like,)),
+        ("creators", "DELETE FROM creators WHERE creator_id LIKE $1", (like,)),
+    ]
+    for table, column in RESET_INDEXES.items():
+        await conn.execute(f"CREATE INDEX synthetic_reset_{table} ON {table} ({column})")
+    for table, sql, args in statements:
+        status = await conn.execute(sql, *args)
+        print(f"  🗑️  {table}: {status.split()[-1]} rows")
+    for table in RESET_INDEXES:
+        await conn.execute(f"DROP INDEX synthetic_reset_{table}")
+
+
+async def main():
+    print("\n" + "=" * 70)
+    print(f"🧪 Synthetic catalog: {SYNTH_ALBUMS:,} albums (seed {SYNTH_SEED})")
+    print("=" * 70)
+
+    conn = await asyncpg.connect(asyncpg_dsn())
+    started = time.monotonic()
+    counts = {}
+    try:
+        roles = dict(await conn.fetch("SELECT role_name, role_id FROM roles"))
+        if "Primary Artist" not in roles:
+            print("❌ roles가 비어 있습니다. scripts/db/seed/seed-roles.py를 먼저 실행하세요.")
+            return
+
+        exists = await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM album_groups WHERE album_group_id LIKE $1)", f"{PREFIX}:%"
+        )
+        if exists and not SYNTH_RESET:
+            print("❌ synthetic 데이터가 이미 있습니다. SYNTH_RESET=1로 지우고 다시 생성하세요.")
+            return
+
+        async with conn.transaction():
+            await conn.execute("SET LOCAL synchronous_commit = off")
+            if exists:
+                print("🧹 Removing previous synthetic data...")
+                await reset(conn)
+
+            async def load(table: str, columns: list[str], rows) -> None:
+                t = time.monotonic()
+                counts[table] = counts.get(table, 0) + await copy_rows(conn, table, columns, rows)
+                print(f"  📥 {table}: {counts[table]:,} rows ({time.monotonic() - t:.1f}s)")
+
+            rng = np.random.default_rng([SYNTH_SEED, 0])
+            load_started = time.monotonic()
+            await load("creators", ["creator_id", "display_name", "kind", "primary_role_tag", "country_code"], creator_rows())
+            await load("creator_spotify_profile", ["creator_id", "genres", "popularity", "followers"], profile_rows(rng))
+            await load("creator_relations", ["source_creator_id", "target_creator_id", "relation_type", "confidence"], relation_rows(rng))
+
+            for start in range(0, SYNTH_ALBUMS, CHUNK_SIZE):
+                chunk = album_chunk(start, min(start + CHUNK_SIZE, SYNTH_ALBUMS), roles)
+                for table, columns in ALBUM_COLUMNS.items():
+                    if chunk[table]:
+                        counts[table] = counts.get(table, 0) + await copy_rows(conn, table, columns, chunk[table])
+                done = min(start + CHUNK_SIZE, SYNTH_ALBUMS)
+                elapsed = time.monotonic() - load_started
+                print(f"  ⏳ albums {done:,}/{SYNTH_ALBUMS:,} ({done / elapsed:,.0f} albums/s)")
+
+            now = datetime.now(timezone.utc)
+            await load("dev_users", ["id"], ((user_uuid(u),) for u in range(N_USERS)))
+            await load("user_likes", ["user_id", "entity_type", "entity_id"], like_rows(rng))
+            await load(
+                "user_events", ["user_id", "event_type", "entity_type", "entity_id", "payload", "created_at"],
+                event_rows(rng, now),
+            )
+
+        # 대량 적재 후 통계 갱신 (플래너가 새 분포를 보도록)
+        for table in counts:
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+    print("\n" + "=" * 70)
+    print("✅ Synthetic catalog loaded")
+    print("=" * 70)
+    for table, count in counts.items():
+        print(f"   • {table}: {count:,}")
+    print(f"\n   ⏱️  {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ import sys
 sys.path.append("/app")
 
 from app.models import AlbumGroup, MapNode, Release
+from app.taxonomy import country_to_region
 import uuid
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://sonic:0416@db:5432/sonic_db")
@@ -299,52 +300,6 @@ CLASSIC_ALBUMS = [
 ]
 
 
-def get_region_from_country(country):
-    """Country를 기반으로 region_bucket 결정"""
-    country_lower = (country or "").lower()
-    
-    # North America
-    if any(c in country_lower for c in ["united states", "canada", "mexico"]):
-        return "North America"
-    
-    # Europe
-    if any(c in country_lower for c in [
-        "united kingdom", "france", "germany", "italy", "spain",
-        "netherlands", "belgium", "sweden", "norway", "denmark",
-        "ireland", "portugal", "austria", "switzerland", "poland"
-    ]):
-        return "Europe"
-    
-    # Asia
-    if any(c in country_lower for c in [
-        "japan", "china", "korea", "india", "thailand", "indonesia",
-        "vietnam", "philippines", "malaysia", "singapore", "taiwan"
-    ]):
-        return "Asia"
-    
-    # South America
-    if any(c in country_lower for c in [
-        "brazil", "argentina", "colombia", "chile", "peru", "venezuela"
-    ]):
-        return "South America"
-    
-    # Oceania
-    if any(c in country_lower for c in ["australia", "new zealand"]):
-        return "Oceania"
-    
-    # Africa
-    if any(c in country_lower for c in [
-        "south africa", "nigeria", "kenya", "egypt", "ethiopia"
-    ]):
-        return "Africa"
-    
-    # Caribbean
-    if "jamaica" in country_lower:
-        return "North America"  # 지리적으로 북미에 가까움
-    
-    return "Unknown"
-
-
 async def insert_classic_albums():
     print("🎸 Classic Albums Insertion Script")
     print("=" * 50)
@@ -378,7 +333,7 @@ async def insert_classic_albums():
                 continue
             
             # region_bucket 자동 계산
-            album_data["region_bucket"] = get_region_from_country(album_data["country"])
+            album_data["region_bucket"] = country_to_region(album_data["country"])
             
             # 새 앨범 생성
             album_id = album_data["id"]
@@ -389,6 +344,8 @@ async def insert_classic_albums():
                 original_year=album_data["year"],
                 primary_genre=album_data["genre"],
                 country_code=album_data.get("country"),
+                region_bucket=album_data["region_bucket"],
+                genre_vibe=album_data.get("genre_vibe", 0.5),
                 popularity=album_data.get("popularity", 0.0),
                 cover_url=album_data.get("cover_url")
             )
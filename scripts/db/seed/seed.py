@@ -239,6 +239,8 @@ async def create_mock_albums():
                 original_year=year,
                 primary_genre=genre,
                 country_code=country,
+                region_bucket=region,
+                genre_vibe=vibe,
                 popularity=popularity,
                 cover_url=f"https://picsum.photos/300/300?random={idx+1}"
             )
@@ -275,6 +277,8 @@ async def create_mock_albums():
                     original_year=year,
                     primary_genre=genre,
                     country_code=country,
+                    region_bucket=region,
+                    genre_vibe=vibe,
                     popularity=popularity,
                     cover_url=f"https://picsum.photos/300/300?random={current_idx+1}"
                 )
@@ -299,6 +303,8 @@ async def create_mock_albums():
                     original_year=year,
                     primary_genre=genre,
                     country_code=country,
+                    region_bucket=region,
+                    genre_vibe=vibe,
                     popularity=popularity,
                     cover_url=f"https://picsum.photos/300/300?random={current_idx+1}"
                 )
@@ -387,6 +393,8 @@ async def create_mock_albums():
                 original_year=year,
                 primary_genre=genre_name,
                 country_code=country,
+                region_bucket=region,
+                genre_vibe=vibe,
                 popularity=popularity,
                 cover_url=f"https://picsum.photos/300/300?random={len(albums)+1}"
             )
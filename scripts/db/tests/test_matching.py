@@ -0,0 +1,73 @@
+"""lib/matching 테스트 (속편 / Vol. / 순서만 다른 제목)
+
+실행: python -m pytest scripts/db/tests
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lib.matching import AlbumMatcher, best_candidate, normalize_text, numerals, similarity
+
+
+def candidates(*titles):
+    return [{"title": t, "artist": "Led Zeppelin", "year": None} for t in titles]
+
+
+def fields(c):
+    return c["title"], c["artist"], c["year"]
+
+
+def test_numerals_normalize_roman_words_and_ordinals():
+    assert numerals(normalize_text("Led Zeppelin II")) == {2}
+    assert numerals(normalize_text("Vol. 2")) == {2}
+    assert numerals(normalize_text("The Second Volume")) == {2}
+    assert numerals(normalize_text("2nd Album")) == {2}
+    assert numerals(normalize_text("I Want You")) == frozenset()
+
+
+def test_sequel_does_not_match_original():
+    assert similarity(normalize_text("Led Zeppelin II"), normalize_text("Led Zeppelin")) == 0.0
+    assert best_candidate("Led Zeppelin II", "Led Zeppelin", None, candidates("Led Zeppelin"), fields) is None
+
+
+def test_sequel_picks_same_numeral():
+    found = best_candidate(
+        "Led Zeppelin II", "Led Zeppelin", None, candidates("Led Zeppelin", "Led Zeppelin 2", "Led Zeppelin III"), fields
+    )
+    assert found["title"] == "Led Zeppelin 2"
+
+
+def test_greatest_hits_volumes():
+    matcher = AlbumMatcher()
+    matcher.add(1, "Greatest Hits", "Queen", 1981)
+    matcher.add(2, "Greatest Hits II", "Queen", 1991)
+    assert matcher.match("Greatest Hits II", "Queen").key == 2
+    assert matcher.match("Greatest Hits Vol. 2", "Queen").key == 2
+    assert matcher.match("Greatest Hits III", "Queen") is None
+
+
+def test_volume_numbers_must_match():
+    matcher = AlbumMatcher()
+    matcher.add(1, "Kill Bill Vol. 1", "Various Artists")
+    assert matcher.match("Kill Bill Vol. 2", "Various Artists") is None
+    assert matcher.match("Kill Bill Volume 1", "Various Artists").key == 1
+
+
+def test_subset_title_is_not_a_match():
+    # token-set 유사도는 부분집합이면 1.0이지만 토큰 수가 많이 다르면 쓰지 않는다
+    matcher = AlbumMatcher()
+    matcher.add(1, "Hits", "Madonna")
+    assert matcher.match("Hits Live in Paris", "Madonna") is None
+
+
+def test_reordered_and_qualified_titles_still_match():
+    matcher = AlbumMatcher()
+    matcher.add(1, "Abbey Road", "The Beatles", 1969)
+    assert matcher.match("Abbey Road (Remastered 2009)", "Beatles, The", 1969).key == 1
+
+
+def test_year_bonus_does_not_lift_weak_match_over_threshold():
+    # 연도 보너스는 순위에만 쓰고 min_score 판정에는 넣지 않는다
+    weak = [{"title": "Physical Graffito", "artist": "Led Zepelin", "year": 1975}]
+    assert best_candidate("Physical Graffiti", "Led Zeppelin", 1975, weak, fields, min_score=0.95) is None
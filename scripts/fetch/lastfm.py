@@ -15,6 +15,7 @@ from collections import Counter
 
 sys.path.append("/app")
 from app.models import Album
+from app.taxonomy import country_to_region, genre_family_from_tags, genre_to_vibe
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://sonic:0416@db:5432/sonic_db")
 
@@ -37,98 +38,6 @@ GENRE_TAGS = [
 TARGET_ALBUMS = 500
 
 
-def get_region_from_country(country):
-    """Country를 기반으로 region_bucket 결정"""
-    if not country:
-        return "Unknown"
-    
-    country_lower = country.lower()
-    
-    if any(c in country_lower for c in ["united states", "us", "usa", "america"]):
-        return "North America"
-    if "canada" in country_lower or "mexico" in country_lower:
-        return "North America"
-    
-    if any(c in country_lower for c in [
-        "united kingdom", "uk", "england", "britain", "france", "germany", "italy", "spain",
-        "netherlands", "belgium", "sweden", "norway", "denmark", "finland",
-        "ireland", "portugal", "austria", "switzerland", "poland", "russia"
-    ]):
-        return "Europe"
-    
-    if any(c in country_lower for c in ["japan", "china", "korea", "india", "thailand", "indonesia"]):
-        return "Asia"
-    
-    if any(c in country_lower for c in ["brazil", "argentina", "colombia", "chile"]):
-        return "South America"
-    
-    if "australia" in country_lower or "new zealand" in country_lower:
-        return "Oceania"
-    
-    if "jamaica" in country_lower:
-        return "North America"
-    
-    return "Unknown"
-
-
-def map_genre_to_family(tags):
-    """장르 태그를 genreFamily로 매핑"""
-    if not tags:
-        return "Unknown"
-    
-    tags_str = " ".join(tags).lower()
-    
-    if any(g in tags_str for g in ["electronic", "techno", "house", "edm", "trance", "ambient", "electro", "idm"]):
-        return "Electronic"
-    
-    if any(g in tags_str for g in ["hip hop", "rap", "hip-hop"]):
-        return "Hip Hop"
-    
-    if any(g in tags_str for g in ["rock", "metal", "punk", "grunge", "alternative", "indie rock"]):
-        return "Rock"
-    
-    if any(g in tags_str for g in ["pop", "dance-pop", "synth-pop", "britpop"]):
-        return "Pop"
-    
-    if any(g in tags_str for g in ["jazz", "bebop", "swing"]):
-        return "Jazz"
-    
-    if any(g in tags_str for g in ["soul", "r&b", "r & b", "funk", "motown"]):
-        return "Soul"
-    
-    if "reggae" in tags_str or "ska" in tags_str:
-        return "Reggae"
-    
-    if any(g in tags_str for g in ["country", "folk", "bluegrass", "americana", "singer-songwriter"]):
-        return "Folk"
-    
-    if "classical" in tags_str:
-        return "Classical"
-    
-    if "blues" in tags_str:
-        return "Blues"
-    
-    if any(g in tags_str for g in ["latin", "salsa", "bossa", "samba", "tango", "afrobeat"]):
-        return "Latin"
-    
-    if "world" in tags_str:
-        return "World"
-    
-    return "Other"
-
-
-def get_genre_vibe(genre_family):
-    """장르 기반 vibe 값 계산 (0.0-1.0)"""
-    vibe_map = {
-        "Rock": 0.3, "Metal": 0.2, "Punk": 0.25, "Blues": 0.35,
-        "Folk": 0.45, "Pop": 0.65, "Soul": 0.55, "Funk": 0.6,
-        "Jazz": 0.7, "Electronic": 0.8, "Hip Hop": 0.5,
-        "Reggae": 0.58, "Latin": 0.62, "Classical": 0.75,
-        "World": 0.68, "Other": 0.5, "Unknown": 0.5,
-    }
-    return vibe_map.get(genre_family, 0.5)
-
-
 async def fetch_json(session, method, params):
     """Last.fm API 호출"""
     params["api_key"] = LASTFM_API_KEY
@@ -259,8 +168,8 @@ async def collect_albums():
                                 break
                 
                 # 데이터 변환
-                genre_family = map_genre_to_family(tags)
-                region_bucket = get_region_from_country(country)
+                genre_family = genre_family_from_tags(tags)
+                region_bucket = country_to_region(country)
                 
                 # playcount 기반 인기도 (정규화)
                 playcount = int(album_detail.get("playcount", 0))
@@ -281,7 +190,7 @@ async def collect_albums():
                     "artist_name": artist_name[:255],
                     "year": year,
                     "genre": genre_family,
-                    "genre_vibe": get_genre_vibe(genre_family),
+                    "genre_vibe": genre_to_vibe(genre_family),
                     "region_bucket": region_bucket,
                     "country": country,
                     "popularity": max(popularity, 0.6),  # Last.fm top albums는 최소 0.6
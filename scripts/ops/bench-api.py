@@ -0,0 +1,361 @@
+"""
+API 부하 / 지연시간 벤치마크
+
+앱을 프로세스 안에서 띄우고(httpx ASGITransport, 네트워크 없음) 실제 DB에 대해
+/map/points, /albums, /search, 상세, 아티스트 조회, 좋아요, 이벤트 요청을 섞어 지정한 동시성으로 보낸다.
+엔드포인트별 p50/p95/p99 지연시간, 처리량, 요청당 DB 쿼리 수를 출력하고 JSON으로 저장한다.
+
+- 요청 시나리오는 BENCH_SEED로 미리 전부 만들어 두므로 같은 DB + 같은 SEED면 같은 요청 순서가 재현된다.
+- Redis는 프로세스 메모리 dict로 대체한다 (research 캐시만 쓰며 벤치마크 대상이 아니다).
+- 쿼리 수 / DB 시간은 앱이 내보내는 Server-Timing 헤더(app/request_metrics.py)에서 읽는다.
+- 시작 시 캐시 워밍이 끝나 ready가 된 뒤부터 요청을 보낸다.
+- 결과 파일을 BENCH_BASELINE으로 넘기면 엔드포인트별 차이를 같이 출력한다 (커밋 간 회귀 확인).
+
+대규모 데이터는 scripts/db/seed/generate-synthetic-catalog.py로 만든다.
+좋아요 / 이벤트 요청이 실제로 행을 쓰므로 운영 DB에는 돌리지 않는다.
+
+Env:
+  BENCH_REQUESTS (default: 2000)
+  BENCH_CONCURRENCY (default: 16)
+  BENCH_WARMUP (default: 50 - 집계에서 제외하는 첫 요청 수)
+  BENCH_SEED (default: 7)
+  BENCH_USERS (default: 20 - /dev/users로 만드는 벤치마크 유저 수)
+  BENCH_OUT (default: /out/bench/bench-<commit>.json)
+  BENCH_BASELINE (optional: 비교할 이전 결과 JSON)
+  BENCH_COMMIT (optional: 결과에 기록할 커밋 - 컨테이너처럼 git이 없는 곳에서 지정, 기본은 git rev-parse)
+
+Usage:
+  docker exec -e BENCH_CONCURRENCY=32 sonic_backend python scripts/ops/bench-api.py
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, urlencode
+
+sys.path.insert(0, "/app")
+
+import httpx
+import numpy as np
+from sqlalchemy import func, select
+
+from app import health, service_gemini
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models import AlbumGroup, Creator
+
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", "2000"))
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "16"))
+BENCH_WARMUP = int(os.getenv("BENCH_WARMUP", "50"))
+BENCH_SEED = int(os.getenv("BENCH_SEED", "7"))
+BENCH_USERS = int(os.getenv("BENCH_USERS", "20"))
+BENCH_OUT = os.getenv("BENCH_OUT")
+BENCH_BASELINE = os.getenv("BENCH_BASELINE")
+BENCH_COMMIT = os.getenv("BENCH_COMMIT")
+
+SAMPLE_ALBUMS = 2000
+SAMPLE_ARTISTS = 500
+
+# 엔드포인트 이름 -> 가중치 (프론트엔드 사용 패턴 기준: 맵 / 목록 / 상세가 대부분)
+MIX = {
+    "map_clusters": 8,
+    "map_points": 8,
+    "albums_page": 12,
+    "search": 15,
+    "album": 8,
+    "album_detail": 15,
+    "artist_lookup": 10,
+    "likes_add": 5,
+    "likes_list": 4,
+    "events": 15,
+}
+EVENT_TYPES = ["view_album", "view_artist", "search", "open_on_platform", "recommendation_click"]
+
+
+class MemoryRedis:
+    """redis.asyncio 클라이언트 대신 쓰는 최소 구현 (get / setex)"""
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key):
+        value = self._data.get(key)
+        if value is None or value[1] < time.monotonic():
+            return None
+        return value[0]
+
+    async def setex(self, key, seconds, value):
+        self._data[key] = (value, time.monotonic() + seconds)
+
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+# ----------------------------------------
+# 시나리오
+# ----------------------------------------
+
+async def load_samples() -> dict:
+    """요청 파라미터로 쓸 실제 앨범 / 아티스트 / 검색어 (인기 앨범 위주 + 무작위 일부)"""
+    async with AsyncSessionLocal() as db:
+        total = (await db.execute(select(func.count()).select_from(AlbumGroup))).scalar()
+        popular = (await db.execute(
+            select(AlbumGroup.album_group_id, AlbumGroup.title, AlbumGroup.primary_artist_display, AlbumGroup.original_year)
+            .order_by(AlbumGroup.popularity.desc().nulls_last())
+            .limit(SAMPLE_ALBUMS // 2)
+        )).all()
+        sampled = (await db.execute(
+            select(AlbumGroup.album_group_id, AlbumGroup.title, AlbumGroup.primary_artist_display, AlbumGroup.original_year)
+            .order_by(func.md5(AlbumGroup.album_group_id + str(BENCH_SEED)))
+            .limit(SAMPLE_ALBUMS // 2)
+        )).all()
+        artists = (await db.execute(
+            select(Creator.display_name)
+            .where(Creator.primary_role_tag == "artist")
+            .order_by(Creator.creator_id)
+            .limit(SAMPLE_ARTISTS)
+        )).scalars().all()
+
+    albums = sorted(set(popular) | set(sampled))
+    if not albums:
+        raise SystemExit("❌ album_groups가 비어 있습니다 (generate-synthetic-catalog.py로 데이터를 먼저 넣으세요)")
+    words = sorted({w for _, title, _, _ in albums for w in (title or "").split() if len(w) >= 3})
+    return {
+        "total_albums": total,
+        "albums": albums,
+        "artists": sorted(set(artists) | {a for _, _, a, _ in albums if a}),
+        "words": words or ["a"],
+    }
+
+
+def build_plan(samples: dict, users: list[str]) -> list[tuple[str, str, str, Optional[dict], Optional[str]]]:
+    """(endpoint 이름, method, path+query, json body, user id) 목록"""
+    rng = random.Random(BENCH_SEED)
+    names = list(MIX)
+    weights = [MIX[n] for n in names]
+    albums = samples["albums"]
+    plan = []
+    for name in rng.choices(names, weights, k=BENCH_REQUESTS + BENCH_WARMUP):
+        album_id, title, artist, year = rng.choice(albums)
+        user = rng.choice(users)
+        year = year or 2000
+        if name == "map_clusters":
+            req = ("GET", f"/map/points?zoom=1&yearFrom={rng.choice([1960, 1980, 2000])}&yearTo=2024", None)
+        elif name == "map_points":
+            req = ("GET", f"/map/points?zoom=3&yearFrom={year - 2}&yearTo={year + 2}&minPopularity=0.3", None)
+        elif name == "albums_page":
+            req = ("GET", f"/albums?limit=500&offset={rng.randrange(0, 10) * 500}", None)
+        elif name == "search":
+            req = ("GET", f"/search?{urlencode({'q': rng.choice(samples['words'])})}", None)
+        elif name == "album":
+            req = ("GET", f"/albums/{quote(album_id, safe=':')}", None)
+        elif name == "album_detail":
+            req = ("GET", f"/album-groups/{quote(album_id, safe=':')}/detail", None)
+        elif name == "artist_lookup":
+            # 실제 아티스트 이름에는 & # + 가 들어간다 ("Simon & Garfunkel") - 인코딩하지 않으면 다른 쿼리가 된다
+            req = ("GET", f"/artists/lookup?{urlencode({'name': rng.choice(samples['artists'])})}", None)
+        elif name == "likes_add":
+            req = ("POST", "/me/likes", {"entity_type": "album", "entity_id": album_id})
+        elif name == "likes_list":
+            req = ("GET", "/me/likes", None)
+        else:
+            event_type = rng.choice(EVENT_TYPES)
+            body = {"event_type": event_type}
+            if event_type == "search":
+                body["payload"] = {"query": rng.choice(samples["words"])}
+            elif event_type == "view_artist":
+                body.update(entity_type="artist", entity_id=artist)
+            else:
+                body.update(entity_type="album", entity_id=album_id)
+            req = ("POST", "/events", body)
+        plan.append((name, *req, user))
+    return plan
+
+
+# ----------------------------------------
+# 실행 / 집계
+# ----------------------------------------
+
+async def run_plan(client: httpx.AsyncClient, plan: list) -> tuple[list, float]:
+    """plan을 BENCH_CONCURRENCY개 워커로 실행. 결과는 plan 순서의 (name, ms, status, queries, db ms)"""
+    results = [None] * len(plan)
+    cursor = iter(range(len(plan)))
+    measured_started = None
+
+    async def send(i: int):
+        name, method, url, body, user = plan[i]
+        started = time.perf_counter()
+        queries, db_ms = 0, 0.0
+        try:
+            res = await client.request(method, url, json=body, headers={"X-User-Id": user})
+            status = res.status_code
+            timing = SERVER_TIMING_DB.search(res.headers.get("server-timing", ""))
+            if timing:
+                db_ms, queries = float(timing.group(1)), int(timing.group(2))
+        except Exception as e:  # 앱 예외도 결과에 남기고 계속 진행
+            print(f"  ⚠️  {name} {url}: {e!r}")
+            status = 599
+        results[i] = (name, (time.perf_counter() - started) * 1000, status, queries, db_ms)
+
+    async def worker():
+        nonlocal measured_started
+        for i in cursor:
+            if i == BENCH_WARMUP and measured_started is None:
+                measured_started = time.perf_counter()
+            await send(i)
+
+    await asyncio.gather(*(worker() for _ in range(BENCH_CONCURRENCY)))
+    wall = time.perf_counter() - (measured_started or time.perf_counter())
+    return results[BENCH_WARMUP:], wall
+
+
+def percentile(values, q: float) -> float:
+    return round(float(np.percentile(values, q)), 2) if len(values) else 0.0
+
+
+def summarize(results: list, wall: float) -> dict:
+    by_endpoint = defaultdict(list)
+    for row in results:
+        by_endpoint[row[0]].append(row)
+
+    def stats(rows: list) -> dict:
+        latencies = [r[1] for r in rows]
+        queries = [r[3] for r in rows]
+        db_ms = [r[4] for r in rows]
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if r[2] >= 400),
+            "rps": round(len(rows) / wall, 2) if wall else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "mean": round(float(np.mean(latencies)), 2) if latencies else 0.0,
+                "max": round(max(latencies), 2) if latencies else 0.0,
+            },
+            "db_ms": {
+                "p50": percentile(db_ms, 50),
+                "p95": percentile(db_ms, 95),
+            },
+            "queries": {
+                "mean": round(float(np.mean(queries)), 2) if queries else 0.0,
+                "max": max(queries) if queries else 0,
+                "total": sum(queries),
+            },
+        }
+
+    return {
+        "total": stats(results),
+        "endpoints": {name: stats(rows) for name, rows in sorted(by_endpoint.items())},
+    }
+
+
+def git_commit() -> Optional[str]:
+    if BENCH_COMMIT:
+        return BENCH_COMMIT
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: Optional[dict]) -> None:
+    print(f"\n{'endpoint':<16}{'n':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}")
+    print("-" * 70)
+    rows = list(report["summary"]["endpoints"].items()) + [("TOTAL", report["summary"]["total"])]
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(
+            f"{name:<16}{s['requests']:>6}{s['errors']:>5}{s['rps']:>9.1f}"
+            f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}{s['queries']['mean']:>7.1f}"
+        )
+    if not baseline:
+        return
+
+    print(f"\n📊 vs baseline {baseline['meta'].get('commit') or BENCH_BASELINE} (p50 / p95 / queries)")
+    base_rows = dict(baseline["summary"]["endpoints"], TOTAL=baseline["summary"]["total"])
+    for name, s in rows:
+        b = base_rows.get(name)
+        if not b:
+            continue
+
+        def delta(new: float, old: float) -> str:
+            return f"{(new - old) / old * 100:+6.1f}%" if old else "     -"
+
+        print(
+            f"  {name:<16}"
+            f"{delta(s['latency_ms']['p50'], b['latency_ms']['p50'])} "
+            f"{delta(s['latency_ms']['p95'], b['latency_ms']['p95'])} "
+            f"{s['queries']['mean'] - b['queries']['mean']:+6.1f}"
+        )
+
+
+async def main():
+    print("\n" + "=" * 70)
+    print(f"🏁 API benchmark: {BENCH_REQUESTS} requests, concurrency {BENCH_CONCURRENCY}, seed {BENCH_SEED}")
+    print("=" * 70)
+
+    engine.echo = False
+    service_gemini.redis_client = MemoryRedis()
+
+    await app.router.startup()
+    # 로드밸런서처럼 ready가 될 때까지(시작 시 캐시 워밍, app/warmup.py) 기다린 뒤 측정한다
+    ready_started = time.monotonic()
+    while health.warming():
+        await asyncio.sleep(0.2)
+    print(f"🔥 ready after {time.monotonic() - ready_started:.1f}s")
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120
+        ) as client:
+            samples = await load_samples()
+            users = []
+            for _ in range(BENCH_USERS):
+                res = await client.post("/dev/users")
+                res.raise_for_status()
+                users.append(res.json()["user_id"])
+            plan = build_plan(samples, users)
+            print(f"📦 {samples['total_albums']} albums in DB, {len(samples['albums'])} sampled, {len(users)} users")
+
+            results, wall = await run_plan(client, plan)
+    finally:
+        app.state.cover_refresh_task.cancel()
+        await app.router.shutdown()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "requests": BENCH_REQUESTS,
+            "warmup": BENCH_WARMUP,
+            "concurrency": BENCH_CONCURRENCY,
+            "seed": BENCH_SEED,
+            "mix": MIX,
+            "total_albums": samples["total_albums"],
+            "wall_sec": round(wall, 3),
+        },
+        "summary": summarize(results, wall),
+    }
+
+    baseline = json.loads(Path(BENCH_BASELINE).read_text()) if BENCH_BASELINE else None
+    print_report(report, baseline)
+
+    out = Path(BENCH_OUT or f"/out/bench/bench-{report['meta']['commit'] or int(time.time())}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\n💾 {out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
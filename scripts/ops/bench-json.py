@@ -0,0 +1,141 @@
+"""
+JSON 응답 인코딩 벤치마크 (FastAPI 기본 경로 vs FastJSONResponse)
+
+실제 DB에서 /albums 페이로드와 인기 앨범 상세(/album-groups/{id}/detail) 페이로드를 만들고
+같은 내용을 두 방식으로 응답 바이트까지 인코딩해서 시간을 비교한다.
+  fastapi   response_model 직렬화(serialize_response: 검증 + jsonable 변환) + stdlib json (JSONResponse)
+  fast      FastJSONResponse(content) - orjson (app/responses.py), 엔드포인트가 직접 돌려줄 때의 경로
+두 방식의 출력 바이트가 같은지도 확인한다 (다르면 실패).
+
+DB 쿼리 시간은 포함하지 않는다 (엔드포인트 전체 지연시간은 scripts/ops/bench-api.py).
+
+Env:
+  BENCH_JSON_ALBUMS (default: 20000 - /albums 페이로드 행 수)
+  BENCH_JSON_DETAILS (default: 20 - 상세 페이로드를 만들 인기 앨범 수)
+  BENCH_JSON_REPEAT (default: 7 - 페이로드마다 반복 횟수, 중앙값 / 최솟값 출력)
+  BENCH_OUT (optional: 결과 JSON 경로)
+
+Usage:
+  docker exec sonic_backend python scripts/ops/bench-json.py
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, "/app")
+
+import httpx
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import select
+
+from app.bulk_rows import ALBUM_COLUMNS, album_row, fetch_rows
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models import AlbumGroup, MapNode
+from app.responses import FastJSONResponse
+from app.schemas import APIResponse, AlbumGroupDetailResponse
+
+BENCH_JSON_ALBUMS = int(os.getenv("BENCH_JSON_ALBUMS", "20000"))
+BENCH_JSON_DETAILS = int(os.getenv("BENCH_JSON_DETAILS", "20"))
+BENCH_JSON_REPEAT = int(os.getenv("BENCH_JSON_REPEAT", "7"))
+BENCH_OUT = os.getenv("BENCH_OUT")
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if getattr(route, "path", None) == path:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def load_payloads() -> dict:
+    async with AsyncSessionLocal() as db:
+        rows = await fetch_rows(db, (
+            select(*ALBUM_COLUMNS)
+            .join(MapNode, AlbumGroup.album_group_id == MapNode.album_group_id)
+            .order_by(AlbumGroup.created_at.desc(), AlbumGroup.album_group_id)
+            .limit(BENCH_JSON_ALBUMS)
+        ))
+        popular = (await db.execute(
+            select(AlbumGroup.album_group_id)
+            .order_by(AlbumGroup.popularity.desc().nulls_last())
+            .limit(BENCH_JSON_DETAILS)
+        )).scalars().all()
+
+    # 상세는 엔드포인트가 만드는 것과 같은 모델 객체가 필요해서 응답을 다시 모델로 읽는다
+    details = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for album_id in popular:
+            res = await client.get(f"/album-groups/{quote(album_id, safe=':')}/detail")
+            res.raise_for_status()
+            details.append(APIResponse(data=AlbumGroupDetailResponse.model_validate(res.json()["data"])))
+
+    return {
+        "albums": ("/albums", [{"data": [album_row(r) for r in rows], "meta": None}]),
+        "detail": ("/album-groups/{album_id}/detail", details),
+    }
+
+
+async def encode_fastapi(field, content) -> bytes:
+    return JSONResponse(await serialize_response(field=field, response_content=content, is_coroutine=True)).body
+
+
+async def encode_fast(field, content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+async def measure(encode, field, contents: list) -> tuple[list[float], list[bytes]]:
+    """contents 전체를 한 번 인코딩하는 시간(ms)을 BENCH_JSON_REPEAT번"""
+    times = []
+    bodies = []
+    for _ in range(BENCH_JSON_REPEAT):
+        started = time.perf_counter()
+        bodies = [await encode(field, content) for content in contents]
+        times.append((time.perf_counter() - started) * 1000)
+    return times, bodies
+
+
+async def main():
+    print("\n" + "=" * 70)
+    print(f"🏁 JSON encoding benchmark: {BENCH_JSON_ALBUMS} albums, {BENCH_JSON_DETAILS} details, x{BENCH_JSON_REPEAT}")
+    print("=" * 70)
+    engine.echo = False
+
+    payloads = await load_payloads()
+    report = {}
+    for name, (path, contents) in payloads.items():
+        field = response_field(path)
+        fastapi_ms, fastapi_bodies = await measure(encode_fastapi, field, contents)
+        fast_ms, fast_bodies = await measure(encode_fast, field, contents)
+        if fastapi_bodies != fast_bodies:
+            raise SystemExit(f"❌ {name}: FastJSONResponse output differs from the FastAPI default")
+
+        size = sum(len(b) for b in fast_bodies)
+        report[name] = {
+            "responses": len(contents),
+            "bytes": size,
+            "fastapi_ms": {"median": round(statistics.median(fastapi_ms), 2), "min": round(min(fastapi_ms), 2)},
+            "fast_ms": {"median": round(statistics.median(fast_ms), 2), "min": round(min(fast_ms), 2)},
+            "speedup": round(statistics.median(fastapi_ms) / statistics.median(fast_ms), 1),
+        }
+        r = report[name]
+        print(
+            f"  {name:<8} {len(contents):>3} responses {size / 1024:>9.1f} KiB   "
+            f"fastapi {r['fastapi_ms']['median']:>8.2f}ms   fast {r['fast_ms']['median']:>7.2f}ms   x{r['speedup']}"
+        )
+
+    if BENCH_OUT:
+        out = Path(BENCH_OUT)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\n💾 {out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
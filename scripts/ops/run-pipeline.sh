@@ -54,7 +54,9 @@ echo "✅ File synced successfully"
 # Step 5: Import to Database
 echo ""
 echo "💾 Step 5: Importing to database..."
-docker exec sonic_backend python scripts/db/import/import.py
+docker exec sonic_backend python scripts/db/migrate/add-taxonomy-columns.py
+docker exec sonic_backend python scripts/db/migrate/add-filter-indexes.py
+docker exec sonic_backend python scripts/db/import/bulk-import-albums.py
 
 # Step 6: Final Statistics
 echo ""